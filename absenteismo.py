@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+from conjunto import derivar
+from leitores import TAMANHO_BLOCO, hash_arquivo, ler_em_blocos
+from caminhos import ABSENTEISMO_FILE, CACHE_DIR as CACHE_ROOT, RAW_DIR
+from process_data import classificar_area, salvar_csv_atomico
+from turnover import ativos_no_fim_mes_por
+
+# =====================================================================
+# ABSENTEÍSMO (PUBLICADO PELO process_data.py, PÁGINA 3_Absenteismo.py)
+# =====================================================================
+# Exportações diárias de ausências da Senior (.csv, .xlsx ou .xls) em
+#     lamoda_dados/raw/absenteismo/
+# uma linha por colaborador por dia ausente, com pelo menos as colunas
+# "Data" e "C.Custo" (e "TIPO", se o arquivo tiver CLT e PJ juntos;
+# senão vale o nome do arquivo: ...-PJ.csv → PJ, o resto → CLT). Cada
+# arquivo cobre um período diferente (não há deduplicação entre eles).
+#
+# São dezenas de vezes maiores que a base de colaboradores: cada arquivo
+# é lido em blocos (leitores.ler_em_blocos) e só as contagens por
+# C.Custo × TIPO × mês ficam em memória, somadas bloco a bloco. As
+# contagens de cada arquivo ficam em cache pelo hash do conteúdo: a
+# carga semanal só lê os arquivos novos.
+#
+# A taxa junta essas faltas ao headcount do fim do mês (mesma regra de
+# ativos do turnover.py) e aos dias úteis do mês:
+#     Absenteísmo (%) = Faltas / (Headcount × Dias úteis) × 100
+# e vai para lamoda_dados/data/absenteismo.csv, ao lado da base_tratada.
+
+AUSENCIAS_DIR = RAW_DIR / "absenteismo"
+CACHE_DIR = CACHE_ROOT / "absenteismo"
+
+EXTENSOES = {".csv", ".txt", ".xlsx", ".xlsm", ".xls"}
+
+COLUNAS_LIDAS = ["Data", "C.Custo", "TIPO"]
+CHAVES = ["C.Custo", "TIPO", "Ano", "Mês"]
+GRUPOS = ["Area", "C.Custo", "TIPO"]
+
+
+# =========================================================
+# 1) FALTAS POR ARQUIVO (EM BLOCOS)
+# =========================================================
+def tipo_do_arquivo(path):
+    return "PJ" if path.stem.upper().endswith("-PJ") else "CLT"
+
+
+def codigo_cc(serie):
+    # 1001 (número), 1001.0 (Excel) e "1001" (CSV) são o mesmo centro de custo
+    texto = serie.astype("string").str.strip()
+    return texto.str.replace(r"\.0$", "", regex=True).replace("", pd.NA)
+
+
+def contar_bloco(bloco, tipo):
+    """(faltas por C.Custo × TIPO × ano × mês, linhas descartadas) de um bloco."""
+    faltando = [c for c in ("Data", "C.Custo") if c not in bloco.columns]
+    if faltando:
+        raise ValueError(f"Coluna(s) ausente(s) na exportação de ausências: {', '.join(faltando)}")
+
+    data = pd.to_datetime(bloco["Data"], dayfirst=True, errors="coerce")
+    cc = codigo_cc(bloco["C.Custo"])
+    tipos = bloco["TIPO"].astype("string").str.strip().str.upper() if "TIPO" in bloco.columns else tipo
+    validas = (data.notna() & cc.notna()).to_numpy()
+
+    contagem = pd.DataFrame({
+        "C.Custo": cc[validas],
+        "TIPO": tipos[validas] if not isinstance(tipos, str) else tipos,
+        "Ano": data[validas].dt.year,
+        "Mês": data[validas].dt.month,
+    }).groupby(CHAVES).size()
+    return contagem, int((~validas).sum())
+
+
+def contar_arquivo(path, tamanho=TAMANHO_BLOCO):
+    """
+    Faltas de um arquivo inteiro. A memória usada depende do tamanho
+    do bloco e do nº de C.Custo × meses, não do tamanho do arquivo.
+    """
+    totais = None
+    linhas = descartadas = 0
+    for bloco in ler_em_blocos(path, tamanho, COLUNAS_LIDAS):
+        contagem, invalidas = contar_bloco(bloco, tipo_do_arquivo(path))
+        totais = contagem if totais is None else totais.add(contagem, fill_value=0)
+        linhas += len(bloco)
+        descartadas += invalidas
+
+    if totais is None or totais.empty:
+        return pd.DataFrame(columns=CHAVES + ["Faltas"]), linhas, descartadas
+    faltas = totais.astype("int64").rename("Faltas").reset_index()
+    return faltas, linhas, descartadas
+
+
+def faltas_do_arquivo(path, tamanho=TAMANHO_BLOCO, cache_dir=CACHE_DIR):
+    """Contagens do arquivo; do cache se o mesmo conteúdo já foi lido."""
+    cache = cache_dir / f"{hash_arquivo(path)}.csv"
+    if cache.exists():
+        return pd.read_csv(cache, dtype={"C.Custo": str, "TIPO": str}), None
+
+    faltas, linhas, descartadas = contar_arquivo(path, tamanho)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    salvar_csv_atomico(faltas, cache)
+    return faltas, {"linhas": linhas, "descartadas": descartadas}
+
+
+# =========================================================
+# 2) HEADCOUNT E TAXA MENSAL
+# =========================================================
+def dias_uteis(ano, mes):
+    inicio = np.datetime64(f"{ano:04d}-{mes:02d}", "M")
+    return int(np.busday_count(inicio.astype("datetime64[D]"), (inicio + 1).astype("datetime64[D]")))
+
+
+def headcount_mensal(df_base, meses):
+    """Ativos no fim de cada (ano, mês) por Area, C.Custo e TIPO."""
+    base = derivar(df_base, {"C.Custo": codigo_cc(df_base["C.Custo"])})
+    partes = []
+    for ano, mes in meses:
+        ativos = ativos_no_fim_mes_por(base, ano, mes, GRUPOS).rename("Headcount").reset_index()
+        partes.append(ativos.assign(Ano=ano, **{"Mês": mes}))
+    if not partes:
+        return pd.DataFrame(columns=GRUPOS + ["Ano", "Mês", "Headcount"])
+    return pd.concat(partes, ignore_index=True)
+
+
+def taxa(faltas, dias_previstos):
+    return (faltas / dias_previstos * 100).where(dias_previstos > 0).round(2)
+
+
+def montar_absenteismo(faltas, df_base, cc_map):
+    """Faltas (CHAVES + Faltas) × headcount → tabela mensal publicada."""
+    faltas = faltas.groupby(CHAVES, as_index=False)["Faltas"].sum()
+    # Mesma classificação de área do ETL (process_data.classificar_areas)
+    faltas["Area"] = faltas["C.Custo"].map(cc_map).fillna("0").map(classificar_area)
+
+    meses = sorted(set(zip(faltas["Ano"], faltas["Mês"])))
+    headcount = headcount_mensal(df_base, meses)
+
+    tabela = faltas.merge(headcount, on=GRUPOS + ["Ano", "Mês"], how="outer")
+    tabela["Faltas"] = tabela["Faltas"].fillna(0).astype("int64")
+    tabela["Headcount"] = tabela["Headcount"].fillna(0).astype("int64")
+    tabela["Dias úteis"] = [dias_uteis(a, m) for a, m in zip(tabela["Ano"], tabela["Mês"])]
+    tabela["Dias previstos"] = tabela["Headcount"] * tabela["Dias úteis"]
+    tabela["Absenteísmo (%)"] = taxa(tabela["Faltas"], tabela["Dias previstos"])
+
+    colunas = ["Ano", "Mês"] + GRUPOS + ["Faltas", "Headcount", "Dias úteis", "Dias previstos", "Absenteísmo (%)"]
+    return tabela[colunas].sort_values(["Ano", "Mês"] + GRUPOS).reset_index(drop=True)
+
+
+def resumir(tabela, por):
+    """Soma a tabela publicada por `por` (lista de colunas) e recalcula a taxa."""
+    grupos = tabela.groupby(por, as_index=False)[["Faltas", "Dias previstos"]].sum()
+    grupos["Absenteísmo (%)"] = taxa(grupos["Faltas"], grupos["Dias previstos"])
+    return grupos
+
+
+# =========================================================
+# 3) PUBLICAÇÃO
+# =========================================================
+def arquivos_ausencias(pasta=AUSENCIAS_DIR):
+    if not pasta.exists():
+        return []
+    return sorted(p for p in pasta.iterdir() if p.is_file() and p.suffix.lower() in EXTENSOES)
+
+
+def publicar(df_base, cc_map, pasta=AUSENCIAS_DIR, destino=ABSENTEISMO_FILE,
+             tamanho=TAMANHO_BLOCO, cache_dir=CACHE_DIR):
+    """Lê as exportações, grava o absenteismo.csv e devolve um resumo (None sem arquivos)."""
+    arquivos = arquivos_ausencias(pasta)
+    if not arquivos:
+        return None
+
+    partes = []
+    resumo = {"arquivos": len(arquivos), "do_cache": 0, "linhas": 0, "descartadas": 0}
+    for path in arquivos:
+        faltas, lidos = faltas_do_arquivo(path, tamanho, cache_dir)
+        partes.append(faltas)
+        if lidos is None:
+            resumo["do_cache"] += 1
+        else:
+            resumo["linhas"] += lidos["linhas"]
+            resumo["descartadas"] += lidos["descartadas"]
+
+    tabela = montar_absenteismo(pd.concat(partes, ignore_index=True), df_base, cc_map)
+    salvar_csv_atomico(tabela, destino)
+    resumo["registros"] = len(tabela)
+    return resumo
@@ -0,0 +1,430 @@
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from consultas import BaseIndisponivel, ConsultasPandas
+from caminhos import HIST_DIR
+from dados import MonitorDados
+from historico import HistoricoSnapshots, calcular_tempo_casa
+from leitores import _arrow_disponivel, compatibilizar_arrow
+from tempo_casa import FAIXAS, SITUACOES
+
+# =====================================================================
+# API LOCAL DE MÉTRICAS (HTTP/JSON E ARROW)
+# =====================================================================
+# Para consumidores automáticos (conciliação da folha, Power BI): os
+# mesmos números do portal sem passar pela interface do Streamlit.
+#
+#     python api.py [--host 127.0.0.1] [--porta 8502]
+#
+#   GET  /                         → métricas disponíveis e parâmetros
+#   GET  /saude                    → versão da base carregada
+#   GET  /metricas/<nome>?ano=2024&area=Varejo[&formato=arrow]
+#   POST /lote  {"consultas": [{"metrica": "turnover_anual", "ano": [2024]}, ...]}
+#
+# Mesmas consultas da página (consultas.py: pandas ou DuckDB, conforme
+# LAMODA_MOTOR) e mesma troca de versão sem reinício (dados.MonitorDados).
+# Os resultados ficam num LRU por versão da base: consultas repetidas (e
+# repetidas dentro de um lote) não recalculam nada.
+
+TAMANHO_CACHE = 256
+
+TIPO_ARROW = "application/vnd.apache.arrow.stream"
+
+
+# =========================================================
+# PARÂMETROS
+# =========================================================
+def _lista(valor):
+    """'2023,2024' / [2023, 2024] / 2024 → lista."""
+    if valor is None:
+        return []
+    if isinstance(valor, str):
+        return [v.strip() for v in valor.split(",") if v.strip()]
+    if isinstance(valor, (list, tuple)):
+        return list(valor)
+    return [valor]
+
+
+def _anos(valor, obrigatorio=True):
+    try:
+        anos = sorted({int(v) for v in _lista(valor)})
+    except (TypeError, ValueError):
+        raise ValueError(f"Ano inválido: {valor!r}")
+    if obrigatorio and not anos:
+        raise ValueError("Informe o parâmetro 'ano' (ex.: ano=2024 ou ano=2023,2024).")
+    return anos
+
+
+def _booleano(valor):
+    if isinstance(valor, bool):
+        return valor
+    return str(valor).strip().lower() in ("1", "true", "sim", "s", "yes")
+
+
+def _inteiro(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"Número inválido: {valor!r}")
+
+
+def _opcao(valor, opcoes, nome):
+    valor = valor or opcoes[0]
+    if valor not in opcoes:
+        raise ValueError(f"'{nome}' deve ser um de: {', '.join(opcoes)}.")
+    return valor
+
+
+# =========================================================
+# MÉTRICAS
+# =========================================================
+# Cada métrica recebe (motor de consultas, áreas, parâmetros); ver consultas.py.
+def _turnover_anual(consultas, areas, params):
+    return consultas.turnover_anual(areas, _anos(params.get("ano")))
+
+
+def _turnover_areas(consultas, areas, params):
+    return consultas.turnover_por_area_anos(areas, _anos(params.get("ano")))
+
+
+def _turnover_mensal(consultas, areas, params):
+    return consultas.turnover_mensal_areas(areas, _anos(params.get("ano")))
+
+
+def _turnover_centros_custo(consultas, areas, params):
+    anos = _anos(params.get("ano"))
+    if len(anos) != 1:
+        raise ValueError("turnover_centros_custo aceita um único ano.")
+    return consultas.turnover_por_cc(
+        areas, anos[0],
+        filtrar_pequenos=params.get("filtrar_pequenos", False),
+        agrupar_pequenos=params.get("agrupar_pequenos", False),
+        min_ativos=params.get("min_ativos", 0),
+    ).reset_index(drop=True)
+
+
+def _tempo_casa(consultas, areas, params):
+    return consultas.resumo_tempo_casa(
+        areas,
+        situacao=_opcao(params.get("situacao"), SITUACOES, "situacao"),
+        faixa=_opcao(params.get("faixa"), ["Todos"] + list(FAIXAS), "faixa"),
+        por_area=params.get("por") == "area",
+    )
+
+
+# nome → (função, base usada, parâmetros aceitos além de area/snapshot)
+METRICAS = {
+    "turnover_anual": (_turnover_anual, "base", ["ano"]),
+    "turnover_areas": (_turnover_areas, "base", ["ano"]),
+    "turnover_mensal": (_turnover_mensal, "base", ["ano"]),
+    "turnover_centros_custo": (
+        _turnover_centros_custo, "base",
+        ["ano", "filtrar_pequenos", "agrupar_pequenos", "min_ativos"],
+    ),
+    "tempo_casa": (_tempo_casa, "tempo_casa", ["situacao", "faixa", "por"]),
+}
+
+PARAMETROS_COMUNS = ["area", "snapshot"]
+
+# Forma canônica de cada parâmetro: "2024" e [2024] viram a mesma consulta
+CONVERSORES = {
+    "ano": _anos,
+    "area": lambda v: sorted(str(a) for a in _lista(v)),
+    "filtrar_pequenos": _booleano,
+    "agrupar_pequenos": _booleano,
+    "min_ativos": _inteiro,
+}
+
+
+class MetricaDesconhecida(KeyError):
+    pass
+
+
+# =========================================================
+# SERVIÇO (MOTOR + CACHE)
+# =========================================================
+class ServicoMetricas:
+    """
+    Calcula as métricas sobre a versão corrente da base. LRU por
+    versão: quando o process_data.py publica uma base nova, os
+    resultados antigos são descartados.
+    """
+
+    def __init__(self, monitor, tamanho=TAMANHO_CACHE, historico=None):
+        self.monitor = monitor
+        self.tamanho = tamanho
+        self.historico = historico or HistoricoSnapshots(HIST_DIR)
+        self._resultados = OrderedDict()
+        self._snapshots = OrderedDict()
+        self._versao = None
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def dados(self):
+        dados = self.monitor.atual()
+        if dados is None:
+            raise BaseIndisponivel("Nenhuma base publicada. Execute o process_data.py.")
+        return dados
+
+    # -----------------------------------------------------
+    # BASES
+    # -----------------------------------------------------
+    def _consultas_snapshot(self, data):
+        """Consultas sobre a base de um snapshot (os 4 últimos ficam em memória)."""
+        chave = (data, self.historico.versao())
+        with self._lock:
+            if chave in self._snapshots:
+                self._snapshots.move_to_end(chave)
+                return self._snapshots[chave]
+
+        base = self.historico.base_em(data)
+        consultas = ConsultasPandas(base, calcular_tempo_casa(base, self.historico.snapshot_em(data)))
+
+        with self._lock:
+            self._snapshots[chave] = consultas
+            while len(self._snapshots) > 4:
+                self._snapshots.popitem(last=False)
+        return consultas
+
+    def _consultas(self, dados, snapshot):
+        """Versão corrente: o motor do dados.py (pandas, DuckDB ou particionado)."""
+        if snapshot:
+            data = pd.to_datetime(snapshot, dayfirst="/" in str(snapshot), errors="coerce")
+            if pd.isna(data):
+                raise ValueError(f"Data de snapshot inválida: {snapshot!r}")
+            return self._consultas_snapshot(data)
+        return dados.consultas
+
+    # -----------------------------------------------------
+    # CONSULTA
+    # -----------------------------------------------------
+    @staticmethod
+    def _normalizar(metrica, params):
+        if metrica not in METRICAS:
+            raise MetricaDesconhecida(metrica)
+        _, _, aceitos = METRICAS[metrica]
+        extras = set(params) - set(aceitos) - set(PARAMETROS_COMUNS) - {"metrica", "formato"}
+        if extras:
+            raise ValueError(f"Parâmetros não aceitos por {metrica}: {', '.join(sorted(extras))}.")
+        normal = {}
+        for nome in aceitos + PARAMETROS_COMUNS:
+            valor = params.get(nome)
+            if valor is None or valor == "" or valor == []:
+                continue
+            normal[nome] = CONVERSORES.get(nome, str)(valor)
+        return normal
+
+    def consultar(self, metrica, params):
+        """DataFrame ou dict com o resultado da métrica."""
+        params = self._normalizar(metrica, params)
+        dados = self.dados()
+        chave = (metrica, json.dumps(params, sort_keys=True))
+
+        with self._lock:
+            if dados.versao != self._versao:
+                # Base nova: nada do que está guardado vale mais
+                self._resultados.clear()
+                self._versao = dados.versao
+
+            if chave in self._resultados:
+                self.acertos += 1
+                self._resultados.move_to_end(chave)
+                return self._resultados[chave]
+            self.falhas += 1
+
+        funcao, tipo, _ = METRICAS[metrica]
+        consultas = self._consultas(dados, params.get("snapshot"))
+
+        # Sem área: turnover sobre todas as áreas da base; tempo de casa sem filtro
+        areas = params.get("area")
+        if areas:
+            desconhecidas = sorted(set(areas) - set(consultas.dimensoes()[1]))
+            if desconhecidas:
+                raise ValueError(f"Área(s) desconhecida(s): {', '.join(desconhecidas)}.")
+        elif tipo == "base":
+            areas = consultas.dimensoes()[1]
+
+        resultado = funcao(consultas, areas or None, params)
+
+        with self._lock:
+            if dados.versao == self._versao:
+                self._resultados[chave] = resultado
+                while len(self._resultados) > self.tamanho:
+                    self._resultados.popitem(last=False)
+        return resultado
+
+    def lote(self, consultas):
+        """Uma resposta por consulta, na mesma ordem; erros não derrubam o lote."""
+        resultados = []
+        for consulta in consultas:
+            if not isinstance(consulta, dict) or not isinstance(consulta.get("metrica"), str):
+                resultados.append({"metrica": None, "erro": 'Consulta esperada: {"metrica": "<nome>", ...}.'})
+                continue
+            consulta = dict(consulta)
+            metrica = consulta.pop("metrica")
+            try:
+                resultados.append({"metrica": metrica, "dados": para_json(self.consultar(metrica, consulta))})
+            except MetricaDesconhecida:
+                resultados.append({"metrica": metrica, "erro": f"Métrica desconhecida: {metrica!r}."})
+            except (ValueError, BaseIndisponivel) as e:
+                resultados.append({"metrica": metrica, "erro": str(e)})
+        return resultados
+
+
+# =========================================================
+# SERIALIZAÇÃO
+# =========================================================
+def para_json(resultado):
+    if isinstance(resultado, pd.DataFrame):
+        return json.loads(resultado.to_json(orient="records", date_format="iso", force_ascii=False))
+    return {k: _valor_json(v) for k, v in resultado.items()}
+
+
+def _valor_json(valor):
+    if isinstance(valor, np.integer):
+        return int(valor)
+    if isinstance(valor, np.floating):
+        return None if np.isnan(valor) else float(valor)
+    if isinstance(valor, (pd.Timestamp, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def para_arrow(resultado):
+    """Resultado como stream Arrow IPC (dict vira uma linha)."""
+    import pyarrow as pa
+
+    if not isinstance(resultado, pd.DataFrame):
+        resultado = pd.DataFrame([para_json(resultado)])
+    tabela = pa.Table.from_pandas(compatibilizar_arrow(resultado), preserve_index=False)
+
+    buffer = BytesIO()
+    with pa.ipc.new_stream(buffer, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return buffer.getvalue()
+
+
+# =========================================================
+# SERVIDOR HTTP
+# =========================================================
+class ManipuladorMetricas(BaseHTTPRequestHandler):
+    servico = None  # ServicoMetricas, definido em criar_servidor()
+
+    def _responder(self, status, corpo, tipo="application/json; charset=utf-8"):
+        if not isinstance(corpo, bytes):
+            corpo = json.dumps(corpo, ensure_ascii=False, default=_valor_json).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _erro(self, status, mensagem):
+        self._responder(status, {"erro": mensagem})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        partes = [p for p in url.path.split("/") if p]
+
+        if not partes:
+            return self._responder(200, {
+                "metricas": {nome: aceitos + PARAMETROS_COMUNS for nome, (_, _, aceitos) in METRICAS.items()},
+                "formatos": ["json", "arrow"],
+            })
+
+        if partes == ["saude"]:
+            try:
+                dados = self.servico.dados()
+            except BaseIndisponivel as e:
+                return self._erro(503, str(e))
+            return self._responder(200, {
+                "versao": dados.versao,
+                "atualizado_em": dados.atualizado_em,
+                "registros": dados.consultas.registros(),
+                "cache": {"acertos": self.servico.acertos, "falhas": self.servico.falhas},
+            })
+
+        if len(partes) == 2 and partes[0] == "metricas":
+            return self._metrica(partes[1], params)
+
+        self._erro(404, f"Caminho desconhecido: {url.path}")
+
+    def _metrica(self, metrica, params):
+        formato = params.get("formato", "json")
+        if formato not in ("json", "arrow"):
+            return self._erro(400, "formato deve ser json ou arrow.")
+        if formato == "arrow" and not _arrow_disponivel():
+            return self._erro(400, "pyarrow não instalado: use formato=json.")
+
+        try:
+            versao = self.servico.dados().versao
+            resultado = self.servico.consultar(metrica, params)
+        except MetricaDesconhecida:
+            return self._erro(404, f"Métrica desconhecida: {metrica!r}.")
+        except ValueError as e:
+            return self._erro(400, str(e))
+        except BaseIndisponivel as e:
+            return self._erro(503, str(e))
+
+        if formato == "arrow":
+            return self._responder(200, para_arrow(resultado), TIPO_ARROW)
+        self._responder(200, {"metrica": metrica, "versao": versao, "dados": para_json(resultado)})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/lote":
+            return self._erro(404, f"Caminho desconhecido: {self.path}")
+
+        try:
+            tamanho = int(self.headers.get("Content-Length", 0))
+            corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+            consultas = corpo["consultas"]
+            if not isinstance(consultas, list):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return self._erro(400, 'Corpo esperado: {"consultas": [{"metrica": ..., ...}, ...]}')
+
+        try:
+            versao = self.servico.dados().versao
+        except BaseIndisponivel as e:
+            return self._erro(503, str(e))
+        self._responder(200, {"versao": versao, "resultados": self.servico.lote(consultas)})
+
+    def log_message(self, formato, *args):
+        print(f"🌐 {self.address_string()} {formato % args}")
+
+
+def criar_servidor(host="127.0.0.1", porta=8502, servico=None):
+    servico = servico or ServicoMetricas(MonitorDados())
+    manipulador = type("Manipulador", (ManipuladorMetricas,), {"servico": servico})
+    return ThreadingHTTPServer((host, porta), manipulador)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API local de métricas de turnover e tempo de casa")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8502)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.host, args.porta)
+    print(f"📡 API de métricas em http://{args.host}:{args.porta}/")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
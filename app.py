@@ -1,13 +1,13 @@
 import streamlit as st
-from pathlib import Path
 from login import require_login
+from estilo import aplicar_css, logo
 
 # ======================================================
 # CONFIGURAÇÃO DA PÁGINA (UMA ÚNICA VEZ)
 # ======================================================
 st.set_page_config(
     page_title="Lamoda Analytics",
-    page_icon="static/logo_la_moda.png",
+    page_icon="app/static/logo_la_moda.png",  # static serving (ver estilo.py)
     layout="wide"
 )
 
@@ -16,33 +16,20 @@ st.set_page_config(
 # ======================================================
 require_login()
 
-# ======================================================
-# CAMINHOS PADRÃO
-# ======================================================
-BASE_DIR = Path(__file__).resolve().parent
-STATIC_DIR = BASE_DIR / "static"
-STREAMLIT_DIR = BASE_DIR / ".streamlit"
+# Só depois do login: a tela de login abre sem carregar pandas
+from dados import data_atualizacao
 
 # ======================================================
-# CARREGAR CSS GLOBAL
+# CARREGAR CSS GLOBAL (LIDO UMA VEZ, VER estilo.py)
 # ======================================================
-css_path = STREAMLIT_DIR / "styles.css"
-
-if css_path.exists():
-    st.markdown(
-        f"<style>{css_path.read_text(encoding='utf-8')}</style>",
-        unsafe_allow_html=True
-    )
+aplicar_css()
 
 # ======================================================
 # SIDEBAR — LOGO + MENU + LOGOUT
 # ======================================================
 with st.sidebar:
 
-    logo_path = STATIC_DIR / "logo_la_moda.png"
-
-    if logo_path.exists():
-        st.image(str(logo_path), width=130)
+    logo("logo_la_moda.png", largura=130)
 
     st.markdown(
         """
@@ -88,7 +75,7 @@ st.markdown(
 )
 
 st.markdown(
-    """
+    f"""
     <div style="
         background-color: #0D1117;
         border: 1px solid #1F2937;
@@ -99,7 +86,7 @@ st.markdown(
         <h4 style="color:#58A6FF; margin:0;">📅 Atualização dos Dados</h4>
         <p style="color:#E5E7EB; margin-top:6px;">
             Dados atualizados em:
-            <strong style="color:#93C5FD;">02/12/2025</strong>
+            <strong style="color:#93C5FD;">{data_atualizacao()}</strong>
         </p>
         <p style="color:#9CA3AF; font-size:14px;">
             Fonte: <strong>Sistema Senior – Gestão de Pessoas</strong>
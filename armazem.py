@@ -0,0 +1,150 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+# Memória máxima (MB) para datasets de upload sem referência ativa
+ORCAMENTO_MB = 1024
+
+
+def calcular_chave(*conteudos):
+    """Chave do dataset: SHA-256 do conteúdo dos arquivos enviados."""
+    h = hashlib.sha256()
+    for conteudo in conteudos:
+        h.update(hashlib.sha256(conteudo).digest())
+    return h.hexdigest()
+
+
+def tamanho_em_bytes(dados):
+    return int(sum(df.memory_usage(deep=True).sum() for df in dados.values()))
+
+
+# =========================================================
+# 1) ENTRADA DO ARMAZÉM
+# =========================================================
+class Entrada:
+    def __init__(self, dados):
+        self.dados = dados
+        self.tamanho = tamanho_em_bytes(dados)
+        self.refs = 0
+        self.ultimo_acesso = time.time()
+
+
+# =========================================================
+# 2) ARMAZÉM COMPARTILHADO (ENDEREÇADO POR CONTEÚDO)
+# =========================================================
+class ArmazemDatasets:
+    """
+    Guarda uma única cópia de cada upload processado, compartilhada
+    entre as sessões. Entradas sem referência são removidas por LRU
+    quando o total passa do orçamento de memória.
+    """
+
+    def __init__(self, orcamento_mb=ORCAMENTO_MB):
+        self.orcamento = orcamento_mb * 1024 * 1024
+        self._entradas = OrderedDict()
+        # RLock: liberar() pode ser chamado pelo coletor de lixo
+        # enquanto a mesma thread já segura o lock
+        self._lock = threading.RLock()
+
+    def contem(self, chave):
+        with self._lock:
+            return chave in self._entradas
+
+    def guardar(self, chave, dados):
+        with self._lock:
+            if chave not in self._entradas:
+                self._entradas[chave] = Entrada(dados)
+            self._entradas.move_to_end(chave)
+            # A entrada recém-processada ainda não foi referenciada pela
+            # sessão que a pediu: não pode sair nesta rodada
+            self._evictar(proteger=chave)
+
+    def referenciar(self, chave):
+        """Cria uma referência para a sessão ou None se a chave não existe."""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            entrada.refs += 1
+        return ReferenciaDataset(self, chave)
+
+    def obter(self, chave):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            entrada.ultimo_acesso = time.time()
+            self._entradas.move_to_end(chave)
+            return entrada.dados
+
+    def liberar(self, chave):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return
+            entrada.refs = max(0, entrada.refs - 1)
+            self._evictar()
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(e.tamanho for e in self._entradas.values())
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "datasets": len(self._entradas),
+                "referenciados": sum(1 for e in self._entradas.values() if e.refs),
+                "memoria_mb": round(self.total_bytes() / 1024 / 1024, 1),
+                "orcamento_mb": round(self.orcamento / 1024 / 1024, 1),
+            }
+
+    def _evictar(self, proteger=None):
+        # Do menos para o mais recente; entradas em uso nunca saem
+        total = self.total_bytes()
+        for chave in list(self._entradas):
+            if total <= self.orcamento:
+                break
+            entrada = self._entradas[chave]
+            if entrada.refs == 0 and chave != proteger:
+                total -= entrada.tamanho
+                del self._entradas[chave]
+
+
+# =========================================================
+# 3) REFERÊNCIA GUARDADA NA SESSÃO
+# =========================================================
+class ReferenciaDataset:
+    """
+    O que fica em st.session_state. Ao ser descartada (novo upload,
+    logout ou fim da sessão) a contagem de referências é decrementada.
+    """
+
+    def __init__(self, armazem, chave):
+        self._armazem = armazem
+        self.chave = chave
+        self._ativa = True
+
+    def dados(self):
+        return self._armazem.obter(self.chave)
+
+    def liberar(self):
+        if self._ativa:
+            self._ativa = False
+            self._armazem.liberar(self.chave)
+
+    def __del__(self):
+        self.liberar()
+
+
+@st.cache_resource
+def armazem():
+    return ArmazemDatasets()
+
+
+def dataset_da_sessao():
+    """Dados do último upload da sessão (df_clt, df_pj, df_base) ou None."""
+    ref = st.session_state.get("dataset_upload")
+    return ref.dados() if ref is not None else None
@@ -0,0 +1,1014 @@
+import pandas as pd
+from datetime import date, datetime
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from pathlib import Path
+import json
+import os
+import threading
+import unicodedata
+import re
+
+from cubo import CuboMetricas
+from entidades import ENTIDADES, ROTULOS_ENTIDADE
+
+# =====================================================================
+# LÓGICA DO ASSISTENTE IA (USADA PELA PÁGINA 4_Assistente_IA.py)
+# =====================================================================
+
+# Colunas da base usadas nas respostas (o motor DuckDB monta só estas)
+COLUNAS_BASE = [
+    "Area", "Admissão", "Data Afastamento", "Causa Escrita", "Situacao_res",
+    "Ano_Admissao", "Mes_Admissao", "Ano_Afastamento", "Mes_Afastamento",
+] + list(ENTIDADES.values())
+
+
+# =====================================================================
+# 1) NORMALIZAÇÃO • ENTENDE PORTUGUÊS INFORMAL, ERROS E ABREVIAÇÕES
+# =====================================================================
+
+GIRIAS = {
+    "qnts": "quantos",
+    "qntos": "quantos",
+    "qto": "quanto",
+    "td": "tudo",
+    "pq": "porque",
+    "p q": "porque",
+    "turn": "turnover",
+    "var": "varejo",
+    "ind": "indústria",
+    "adm": "admissão",
+    "dem": "desligamento",
+    "func": "colaboradores",
+    "funcionario": "colaborador",
+    "funcionarios": "colaboradores",
+    "galera": "colaboradores",
+    "lj": "loja",
+    "empresa geral": "geral",
+}
+
+# Ordem de prioridade quando a pergunta cita mais de uma área
+AREAS = {
+    "varejo": "Varejo",
+    "industria": "Indústria",
+    "matriz": "Matriz",
+    "geral": "Geral",
+    "empresa": "Geral",
+}
+PRIORIDADE_AREAS = ["Varejo", "Indústria", "Matriz", "Geral"]
+
+
+def _sem_acentos(texto):
+    if texto.isascii():
+        return texto
+    return unicodedata.normalize("NFD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+# Valores sem acento: a substituição precisa casar com as regras abaixo
+# (antes, "ind" virava "indústria" e não era reconhecido como área)
+_GIRIAS_NORM = {_sem_acentos(k): _sem_acentos(v) for k, v in GIRIAS.items()}
+
+# Um único padrão para toda a pergunta, que só para nos trechos que
+# interessam. Gírias só casam como palavra inteira ("adm" não mexe em
+# "admissao"); as mais longas vêm primeiro.
+_TOKENS = re.compile(
+    r"\b(?P<mes_ano>\d{1,2}[/-]20\d{2})\b"
+    r"|\b(?P<ano>20\d{2})\b"
+    r"|\b(?P<giria>"
+    + "|".join(map(re.escape, sorted(_GIRIAS_NORM, key=len, reverse=True)))
+    + r")\b"
+    r"|\b(?P<area>" + "|".join(AREAS) + r")"
+    r"|\b(?P<ativo>ativo)"
+    r"|\b(?P<desligado>deslig|demit)"
+    r"|\b(?P<por_mes>por mes|mes a mes|mensal\w*|cada mes)\b"
+)
+
+
+def analisar_texto(texto: str):
+    """
+    Normaliza a pergunta (minúsculas, sem acento, gírias trocadas) e,
+    na mesma passada, extrai anos, mês/ano, áreas, status e se a
+    pergunta pede abertura por mês. Devolve (texto normalizado, entidades).
+    """
+    anos = []
+    mes_ano = []
+    areas = []
+    status = set()
+    por_mes = []
+
+    def trocar(m):
+        tipo = m.lastgroup
+        trecho = m.group(0)
+
+        if tipo == "ano":
+            anos.append(int(trecho))
+        elif tipo == "mes_ano":
+            mes, ano = (int(p) for p in re.split(r"[/-]", trecho))
+            # "13/2025" não é mês: vale só o ano (o cubo não tem mês 13)
+            if not mes_ano and 1 <= mes <= 12:
+                mes_ano.append((mes, ano))
+            anos.append(ano)
+        elif tipo == "area":
+            areas.append(AREAS[trecho])
+        elif tipo == "ativo":
+            status.add("Ativo")
+        elif tipo == "desligado":
+            status.add("Desligado")
+        elif tipo == "por_mes":
+            por_mes.append(True)
+        else:
+            trecho = _GIRIAS_NORM[trecho]
+            if trecho in AREAS:
+                areas.append(AREAS[trecho])
+
+        return trecho
+
+    t = _TOKENS.sub(trocar, _sem_acentos(texto.lower()))
+
+    mes, ano_mes = mes_ano[0] if mes_ano else (None, None)
+    area = next((a for a in PRIORIDADE_AREAS if a in areas), None)
+    if "Desligado" in status:
+        situacao = "Desligado"
+    elif "Ativo" in status:
+        situacao = "Ativo"
+    else:
+        situacao = None
+
+    return t, {
+        "anos": anos,
+        "mes": mes,
+        "ano_mes": ano_mes,
+        "area": area,
+        # Todas as áreas citadas, na ordem da pergunta ("varejo vs matriz")
+        "areas": list(dict.fromkeys(areas)),
+        "status": situacao,
+        "por_mes": bool(por_mes),
+    }
+
+
+def normalizar(texto: str) -> str:
+    return analisar_texto(texto)[0]
+
+
+def filtrar_area(df, area):
+    if not area or area == "Geral":
+        return df
+    return df[df["Area"] == area]
+
+
+def filtrar_escopo(df, intent):
+    """Área + centro de custo / cargo resolvidos na pergunta."""
+    df = filtrar_area(df, intent.get("area"))
+    for tipo, coluna in ENTIDADES.items():
+        if intent.get(tipo):
+            df = df[df[coluna] == intent[tipo]]
+    return df
+
+
+def descrever_escopo(intent, geral):
+    """'no centro de custo **LOJA 5** na área **Varejo**', ou `geral`."""
+    partes = [f"no {ROTULOS_ENTIDADE[t]} **{intent[t]}**" for t in ENTIDADES if intent.get(t)]
+    area = intent.get("area")
+    if area and area != "Geral":
+        partes.append(f"na área **{area}**")
+    return " ".join(partes) or geral
+
+
+def turnover_moderno(a, d, ini, fim):
+    med = (ini + fim) / 2
+    return ((a + d) / 2) / med * 100 if med > 0 else 0
+
+
+def turnover_alt(a, d, ativos_fim):
+    return ((a + d) / 2) / ativos_fim * 100 if ativos_fim > 0 else 0
+
+
+def calcular_turnover_anual(cubo, ano, area=None):
+    r = cubo.anual(ano, area)
+    adm, dem = r["Admissões"], r["Desligamentos"]
+    ativos_ini, ativos_fim = r["Ativos início"], r["Ativos fim"]
+
+    return {
+        "Ano": ano,
+        "Admissões": adm,
+        "Desligamentos": dem,
+        "Ativos início": ativos_ini,
+        "Ativos fim": ativos_fim,
+        "Turnover Alternativo (%)": round(turnover_alt(adm, dem, ativos_fim), 2),
+        "Turnover Moderno (%)": round(turnover_moderno(adm, dem, ativos_ini, ativos_fim), 2),
+    }
+
+
+# =====================================================================
+# 2) INTENÇÃO • ÍNDICE DE TRIGRAMAS (TOLERA ERROS DE DIGITAÇÃO)
+# =====================================================================
+# Cada intenção tem padrões (palavras ou expressões, já sem acento) com
+# um peso. Os trigramas de todos os padrões ficam em um índice
+# invertido: cada trecho da pergunta só é comparado com os padrões que
+# têm algum trigrama em comum (similaridade de Dice × peso).
+#
+# Nomes de métrica pesam 1.0; palavras genéricas ("quantos",
+# "colaboradores") pesam menos, para que "quantos desligamentos" seja
+# desligamentos e "tempo de casa dos colaboradores" seja tempo de casa.
+# Em empate vale a ordem da lista. Intenção nova = uma linha a mais.
+
+INTENCOES = [
+    ("turnover", {
+        "turnover": 1.0, "rotatividade": 1.0,
+    }),
+    ("headcount", {
+        "headcount": 1.0,
+        "quantos": 0.9, "quantas": 0.9, "qtd": 0.9, "quantidade": 0.9,
+        "colaborador": 0.9, "colaboradores": 0.9,
+    }),
+    ("tempo_casa", {
+        "tempo de casa": 1.0, "tempo casa": 1.0, "antiguidade": 1.0,
+    }),
+    ("admissoes", {
+        "admissao": 1.0, "admissoes": 1.0, "contratacao": 1.0, "contratacoes": 1.0,
+        "admitidos": 0.8, "contratados": 0.8,
+    }),
+    ("desligamentos", {
+        "desligamento": 1.0, "desligamentos": 1.0, "demissao": 1.0, "demissoes": 1.0,
+        "desligados": 0.8, "demitidos": 0.8,
+    }),
+]
+
+# Pontuação mínima (0 a 1) para aceitar uma intenção
+LIMIAR_INTENCAO = 0.6
+
+# Letras trocadas de lugar ("tunrover") quebram muitos trigramas:
+# mesmas letras em outra ordem valem esta nota
+NOTA_TRANSPOSICAO = 0.9
+
+_PALAVRAS = re.compile(r"[a-z0-9]+")
+
+# "varejo vs matriz, 2023 vs 2024" sem métrica: comparação de turnover
+_COMPARACAO = re.compile(r"\b(vs|versus|x|compar\w*)\b")
+
+
+@lru_cache(maxsize=4096)
+def _trigramas(texto):
+    texto = f" {texto} "
+    return frozenset(texto[i:i + 3] for i in range(len(texto) - 2))
+
+
+def _anagrama(texto):
+    return texto[:1] + "".join(sorted(texto[1:]))
+
+
+# (intenção, padrão, peso, nº de trigramas) + um índice trigrama → padrões
+# por nº de palavras: "tempo" sozinho não é comparado com "tempo de casa"
+_PADROES = []
+_INDICE = {}
+_ANAGRAMAS = {}
+for _tipo, _padroes in INTENCOES:
+    for _padrao, _peso in _padroes.items():
+        _trigs = _trigramas(_padrao)
+        _indice = _INDICE.setdefault(len(_padrao.split()), {})
+        for _tri in _trigs:
+            _indice.setdefault(_tri, []).append(len(_PADROES))
+        _ANAGRAMAS.setdefault(_anagrama(_padrao), []).append(len(_PADROES))
+        _PADROES.append((_tipo, _padrao, _peso, len(_trigs)))
+
+_PRIORIDADE = {tipo: i for i, (tipo, _) in enumerate(INTENCOES)}
+
+
+def pontuar_intencoes(t):
+    """
+    Melhor pontuação de cada intenção para o texto normalizado `t`.
+    Cada janela de n palavras é comparada com os padrões de n palavras.
+    """
+    palavras = _PALAVRAS.findall(t)
+    melhores = {}
+
+    for n, indice in _INDICE.items():
+        for i in range(len(palavras) - n + 1):
+            janela = " ".join(palavras[i:i + n])
+            trigs = _trigramas(janela)
+
+            comuns = {}
+            for tri in trigs:
+                for pid in indice.get(tri, ()):
+                    comuns[pid] = comuns.get(pid, 0) + 1
+
+            for pid, qtd in comuns.items():
+                tipo, _, peso, n_trigs = _PADROES[pid]
+                nota = peso * 2 * qtd / (len(trigs) + n_trigs)
+                if nota > melhores.get(tipo, 0):
+                    melhores[tipo] = nota
+
+            for pid in _ANAGRAMAS.get(_anagrama(janela), ()):
+                tipo, padrao, peso, _ = _PADROES[pid]
+                nota = peso * (1.0 if janela == padrao else NOTA_TRANSPOSICAO)
+                if nota > melhores.get(tipo, 0):
+                    melhores[tipo] = nota
+
+    return melhores
+
+
+def classificar_intencao(t):
+    """(intenção, confiança) para o texto normalizado; (None, 0.0) se nada passar do limiar."""
+    candidatas = [(nota, tipo) for tipo, nota in pontuar_intencoes(t).items() if nota >= LIMIAR_INTENCAO]
+    if not candidatas:
+        return None, 0.0
+    nota, tipo = max(candidatas, key=lambda c: (round(c[0], 6), -_PRIORIDADE[c[1]]))
+    return tipo, round(nota, 3)
+
+
+def interpretar_com_confianca(pergunta: str, entidades=None):
+    """
+    (intenção, confiança). Com `entidades` (cubo.entidades), centro de
+    custo e cargo citados entram na intenção e restringem as métricas.
+    """
+    t, ent = analisar_texto(pergunta)
+    tipo, confianca = classificar_intencao(t)
+    if tipo is None and (ent["areas"] or ent["anos"]) and _COMPARACAO.search(t):
+        tipo, confianca = "turnover", LIMIAR_INTENCAO
+    escopo = entidades.resolver(t) if entidades is not None and tipo else {}
+
+    area = ent["area"]
+    status = ent["status"]
+    anos = ent["anos"]
+    mes, ano_mes = ent["mes"], ent["ano_mes"]
+
+    # Comparações só entram na intenção quando pedidas: as perguntas
+    # simples continuam com a mesma intenção (e a mesma chave de cache)
+    varias_areas = {"areas": ent["areas"]} if len(ent["areas"]) > 1 else {}
+    por_mes = {"por_mes": True} if ent["por_mes"] and anos else {}
+
+    if tipo == "turnover":
+        if mes and ano_mes:
+            intent = {"tipo": "turnover_mensal", "area": area, "ano": ano_mes, "mes": mes, **varias_areas, **escopo}
+        elif "maior" in t or "pior" in t:
+            intent = {"tipo": "turnover_max", **escopo}
+        elif anos:
+            intent = {"tipo": "turnover_anual", "area": area, "anos": anos, **varias_areas, **por_mes, **escopo}
+        else:
+            intent = {"tipo": "turnover_falta_ano"}
+    elif tipo == "headcount":
+        intent = {"tipo": tipo, "area": area, "status": status or "Ativo", **varias_areas, **escopo}
+    elif tipo == "tempo_casa":
+        intent = {"tipo": tipo, "area": area, "status": status or "Ativo", **escopo}
+    elif tipo in ("admissoes", "desligamentos"):
+        intent = {"tipo": tipo, "area": area, "anos": anos, **varias_areas, **por_mes, **escopo}
+    else:
+        intent = {"tipo": "descritivo"}
+
+    return intent, confianca
+
+
+def interpretar_intencao(pergunta: str, entidades=None):
+    return interpretar_com_confianca(pergunta, entidades)[0]
+
+
+PREFIXO_RESPOSTA = "🧠 **Vamos lá! Aqui vai uma resposta bem clara e direta:**\n\n"
+
+SEM_DADOS = "Ainda não há registros {escopo} para responder a essa pergunta. Confira se a base foi publicada 😉"
+
+
+def responder(pergunta: str, df, cubo=None):
+    if cubo is None:
+        cubo = CuboMetricas(df)
+    return responder_intencao(interpretar_intencao(pergunta, cubo.entidades), df, cubo)
+
+
+def tempo_casa_medio(df, intent):
+    """Média em anos (até hoje para quem está ativo) no escopo e status da intenção."""
+    status = intent["status"]
+    df_local = filtrar_escopo(df, intent)
+    if status == "Ativo":
+        df_local = df_local[df_local["Situacao_res"] == "Ativo"]
+    elif status == "Desligado":
+        df_local = df_local[df_local["Situacao_res"] != "Ativo"]
+
+    data_ref = df_local["Data Afastamento"].fillna(pd.Timestamp(datetime.today()))
+    return ((data_ref - df_local["Admissão"]).dt.days / 365).mean()
+
+
+def calcular_intencao(intent, df, cubo):
+    """
+    (plano, tabela) da intenção. Contagens vêm do cubo de métricas
+    (cubo.py) por meio de um plano de consulta (seção 3); só o tempo de
+    casa, que depende do dia, ainda percorre a base.
+    """
+    plano = planejar(intent, cubo.anos_disponiveis)
+    if plano:
+        return plano, executar_plano(plano, cubo)
+    if intent["tipo"] == "tempo_casa":
+        return None, pd.DataFrame({"Valor": [tempo_casa_medio(df, intent)]})
+    return None, None
+
+
+def responder_intencao(intent, df, cubo=None):
+    if cubo is None:
+        cubo = CuboMetricas(df)
+    plano, tabela = calcular_intencao(intent, df, cubo)
+    return texto_da_resposta(intent, plano, tabela)
+
+
+def texto_da_resposta(intent, plano, tabela):
+    """Texto a partir do que calcular_intencao devolveu (o lote reaproveita a tabela)."""
+    tipo = intent["tipo"]
+    prefixo = PREFIXO_RESPOSTA
+
+    # ---------------- SEM DADOS (BASE VAZIA) ----------------
+    if tipo == "turnover_max" and plano is None or tabela is not None and tabela.empty:
+        return prefixo + SEM_DADOS.format(escopo=descrever_escopo(intent, "na base"))
+
+    # ---------------- COMPARAÇÕES (VÁRIAS ÁREAS / VÁRIOS PERÍODOS) ----------------
+    # "Varejo entre 2023 e 2024" também: tabela por período + variação
+    if plano and tipo != "turnover_max" and (len(plano["areas"]) > 1 or len(plano["periodos"]) > 1):
+        return prefixo + formatar_comparacao(plano, tabela)
+
+    # ---------------- HEADCOUNT ----------------
+    if tipo == "headcount":
+        status = intent["status"]
+
+        qtd = int(tabela["Valor"].iloc[0])
+
+        area_txt = descrever_escopo(intent, "na empresa como um todo")
+
+        return prefixo + (
+            f"Hoje temos **{qtd} colaboradores {status.lower()}s** {area_txt}.\n\n"
+            "Se quiser, posso te mostrar isso por ano, área, centro de custo ou histórico completo. 👇"
+        )
+
+    # ---------------- TEMPO DE CASA ----------------
+    if tipo == "tempo_casa":
+        status = intent["status"]
+        media = tabela["Valor"].iloc[0]
+
+        area_txt = descrever_escopo(intent, "na empresa")
+
+        return prefixo + (
+            f"O **tempo de casa médio** {area_txt}, considerando colaboradores **{status.lower()}s**, "
+            f"é de **{media:.2f} anos**.\n\n"
+            "Se quiser, posso separar por faixa de tempo ou por cargo 😉"
+        )
+
+    # ---------------- ADMISSÕES ----------------
+    if tipo == "admissoes":
+        anos = intent.get("anos", [])
+        if not anos:
+            return prefixo + "Me diz pelo menos um ano para eu verificar as admissões 😊"
+
+        partes = [f"👉 **{r.Ano}: {r.Valor} admissões**" for r in tabela.itertuples()]
+
+        area_txt = descrever_escopo(intent, "")
+        area_txt = f" {area_txt}" if area_txt else ""
+        return prefixo + f"Aqui está o que encontrei{area_txt}:\n\n" + "\n".join(partes)
+
+    # ---------------- DESLIGAMENTOS ----------------
+    if tipo == "desligamentos":
+        anos = intent.get("anos", [])
+        if not anos:
+            return prefixo + "Me diga o ano para eu te mostrar os desligamentos 😉"
+
+        partes = [f"👉 **{r.Ano}: {r.Valor} desligamentos**" for r in tabela.itertuples()]
+
+        area_txt = descrever_escopo(intent, "")
+        area_txt = f" {area_txt}" if area_txt else ""
+        return prefixo + f"Beleza! Aqui vai{area_txt}:\n\n" + "\n".join(partes)
+
+    # ---------------- TURNOVER MENSAL ----------------
+    if tipo == "turnover_mensal":
+        ano = intent["ano"]
+        mes = intent["mes"]
+
+        r = tabela.iloc[0]
+        adm, dem, ativos = r["Admissões"], r["Desligamentos"], r["Ativos fim"]
+        turno = r["Turnover (%)"]
+
+        area_txt = descrever_escopo(intent, "na empresa")
+
+        return prefixo + (
+            f"O turnover de **{mes:02d}/{ano} {area_txt}** foi de **{turno:.2f}%**.\n\n"
+            f"- Admissões: **{adm}**\n"
+            f"- Desligamentos: **{dem}**\n"
+            f"- Ativos no fim do mês: **{ativos}**\n\n"
+            "Se quiser, posso comparar com outro mês ou área 😉"
+        )
+
+    # ---------------- TURNOVER ANUAL ----------------
+    if tipo == "turnover_anual":
+        linhas = []
+
+        for _, r in tabela.iterrows():
+            linhas.append(
+                f"📆 **{r['Ano']}** → Turnover Alternativo: **{r['Turnover (%)']:.2f}%**, "
+                f"Admissões: {r['Admissões']}, Desligamentos: {r['Desligamentos']}"
+            )
+
+        area_txt = descrever_escopo(intent, "na empresa como um todo")
+
+        return prefixo + (
+            f"Aqui está o turnover anual {area_txt}:\n\n" +
+            "\n".join(linhas) +
+            "\n\nSe quiser comparar com outro ano, posso fazer na hora 😉"
+        )
+
+    # ---------------- TURNOVER FALTANDO ANO ----------------
+    if tipo == "turnover_falta_ano":
+        return prefixo + (
+            "Para calcular turnover eu preciso saber **o ano**. "
+            "Exemplo: `qual o turnover de 2024 no varejo?` 😉"
+        )
+
+    # ---------------- MAIOR TURNOVER HISTÓRICO ----------------
+    if tipo == "turnover_max":
+        linha = tabela.sort_values("Turnover (%)", ascending=False).iloc[0]
+        escopo = descrever_escopo(intent, "")
+
+        return prefixo + (
+            f"O **maior turnover da história**{' ' + escopo if escopo else ''} foi em **{int(linha['Ano'])}**, "
+            f"com **{linha['Turnover (%)']:.2f}%**.\n\n"
+            "Se quiser, posso te mostrar quem mais contribuiu para esse número 😉"
+        )
+
+    # ---------------- DESCRITIVO ----------------
+    return (
+        prefixo +
+        "Para te ajudar melhor, tente perguntar algo como:\n\n"
+        "- *Quantos colaboradores ativos temos na Indústria?*\n"
+        "- *Qual o turnover de 11/2025 na Matriz?*\n"
+        "- *Compare o turnover do Varejo entre 2023 e 2024*.\n\n"
+        "Tô por aqui! É só mandar a próxima pergunta 😄"
+    )
+
+
+# =====================================================================
+# 3) PLANO DE CONSULTA (COMPARAÇÕES EM UMA PASSADA)
+# =====================================================================
+# A intenção vira um plano:
+#   medida        → turnover | admissoes | desligamentos | headcount
+#   areas         → áreas comparadas (colunas)
+#   granularidade → "ano" ou "mes"
+#   periodos      → [(ano, mês ou None)]
+#   comparar      → dimensões com mais de um valor ("Área", "Período")
+#   filtros       → centro de custo / cargo resolvidos (cubo.recorte)
+# e o plano inteiro é calculado de uma vez no cubo (grade áreas ×
+# períodos), em vez de uma consulta por combinação.
+
+MEDIDAS_PLANO = {
+    "turnover_anual": "turnover",
+    "turnover_mensal": "turnover",
+    "turnover_max": "turnover",
+    "admissoes": "admissoes",
+    "desligamentos": "desligamentos",
+    "headcount": "headcount",
+}
+
+TITULOS_MEDIDA = {
+    "turnover": "Turnover (%)",
+    "admissoes": "Admissões",
+    "desligamentos": "Desligamentos",
+    "headcount": "Colaboradores",
+}
+
+
+def planejar(intent, anos_disponiveis=()):
+    """Plano da intenção, ou None quando ela não é uma métrica do cubo."""
+    tipo = intent["tipo"]
+    if tipo not in MEDIDAS_PLANO:
+        return None
+
+    areas = intent.get("areas") or [intent.get("area") or "Geral"]
+    granularidade = "ano"
+
+    if tipo == "headcount":
+        periodos = []
+    elif tipo == "turnover_mensal":
+        granularidade = "mes"
+        periodos = [(intent["ano"], intent["mes"])]
+    else:
+        anos = anos_disponiveis if tipo == "turnover_max" else intent.get("anos")
+        anos = list(dict.fromkeys(anos or []))
+        if not anos:
+            return None
+        if intent.get("por_mes"):
+            granularidade = "mes"
+            periodos = [(ano, mes) for ano in anos for mes in range(1, 13)]
+        else:
+            periodos = [(ano, None) for ano in anos]
+
+    return {
+        "medida": MEDIDAS_PLANO[tipo],
+        "areas": areas,
+        "granularidade": granularidade,
+        "periodos": periodos,
+        "status": intent.get("status"),
+        "filtros": {t: intent[t] for t in ENTIDADES if intent.get(t)},
+        "comparar": [
+            dim for dim, qtd in (("Área", len(areas)), ("Período", len(periodos))) if qtd > 1
+        ],
+    }
+
+
+def executar_plano(plano, cubo):
+    """
+    Calcula o plano em uma única grade do cubo. Devolve uma linha por
+    (área, período), com as colunas da medida e "Valor" (a medida principal).
+    """
+    medida, areas = plano["medida"], plano["areas"]
+    cubo = cubo.recorte(plano.get("filtros"))
+
+    if medida == "headcount":
+        tabela = pd.DataFrame({
+            "Área": areas,
+            "Período": "",
+            "Colaboradores": [cubo.headcount(a, plano["status"]) for a in areas],
+        })
+        tabela["Valor"] = tabela["Colaboradores"]
+        return tabela
+
+    if plano["granularidade"] == "ano":
+        tabela = cubo.grade_anual(areas, [ano for ano, _ in plano["periodos"]])
+        tabela["Mês"] = None
+        tabela["Período"] = tabela["Ano"].astype(str)
+
+        if medida == "turnover":
+            tabela["Turnover (%)"] = [
+                round(turnover_alt(a, d, f), 2)
+                for a, d, f in zip(tabela["Admissões"], tabela["Desligamentos"], tabela["Ativos fim"])
+            ]
+            tabela["Turnover Moderno (%)"] = [
+                round(turnover_moderno(a, d, i, f), 2)
+                for a, d, i, f in zip(
+                    tabela["Admissões"], tabela["Desligamentos"], tabela["Ativos início"], tabela["Ativos fim"]
+                )
+            ]
+        else:
+            # Admissões / desligamentos do ano: colunas Ano_* (regra original)
+            tabela["Admissões"] = tabela["Admissões_cadastro"]
+            tabela["Desligamentos"] = tabela["Desligamentos_cadastro"]
+        tabela = tabela.drop(columns=["Admissões_cadastro", "Desligamentos_cadastro"])
+    else:
+        tabela = cubo.grade_mensal(areas, plano["periodos"]).rename(columns={
+            "Demissões": "Desligamentos",
+            "Ativos no Final do Mês": "Ativos fim",
+        })
+        tabela["Período"] = [f"{m:02d}/{a}" for a, m in zip(tabela["Ano"], tabela["Mês"])]
+
+        if medida == "turnover":
+            tabela["Turnover (%)"] = [
+                round((a + d) / (2 * f) * 100, 2) if f > 0 else 0
+                for a, d, f in zip(tabela["Admissões"], tabela["Desligamentos"], tabela["Ativos fim"])
+            ]
+
+    colunas = {
+        "turnover": [c for c in tabela.columns if c not in ("Área", "Período", "Ano", "Mês")],
+        "admissoes": ["Admissões"],
+        "desligamentos": ["Desligamentos"],
+    }[medida]
+    tabela = tabela[["Área", "Período", "Ano", "Mês"] + colunas]
+    return tabela.assign(Valor=tabela[TITULOS_MEDIDA[medida]])
+
+
+def _fmt(valor, medida):
+    return f"{valor:.2f}%" if medida == "turnover" else f"{int(valor)}"
+
+
+def _fmt_variacao(delta, medida):
+    sinal = "+" if delta >= 0 else ""
+    return f"{sinal}{delta:.2f} p.p." if medida == "turnover" else f"{sinal}{int(delta)}"
+
+
+def formatar_comparacao(plano, tabela):
+    """Tabela em markdown: períodos nas linhas, áreas nas colunas."""
+    medida = plano["medida"]
+    areas = list(dict.fromkeys(tabela["Área"]))
+    periodos = list(dict.fromkeys(tabela["Período"]))
+    valores = {(r.Área, r.Período): r.Valor for r in tabela.itertuples()}
+
+    diferenca = len(areas) == 2
+    cabecalho = ["Período"] + areas + ([f"{areas[1]} − {areas[0]}"] if diferenca else [])
+
+    linhas = [
+        "| " + " | ".join(cabecalho) + " |",
+        "|" + "---|" * len(cabecalho),
+    ]
+    for periodo in periodos:
+        celulas = [periodo or "Hoje"] + [_fmt(valores[(a, periodo)], medida) for a in areas]
+        if diferenca:
+            celulas.append(_fmt_variacao(valores[(areas[1], periodo)] - valores[(areas[0], periodo)], medida))
+        linhas.append("| " + " | ".join(celulas) + " |")
+
+    # Variação entre o primeiro e o último período, por área
+    variacoes = []
+    if plano["granularidade"] == "ano" and len(periodos) > 1:
+        for a in areas:
+            delta = valores[(a, periodos[-1])] - valores[(a, periodos[0])]
+            variacoes.append(f"- **{a}**: {_fmt_variacao(delta, medida)} de {periodos[0]} para {periodos[-1]}")
+
+    comparando = " e ".join(d.lower() for d in plano["comparar"]) or "período"
+    escopo = descrever_escopo(plano.get("filtros") or {}, "")
+    sugestao = "comparar com outro ano" if plano["granularidade"] == "mes" else "abrir por mês"
+    return (
+        f"Comparação de **{TITULOS_MEDIDA[medida]}**{' ' + escopo if escopo else ''} por {comparando}:\n\n"
+        + "\n".join(linhas)
+        + ("\n\n" + "\n".join(variacoes) if variacoes else "")
+        + f"\n\nSe quiser, posso {sugestao} ou incluir outra área 😉"
+    )
+
+
+# =====================================================================
+# 4) CACHE DE RESPOSTAS (INTENÇÃO CANÔNICA × VERSÃO DA BASE)
+# =====================================================================
+
+TAMANHO_CACHE = 512
+
+# Quantas intenções mais frequentes do log são pré-calculadas
+TOP_AQUECIMENTO = 30
+
+# Linhas mais recentes do log consideradas no aquecimento
+JANELA_LOG = 5000
+
+# Acima disso o log é renomeado para .1 (guarda só o anterior, como o perfil.py)
+TAMANHO_MAX_LOG = 1024 * 1024
+
+# Respostas que mudam com o dia, mesmo sem base nova
+INTENCOES_COM_DATA = {"tempo_casa"}
+
+
+def intencao_canonica(intent):
+    """Perguntas diferentes com a mesma intenção viram a mesma chave."""
+    intent = dict(intent)
+    if intent.get("anos"):
+        intent["anos"] = sorted(set(intent["anos"]))
+    return intent
+
+
+def chave_intencao(intent):
+    return json.dumps(intent, sort_keys=True, ensure_ascii=False)
+
+
+class CacheRespostas:
+    """
+    LRU compartilhado entre as sessões. A versão do cubo faz parte da
+    chave (a versão da base e, para usuários com áreas restritas, as
+    áreas): cubos diferentes convivem no mesmo cache, e as respostas de
+    uma base antiga saem pelo LRU. As intenções mais pedidas (log em
+    `arquivo_log`) são recalculadas em segundo plano.
+    """
+
+    def __init__(self, tamanho=TAMANHO_CACHE, arquivo_log=None):
+        self.tamanho = tamanho
+        self.arquivo_log = Path(arquivo_log) if arquivo_log else None
+        self._respostas = OrderedDict()
+        self._aquecidas = set()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def _chave(self, intent, versao):
+        dia = date.today().isoformat() if intent["tipo"] in INTENCOES_COM_DATA else ""
+        return (versao, dia, chave_intencao(intent))
+
+    def responder(self, pergunta, df, cubo):
+        """(resposta, intenção, confiança): a página mostra a confiança sem interpretar de novo."""
+        intent, confianca = interpretar_com_confianca(pergunta, cubo.entidades)
+        intent = intencao_canonica(intent)
+        self.registrar(intent)
+        return self.responder_intencao(intent, df, cubo), intent, confianca
+
+    def responder_intencao(self, intent, df, cubo, calcular=None):
+        """`calcular()`: texto da resposta quando não está no cache (padrão: responder_intencao)."""
+        intent = intencao_canonica(intent)
+        versao = cubo.versao
+        chave = self._chave(intent, versao)
+
+        with self._lock:
+            if chave in self._respostas:
+                self.acertos += 1
+                self._respostas.move_to_end(chave)
+                return self._respostas[chave]
+            self.falhas += 1
+
+        resposta = calcular() if calcular is not None else responder_intencao(intent, df, cubo)
+
+        with self._lock:
+            self._respostas[chave] = resposta
+            while len(self._respostas) > self.tamanho:
+                self._respostas.popitem(last=False)
+
+        return resposta
+
+    # -----------------------------------------------------
+    # LOG DE INTENÇÕES + AQUECIMENTO
+    # -----------------------------------------------------
+    def registrar(self, intent):
+        """Guarda só a intenção (não o texto da pergunta)."""
+        if self.arquivo_log is None or intent["tipo"] == "descritivo":
+            return
+        try:
+            with self._lock:
+                self.arquivo_log.parent.mkdir(parents=True, exist_ok=True)
+                if self.arquivo_log.exists() and self.arquivo_log.stat().st_size > TAMANHO_MAX_LOG:
+                    os.replace(self.arquivo_log, self._log_anterior())
+                with open(self.arquivo_log, "a", encoding="utf-8") as f:
+                    f.write(chave_intencao(intent) + "\n")
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o log de intenções: {e}")
+
+    def _log_anterior(self):
+        return self.arquivo_log.with_name(self.arquivo_log.name + ".1")
+
+    def intencoes_frequentes(self, top=TOP_AQUECIMENTO):
+        if self.arquivo_log is None:
+            return []
+        # As JANELA_LOG linhas mais recentes (do .1, logo depois da rotação),
+        # lidas em fluxo: nunca mais que dois arquivos de TAMANHO_MAX_LOG
+        linhas = deque(maxlen=JANELA_LOG)
+        for arquivo in (self._log_anterior(), self.arquivo_log):
+            if arquivo.exists():
+                with open(arquivo, encoding="utf-8") as f:
+                    linhas.extend(f)
+        contagem = Counter(l.strip() for l in linhas if l.strip())
+        return [json.loads(k) for k, _ in contagem.most_common(top)]
+
+    def aquecer(self, df, cubo):
+        for intent in self.intencoes_frequentes():
+            try:
+                self.responder_intencao(intent, df, cubo)
+            except Exception:
+                # Intenção antiga que não se aplica mais à base atual
+                continue
+
+    def aquecer_em_segundo_plano(self, df, cubo):
+        """Uma vez por versão da base; não bloqueia a página."""
+        with self._lock:
+            if cubo.versao in self._aquecidas:
+                return
+            self._aquecidas.add(cubo.versao)
+
+        threading.Thread(
+            target=self.aquecer, args=(df, cubo),
+            name="aquecimento-assistente", daemon=True,
+        ).start()
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "respostas": len(self._respostas),
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+            }
+
+
+# =====================================================================
+# 5) PERGUNTAS EM LOTE
+# =====================================================================
+
+COLUNAS_LOTE = [
+    "Pergunta", "Intenção", "Confiança", "Área", "Centro de custo", "Cargo", "Período",
+    "Colaboradores", "Admissões", "Desligamentos", "Ativos no fim",
+    "Turnover (%)", "Tempo médio (anos)", "Resposta",
+]
+
+def ler_perguntas(texto):
+    """Uma pergunta por linha; ignora linhas vazias e cabeçalho 'pergunta'."""
+    perguntas = []
+    for linha in texto.splitlines():
+        linha = linha.strip().strip('"').strip()
+        if linha and _sem_acentos(linha.lower()) not in ("pergunta", "perguntas"):
+            perguntas.append(linha)
+    return perguntas
+
+
+def ler_perguntas_csv(df):
+    """Coluna 'pergunta' (qualquer caixa/acento) ou, se não houver, a primeira."""
+    coluna = next(
+        (c for c in df.columns if _sem_acentos(str(c).strip().lower()) in ("pergunta", "perguntas")),
+        df.columns[0],
+    )
+    return [str(p).strip() for p in df[coluna].dropna() if str(p).strip()]
+
+
+def texto_simples(resposta):
+    return resposta.replace(PREFIXO_RESPOSTA, "").replace("**", "").replace("`", "").strip()
+
+
+def _erro_lote(erro):
+    return f"Não consegui responder a essa pergunta: {erro}"
+
+
+def _chave_grade(plano):
+    return (plano["medida"], plano["granularidade"], plano["status"], chave_intencao(plano["filtros"]))
+
+
+def _unir_planos(planos):
+    """Um plano com todas as áreas e períodos de `planos` (mesma _chave_grade)."""
+    return {
+        **planos[0],
+        "areas": list(dict.fromkeys(a for p in planos for a in p["areas"])),
+        "periodos": list(dict.fromkeys(per for p in planos for per in p["periodos"])),
+    }
+
+
+def _recortar_grade(grade, plano):
+    """Linhas de `plano` na grade do plano unido, na ordem de executar_plano."""
+    periodos = [str(ano) if mes is None else f"{mes:02d}/{ano}" for ano, mes in plano["periodos"]] or [""]
+    linhas = pd.MultiIndex.from_product([plano["areas"], periodos], names=["Área", "Período"])
+    return grade.set_index(["Área", "Período"]).loc[linhas].reset_index()[grade.columns]
+
+
+def responder_lote(perguntas, df, cubo, cache=None):
+    """
+    Responde várias perguntas de uma vez e devolve uma tabela
+    (COLUNAS_LOTE), uma linha por pergunta e período.
+
+    Perguntas com a mesma intenção são respondidas uma única vez; os
+    planos de mesma medida viram uma só grade do cubo (áreas × períodos
+    do lote inteiro) e o texto sai da tabela já calculada. Uma pergunta
+    que falha leva o erro na coluna Resposta e não derruba o lote.
+    """
+    intencoes = {}
+    pedidas = []
+    for pergunta in perguntas:
+        intent, confianca = interpretar_com_confianca(pergunta, cubo.entidades)
+        intent = intencao_canonica(intent)
+        chave = chave_intencao(intent)
+        intencoes.setdefault(chave, intent)
+        pedidas.append((pergunta, chave, confianca))
+
+    # ---------------- NÚMEROS (UMA GRADE POR MEDIDA) ----------------
+    # Intenções com a mesma medida, granularidade, status e recorte são
+    # calculadas juntas: uma grade do cubo com todas as áreas × períodos
+    # pedidos no lote, recortada depois para cada intenção.
+    planos, tabelas, erros = {}, {}, {}
+    grades = {}
+    for chave, intent in intencoes.items():
+        try:
+            planos[chave] = plano = planejar(intent, cubo.anos_disponiveis)
+            if plano:
+                grades.setdefault(_chave_grade(plano), []).append(chave)
+            elif intent["tipo"] == "tempo_casa":
+                tabelas[chave] = calcular_intencao(intent, df, cubo)[1]
+        except Exception as e:
+            erros[chave] = _erro_lote(e)
+
+    for chaves in grades.values():
+        try:
+            grade = executar_plano(_unir_planos([planos[c] for c in chaves]), cubo)
+            for chave in chaves:
+                tabelas[chave] = _recortar_grade(grade, planos[chave])
+        except Exception:
+            # Uma intenção ruim não derruba as outras do grupo
+            for chave in chaves:
+                try:
+                    tabelas[chave] = executar_plano(planos[chave], cubo)
+                except Exception as e:
+                    erros[chave] = _erro_lote(e)
+
+    # ---------------- TEXTO (DA TABELA JÁ CALCULADA) ----------------
+    respostas = {}
+    for chave, intent in intencoes.items():
+        if chave in erros:
+            continue
+        try:
+            def calcular(intent=intent, chave=chave):
+                return texto_da_resposta(intent, planos.get(chave), tabelas.get(chave))
+
+            if cache is not None:
+                resposta = cache.responder_intencao(intent, df, cubo, calcular)
+            else:
+                resposta = calcular()
+            respostas[chave] = texto_simples(resposta)
+        except Exception as e:
+            erros[chave] = _erro_lote(e)
+
+    numeros = {}
+    for chave, tabela in tabelas.items():
+        if chave in erros:
+            continue
+        if intencoes[chave]["tipo"] == "tempo_casa":
+            numeros[chave] = [{"Tempo médio (anos)": round(tabela["Valor"].iloc[0], 2)}]
+            continue
+        if intencoes[chave]["tipo"] == "turnover_max":
+            tabela = tabela.sort_values("Turnover (%)", ascending=False).head(1)
+        numeros[chave] = tabela.rename(columns={"Ativos fim": "Ativos no fim"}).to_dict("records")
+
+    # ---------------- TABELA ----------------
+    linhas = []
+    for pergunta, chave, confianca in pedidas:
+        intent = intencoes[chave]
+        base = {
+            "Pergunta": pergunta,
+            "Intenção": intent["tipo"],
+            "Confiança": confianca,
+            "Área": intent.get("area") or "Geral",
+            "Centro de custo": intent.get("centro_custo", ""),
+            "Cargo": intent.get("cargo", ""),
+            "Período": "",
+            "Resposta": erros.get(chave) or respostas[chave],
+        }
+        for valores in numeros.get(chave) or [{}]:
+            linha = dict(base)
+            linha.update({k: v for k, v in valores.items() if k in COLUNAS_LOTE})
+            linhas.append(linha)
+
+    tabela = pd.DataFrame(linhas, columns=COLUNAS_LOTE)
+    for col in ("Colaboradores", "Admissões", "Desligamentos", "Ativos no fim"):
+        tabela[col] = tabela[col].astype("Int64")
+    return tabela
@@ -0,0 +1,85 @@
+"""
+Absenteísmo em blocos: tempo e pico de memória por tamanho da exportação.
+
+Uso:
+    python benchmarks/bench_absenteismo.py [--ausencias 1000000 4000000 ...]
+                                           [--linhas N] [--bloco N]
+
+Gera a base sintética (process_data.processar) e, para cada tamanho,
+uma exportação diária de ausências em CSV (benchmarks/sintetico.py).
+Mede o absenteismo.publicar() (tempo e pico de memória alocada, via
+tracemalloc): com leitura em blocos o pico fica parecido em todos os
+tamanhos. No menor tamanho, confere as faltas com a leitura do CSV
+inteiro em memória.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import absenteismo  # noqa: E402
+import process_data  # noqa: E402
+from sintetico import gerar, gravar_ausencias  # noqa: E402
+
+
+def conferir(arquivo, tabela):
+    """Faltas por C.Custo × mês: leitura inteira x publicada."""
+    df = pd.read_csv(arquivo, sep=";", encoding="latin-1", dtype=str)
+    data = pd.to_datetime(df["Data"], dayfirst=True)
+    esperado = df.assign(Ano=data.dt.year, **{"Mês": data.dt.month}).groupby(["C.Custo", "Ano", "Mês"]).size()
+    obtido = tabela[tabela["Faltas"] > 0].set_index(["C.Custo", "Ano", "Mês"])["Faltas"]
+    return esperado.sort_index().tolist() == obtido.sort_index().tolist() and esperado.sum() == obtido.sum()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ausencias", type=int, nargs="+", default=[500_000, 2_000_000])
+    parser.add_argument("--linhas", type=int, default=20_000, help="colaboradores da base sintética")
+    parser.add_argument("--bloco", type=int, default=absenteismo.TAMANHO_BLOCO)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    df_clt, df_pj, mapeamentos = gerar(args.linhas, args.semente)
+    df_final = process_data.processar(df_clt, df_pj, mapeamentos)
+
+    falhas = 0
+    print(f"\n{'ausências':>12}{'MB CSV':>9}{'tempo (s)':>11}{'pico (MB)':>11}  linhas/s")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for i, n in enumerate(sorted(args.ausencias)):
+            pasta = tmp / f"ausencias_{n}"
+            arquivo = gravar_ausencias(df_final, pasta / "ausencias.csv", n, args.semente)
+            destino = tmp / f"absenteismo_{n}.csv"
+
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            resumo = absenteismo.publicar(
+                df_final, mapeamentos["cc"], pasta=pasta, destino=destino,
+                tamanho=args.bloco, cache_dir=tmp / "cache",
+            )
+            tempo = time.perf_counter() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            tamanho_mb = arquivo.stat().st_size / 1e6
+            print(f"{n:>12,}{tamanho_mb:>9.0f}{tempo:>11.2f}{pico / 1e6:>11.1f}  {resumo['linhas'] / tempo:,.0f}")
+
+            if i == 0:
+                ok = conferir(arquivo, pd.read_csv(destino, dtype={"C.Custo": str}))
+                print(f"{'':>12}conferência com leitura inteira: {'✔' if ok else '✘'}")
+                falhas += not ok
+            arquivo.unlink()
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark e regressão da interpretação de perguntas do Assistente IA.
+
+Uso:
+    python benchmarks/bench_assistente.py [--repeticoes N]
+
+1) Confere a intenção de cada pergunta do corpus
+   (benchmarks/dados/perguntas_assistente.json); sai com erro se alguma mudar.
+2) Compara o tempo da normalização antiga (um str.replace por gíria +
+   extrações separadas) com o tokenizador de passada única.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from assistente import GIRIAS, analisar_texto, interpretar_intencao  # noqa: E402
+
+CORPUS = Path(__file__).resolve().parent / "dados" / "perguntas_assistente.json"
+
+
+# =========================================================
+# VERSÃO ANTERIOR (REFERÊNCIA PARA O BENCHMARK)
+# =========================================================
+def normalizar_legado(texto):
+    texto = texto.lower()
+    texto = unicodedata.normalize("NFD", texto)
+    texto = "".join(ch for ch in texto if unicodedata.category(ch) != "Mn")
+
+    for k, v in GIRIAS.items():
+        texto = texto.replace(k, v)
+
+    return texto
+
+
+def analisar_legado(pergunta):
+    t = normalizar_legado(pergunta)
+    anos = [int(a) for a in re.findall(r"(20\d{2})", t)]
+    re.search(r"(\d{1,2})[/-](20\d{2})", t)
+    for chave in ("varejo", "industria", "matriz", "geral", "empresa"):
+        if chave in t:
+            break
+    "ativo" in t and not ("deslig" in t or "demit" in t)
+    return t, anos
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def verificar_corpus(corpus):
+    falhas = 0
+    for caso in corpus:
+        obtido = interpretar_intencao(caso["pergunta"])
+        if obtido != caso["intencao"]:
+            falhas += 1
+            print(f"✘ {caso['pergunta']!r}\n    esperado: {caso['intencao']}\n    obtido:   {obtido}")
+
+    print(f"Corpus: {len(corpus) - falhas}/{len(corpus)} perguntas com a intenção esperada")
+    return falhas
+
+
+def cronometrar(func, perguntas, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for p in perguntas:
+            func(p)
+    return (time.perf_counter() - inicio) / (repeticoes * len(perguntas)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+    perguntas = [c["pergunta"] for c in corpus]
+
+    falhas = verificar_corpus(corpus)
+
+    legado = cronometrar(analisar_legado, perguntas, args.repeticoes)
+    novo = cronometrar(analisar_texto, perguntas, args.repeticoes)
+
+    print(f"\n{'normalização':<28}{'µs/pergunta':>12}")
+    print(f"{'legado (replace por gíria)':<28}{legado:>12.1f}")
+    print(f"{'tokenizador passada única':<28}{novo:>12.1f}")
+    print(f"{'ganho':<28}{legado / novo:>11.1f}x")
+
+    # Palavras que a versão antiga corrompia por substituir substrings
+    corrompidas = [
+        (p, normalizar_legado(p), analisar_texto(p)[0])
+        for p in perguntas
+        if normalizar_legado(p) != analisar_texto(p)[0]
+    ]
+    if corrompidas:
+        print("\nDiferenças de normalização (legado → novo):")
+        for p, antigo, novo_txt in corrompidas:
+            print(f"  {p!r}\n    {antigo!r}\n    {novo_txt!r}")
+
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Acurácia e tempo da resolução de centro de custo / cargo do Assistente IA.
+
+Uso:
+    python benchmarks/bench_entidades.py [--lojas N] [--repeticoes N]
+
+1) Monta um cadastro sintético com milhares de centros de custo e
+   cargos e confere as entidades de cada pergunta do conjunto
+   benchmarks/dados/entidades_acuracia.json; sai com erro se alguma falhar.
+2) Compara o índice (palavra exata, prefixo, trigramas) com a varredura
+   de todos os nomes por similaridade (difflib), em µs por pergunta.
+"""
+import argparse
+import difflib
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from assistente import normalizar  # noqa: E402
+from entidades import ENTIDADES, IndiceEntidades, normalizar_nome  # noqa: E402
+
+CONJUNTO = Path(__file__).resolve().parent / "dados" / "entidades_acuracia.json"
+
+CARGOS = [
+    "VENDEDOR", "GERENTE", "GERENTE DE LOJA", "COSTUREIRA", "ANALISTA",
+    "ANALISTA DE RH", "ANALISTA FINANCEIRO", "ESTOQUISTA", "CAIXA",
+    "SUPERVISOR DE PRODUCAO", "AUXILIAR ADMINISTRATIVO", "COORDENADOR DE MARKETING",
+]
+NIVEIS = ["", " JR", " PL", " SR"]
+
+
+def cadastro_sintetico(lojas):
+    centros = (
+        [f"LOJA {i}" for i in range(1, lojas + 1)]
+        + [f"SETOR {i}" for i in range(1, lojas // 10 + 1)]
+        + [f"CENTRO DE DISTRIBUICAO {i}" for i in range(1, 21)]
+    )
+    cargos = [c + n for c in CARGOS for n in NIVEIS]
+    linhas = max(len(centros), len(cargos))
+    return pd.DataFrame({
+        ENTIDADES["centro_custo"]: [centros[i % len(centros)] for i in range(linhas)],
+        ENTIDADES["cargo"]: [cargos[i % len(cargos)] for i in range(linhas)],
+    })
+
+
+# =========================================================
+# REFERÊNCIA: VARRER TODOS OS NOMES
+# =========================================================
+def resolver_varrendo(nomes, texto, limiar=0.85):
+    palavras = normalizar_nome(texto)
+    melhores = {}
+    for tipo, nome, alvo in nomes:
+        n = len(alvo)
+        for i in range(len(palavras) - n + 1):
+            nota = difflib.SequenceMatcher(None, " ".join(palavras[i:i + n]), " ".join(alvo)).ratio()
+            if nota >= limiar and (n, nota) > melhores.get(tipo, ((0, 0), None))[0]:
+                melhores[tipo] = ((n, nota), nome)
+    return {tipo: nome for tipo, (_, nome) in melhores.items()}
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def cronometrar(func, perguntas, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for p in perguntas:
+            func(p)
+    return (time.perf_counter() - inicio) / (repeticoes * len(perguntas)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lojas", type=int, default=3000)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    casos = json.loads(CONJUNTO.read_text(encoding="utf-8"))
+    textos = [normalizar(c["pergunta"]) for c in casos]
+
+    inicio = time.perf_counter()
+    indice = IndiceEntidades(cadastro_sintetico(args.lojas))
+    montagem = (time.perf_counter() - inicio) * 1000
+    print(f"Índice: {len(indice)} nomes, montado em {montagem:.1f} ms\n")
+
+    falhas = 0
+    for caso, texto in zip(casos, textos):
+        obtido = indice.resolver(texto)
+        if obtido != caso["entidades"]:
+            falhas += 1
+            print(f"  ✘ {caso['pergunta']!r}: esperado {caso['entidades']}, obtido {obtido}")
+    print(f"Conjunto: {len(casos) - falhas}/{len(casos)} perguntas com as entidades esperadas\n")
+
+    t_indice = cronometrar(indice.resolver, textos, args.repeticoes)
+    t_varredura = cronometrar(lambda t: resolver_varrendo(indice.nomes, t), textos[:5], 1)
+
+    print(f"{'resolução':<22}{'µs/pergunta':>14}")
+    print(f"{'varredura (difflib)':<22}{t_varredura:>14.1f}")
+    print(f"{'índice':<22}{t_indice:>14.1f}")
+
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
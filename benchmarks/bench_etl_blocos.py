@@ -0,0 +1,148 @@
+"""
+ETL em blocos (process_blocos.py) x em memória: tempo, pico de memória e conferência.
+
+Uso:
+    python benchmarks/bench_etl_blocos.py [--linhas 200000 1000000 ...]
+                                          [--bloco N] [--linhas-xlsx N]
+
+Para cada tamanho grava as exportações CLT e PJ sintéticas em CSV
+(layout da Senior, benchmarks/sintetico.py) e roda, cada um num
+processo novo (o pico de memória é o do processo inteiro, ru_maxrss;
+indisponível no Windows):
+  - memória: process_data.processar() sobre as exportações inteiras;
+  - blocos:  process_blocos.processar() em blocos de --bloco linhas.
+Exige base_tratada.csv e tempo_de_casa.csv idênticos nos dois modos.
+Depois confere o .xlsx em blocos (leitura em texto pelo openpyxl)
+com o CSV em memória, num tamanho menor (--linhas-xlsx).
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import process_blocos  # noqa: E402
+import process_data  # noqa: E402
+from historico import calcular_tempo_casa  # noqa: E402
+from leitores import hash_arquivo  # noqa: E402
+from sintetico import gerar, gravar_exportacao  # noqa: E402
+
+
+# =========================================================
+# EXECUÇÃO ISOLADA (UM PROCESSO POR MEDIÇÃO)
+# =========================================================
+def executar(modo, clt, pj, mapeamentos, saida, bloco):
+    mapeamentos = json.loads(Path(mapeamentos).read_text(encoding="utf-8"))
+    # JSON só tem chaves em texto; a Situação é convertida com astype(int)
+    mapeamentos["situacao"] = {int(k): v for k, v in mapeamentos["situacao"].items()}
+    saida = Path(saida)
+
+    inicio = time.perf_counter()
+    if modo == "blocos":
+        process_blocos.processar(
+            Path(clt), Path(pj), mapeamentos, saida / "base_tratada.csv",
+            tamanho=bloco, tempo_casa_destino=saida / "tempo_de_casa.csv",
+        )
+    else:
+        df_final = process_data.processar(
+            process_data.ler_entrada(Path(clt)), process_data.ler_entrada(Path(pj)), mapeamentos
+        )
+        process_data.salvar_csv_atomico(df_final, saida / "base_tratada.csv")
+        process_data.salvar_csv_atomico(
+            calcular_tempo_casa(df_final, process_data.pd.to_datetime("today")), saida / "tempo_de_casa.csv"
+        )
+    tempo = time.perf_counter() - inicio
+    print(json.dumps({"tempo": tempo, "pico_mb": process_data.pico_memoria_mb()}))
+
+
+def _subprocesso(*args):
+    processo = subprocess.run([sys.executable, __file__, *map(str, args)], capture_output=True, text=True, check=True)
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def medir(modo, clt, pj, mapeamentos, saida, bloco):
+    saida.mkdir(parents=True, exist_ok=True)
+    return _subprocesso("--executar", modo, clt, pj, mapeamentos, saida, bloco)
+
+
+def iguais(a, b):
+    # Hash lido aos poucos: este processo também não pode crescer (fork)
+    return all(hash_arquivo(a / nome) == hash_arquivo(b / nome) for nome in ("base_tratada.csv", "tempo_de_casa.csv"))
+
+
+def gravar_entradas(linhas, semente, pasta, sufixo):
+    df_clt, df_pj, mapeamentos = gerar(linhas, semente)
+    clt = gravar_exportacao(df_clt, pasta / f"CLT{sufixo}")
+    pj = gravar_exportacao(df_pj, pasta / f"PJ{sufixo}")
+    arquivo_maps = pasta / "mapeamentos.json"
+    arquivo_maps.write_text(json.dumps(mapeamentos, ensure_ascii=False), encoding="utf-8")
+    print(json.dumps([str(clt), str(pj), str(arquivo_maps)]))
+
+
+def entradas(linhas, semente, pasta, sufixo):
+    # Também num processo à parte: o pico de memória da geração passaria
+    # para os processos de medição (o ru_maxrss sobrevive ao fork)
+    return [Path(p) for p in _subprocesso("--gerar", linhas, semente, pasta, sufixo)]
+
+
+# =========================================================
+# COMPARAÇÃO
+# =========================================================
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[200_000, 1_000_000])
+    parser.add_argument("--bloco", type=int, default=100_000)
+    parser.add_argument("--linhas-xlsx", type=int, default=20_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--executar", nargs=6, help=argparse.SUPPRESS)
+    parser.add_argument("--gerar", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        modo, clt, pj, mapeamentos, saida, bloco = args.executar
+        executar(modo, clt, pj, mapeamentos, saida, int(bloco))
+        return 0
+    if args.gerar:
+        linhas, semente, pasta, sufixo = args.gerar
+        gravar_entradas(int(linhas), int(semente), Path(pasta), sufixo)
+        return 0
+
+    falhas = 0
+    print(f"\n{'linhas':>10}{'MB CSV':>9}{'memória (s)':>13}{'pico (MB)':>11}{'blocos (s)':>12}{'pico (MB)':>11}  iguais")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in sorted(args.linhas):
+            pasta = tmp / str(n)
+            clt, pj, maps = entradas(n, args.semente, pasta, ".csv")
+            tamanho_mb = (clt.stat().st_size + pj.stat().st_size) / 1e6
+
+            memoria = medir("memoria", clt, pj, maps, pasta / "memoria", args.bloco)
+            blocos = medir("blocos", clt, pj, maps, pasta / "blocos", args.bloco)
+            ok = iguais(pasta / "memoria", pasta / "blocos")
+            falhas += not ok
+            print(
+                f"{n:>10,}{tamanho_mb:>9.0f}{memoria['tempo']:>13.2f}{memoria['pico_mb'] or 0:>11.0f}"
+                f"{blocos['tempo']:>12.2f}{blocos['pico_mb'] or 0:>11.0f}  {'✔' if ok else '✘'}"
+            )
+
+        # .xlsx em blocos (texto) x .csv em memória, mesma base
+        pasta = tmp / "xlsx"
+        clt, pj, maps = entradas(args.linhas_xlsx, args.semente, pasta, ".csv")
+        clt_x, pj_x, _ = entradas(args.linhas_xlsx, args.semente, pasta, ".xlsx")
+        medir("memoria", clt, pj, maps, pasta / "memoria", args.bloco)
+        medir("blocos", clt_x, pj_x, maps, pasta / "blocos", max(1, args.linhas_xlsx // 7))
+        ok = iguais(pasta / "memoria", pasta / "blocos")
+        falhas += not ok
+        print(f"\n.xlsx em blocos x .csv em memória ({args.linhas_xlsx:,} linhas): {'✔' if ok else '✘'}")
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Tempo até a primeira tela do portal, com o processo "frio".
+
+Uso:
+    python benchmarks/bench_inicio.py [--repeticoes N]
+
+Cada medição roda num interpretador novo (como depois de um deploy ou
+reinício): importa o Streamlit e mede só a execução do script com o
+AppTest. Cenários:
+  - login:    app.py sem usuário logado (tela de login);
+  - home:     app.py com usuário logado;
+  - turnover: pages/1_Turnover.py com usuário logado (base em lamoda_dados).
+Mostra também quais módulos pesados foram carregados em cada cenário.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+CENARIOS = {
+    "login": ("app.py", False),
+    "home": ("app.py", True),
+    "turnover": ("pages/1_Turnover.py", True),
+}
+
+PESADOS = ["pandas", "numpy", "plotly.express", "pyarrow", "toml"]
+
+MEDICAO = """
+import json, sys, time
+sys.path.insert(0, {base!r})
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file({script!r}, default_timeout=300)
+at.secrets["users"] = {{"bench": "bench"}}
+if {logado!r}:
+    at.session_state["logged_user"] = "bench"
+
+inicio = time.perf_counter()
+at.run()
+segundos = time.perf_counter() - inicio
+
+print(json.dumps({{
+    "segundos": segundos,
+    "excecoes": [str(e.value) for e in at.exception],
+    "modulos": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def medir(script, logado):
+    codigo = MEDICAO.format(base=str(BASE_DIR), script=str(BASE_DIR / script), logado=logado, pesados=PESADOS)
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'cenário':<12}{'ms (mediana)':>14}  módulos pesados carregados")
+    for nome, (script, logado) in CENARIOS.items():
+        medicoes = [medir(script, logado) for _ in range(args.repeticoes)]
+        ms = statistics.median(m["segundos"] for m in medicoes) * 1000
+        ultima = medicoes[-1]
+        aviso = f"  ⚠️ {ultima['excecoes'][0][:60]}" if ultima["excecoes"] else ""
+        print(f"{nome:<12}{ms:>14.0f}  {', '.join(ultima['modulos']) or '—'}{aviso}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Acurácia e tempo do classificador de intenções do Assistente IA.
+
+Uso:
+    python benchmarks/bench_intencoes.py [--repeticoes N] [--minimo 0.9]
+
+1) Mede a acurácia (tipo da intenção) no conjunto
+   benchmarks/dados/intencoes_acuracia.json, com perguntas limpas,
+   erros de digitação, sinônimos e perguntas que não são métricas;
+   sai com erro se ficar abaixo de --minimo.
+2) Compara com a cadeia de if por palavra-chave usada antes do índice
+   de trigramas, em acurácia e em µs por pergunta.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from assistente import analisar_texto, interpretar_com_confianca  # noqa: E402
+
+CONJUNTO = Path(__file__).resolve().parent / "dados" / "intencoes_acuracia.json"
+
+
+# =========================================================
+# VERSÃO ANTERIOR (CADEIA DE IF, REFERÊNCIA)
+# =========================================================
+def interpretar_legado(pergunta):
+    t, ent = analisar_texto(pergunta)
+
+    if "turnover" in t:
+        if ent["mes"] and ent["ano_mes"]:
+            return {"tipo": "turnover_mensal"}
+        if "maior" in t or "pior" in t:
+            return {"tipo": "turnover_max"}
+        if ent["anos"]:
+            return {"tipo": "turnover_anual"}
+        return {"tipo": "turnover_falta_ano"}
+
+    if "qtd" in t or "quantos" in t or "colaborador" in t or "headcount" in t:
+        return {"tipo": "headcount"}
+    if "tempo de casa" in t or "tempo casa" in t:
+        return {"tipo": "tempo_casa"}
+    if "admiss" in t:
+        return {"tipo": "admissoes"}
+    if "deslig" in t or "demiss" in t:
+        return {"tipo": "desligamentos"}
+    return {"tipo": "descritivo"}
+
+
+def interpretar_indice(pergunta):
+    return interpretar_com_confianca(pergunta)[0]
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def acuracia(func, casos, mostrar_erros=False):
+    acertos = 0
+    for caso in casos:
+        obtido = func(caso["pergunta"])["tipo"]
+        if obtido == caso["tipo"]:
+            acertos += 1
+        elif mostrar_erros:
+            print(f"  ✘ {caso['pergunta']!r}: esperado {caso['tipo']}, obtido {obtido}")
+    return acertos / len(casos)
+
+
+def cronometrar(func, perguntas, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for p in perguntas:
+            func(p)
+    return (time.perf_counter() - inicio) / (repeticoes * len(perguntas)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=500)
+    parser.add_argument("--minimo", type=float, default=0.9)
+    args = parser.parse_args()
+
+    casos = json.loads(CONJUNTO.read_text(encoding="utf-8"))
+    perguntas = [c["pergunta"] for c in casos]
+
+    print(f"Conjunto: {len(casos)} perguntas ({CONJUNTO.name})\n")
+    print("Erros do índice de trigramas:")
+    acc_indice = acuracia(interpretar_indice, casos, mostrar_erros=True)
+    acc_legado = acuracia(interpretar_legado, casos)
+
+    t_legado = cronometrar(interpretar_legado, perguntas, args.repeticoes)
+    t_indice = cronometrar(interpretar_indice, perguntas, args.repeticoes)
+
+    print(f"\n{'classificador':<22}{'acurácia':>10}{'µs/pergunta':>14}")
+    print(f"{'cadeia de if':<22}{acc_legado:>10.1%}{t_legado:>14.1f}")
+    print(f"{'índice de trigramas':<22}{acc_indice:>10.1%}{t_indice:>14.1f}")
+
+    # Confiança média por faixa, para calibrar LIMIAR_INTENCAO
+    confiancas = [interpretar_com_confianca(p)[1] for p in perguntas]
+    aceitas = [c for c in confiancas if c > 0]
+    if aceitas:
+        print(f"\nConfiança: mín {min(aceitas):.2f} · média {sum(aceitas) / len(aceitas):.2f} "
+              f"({len(aceitas)} perguntas classificadas)")
+
+    sys.exit(0 if acc_indice >= args.minimo else 1)
+
+
+if __name__ == "__main__":
+    main()
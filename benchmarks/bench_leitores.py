@@ -0,0 +1,97 @@
+"""
+Benchmark dos leitores de planilha (leitores.py).
+
+Uso:
+    python benchmarks/bench_leitores.py [arquivo.xls ...] [--repeticoes N]
+
+Sem arquivos, usa os .xls/.xlsx de lamoda_dados/raw.
+Para cada arquivo mede cada motor instalado, a conversão para Arrow
+e a leitura do cache, e confere se todos os motores devolvem a mesma base.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import leitores  # noqa: E402
+from caminhos import RAW_DIR  # noqa: E402
+
+
+def cronometrar(func, repeticoes):
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), resultado
+
+
+def mesma_base(a, b):
+    if a.shape != b.shape or list(a.columns) != list(b.columns):
+        return False
+    # Comparação por texto: motores diferentes podem escolher tipos diferentes
+    return a.astype(str).equals(b.astype(str))
+
+
+def comparar(path, repeticoes):
+    conteudo = path.read_bytes()
+    print(f"\n📄 {path.name} ({len(conteudo) / 1024 / 1024:.1f} MB)")
+    print(f"{'leitor':<22}{'mediana (s)':>12}{'linhas':>10}  igual")
+
+    referencia = None
+    for motor in leitores.motores_disponiveis():
+        try:
+            tempo, df = cronometrar(lambda: leitores.ler_com_motor(conteudo, motor), repeticoes)
+        except Exception as e:
+            print(f"{motor:<22}{'—':>12}{'—':>10}  erro: {e}")
+            continue
+
+        if referencia is None:
+            referencia = df
+        igual = "✔" if mesma_base(referencia, df) else "✘"
+        print(f"{motor:<22}{tempo:>12.3f}{len(df):>10}  {igual}")
+
+    if not leitores._arrow_disponivel():
+        print("(pyarrow não instalado: cache em Arrow não medido)")
+        return
+
+    # Cache isolado em diretório temporário para não sujar o cache real
+    cache_real = leitores.CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        leitores.CACHE_DIR = Path(tmp)
+        try:
+            inicio = time.perf_counter()
+            df = leitores.ler_planilha(conteudo)
+            conversao = time.perf_counter() - inicio
+            tempo, _ = cronometrar(lambda: leitores.ler_planilha(conteudo), repeticoes)
+        finally:
+            leitores.CACHE_DIR = cache_real
+
+    print(f"{'arrow (conversão)':<22}{conversao:>12.3f}{len(df):>10}")
+    print(f"{'arrow (cache)':<22}{tempo:>12.3f}{len(df):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("arquivos", nargs="*", type=Path)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    arquivos = args.arquivos or sorted(RAW_DIR.glob("*.xls*"))
+    if not arquivos:
+        print(f"❌ Nenhuma planilha informada e nenhuma encontrada em {RAW_DIR}")
+        sys.exit(1)
+
+    print(f"Motores instalados: {', '.join(leitores.motores_disponiveis()) or 'nenhum'}")
+    for path in arquivos:
+        comparar(path, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
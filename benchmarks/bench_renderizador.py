@@ -0,0 +1,89 @@
+"""
+Exportação de PNG: fig.write_image (Chrome novo a cada chamada) x
+renderizador.py (Chrome aberto, várias abas).
+
+Uso:
+    python benchmarks/bench_renderizador.py [--usuarios N] [--graficos N]
+
+Simula N usuários baixando, ao mesmo tempo, o gráfico de tendência
+anual da página de Turnover (base publicada em lamoda_dados). Requer
+kaleido e Chrome (plotly_get_chrome).
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from dados import ler_base  # noqa: E402
+from graficos import figura_tendencia_anual  # noqa: E402
+from renderizador import PoolRenderizacao  # noqa: E402
+from turnover import turnover_anual  # noqa: E402
+
+
+def write_image(fig):
+    buffer = BytesIO()
+    fig.write_image(buffer, format="png")
+    return buffer.getvalue()
+
+
+def concorrentes(funcao, figuras, usuarios):
+    """Latência de cada pedido com `usuarios` threads pedindo juntas."""
+    tempos = []
+    lock = threading.Lock()
+
+    def usuario():
+        for fig in figuras:
+            inicio = time.perf_counter()
+            funcao(fig)
+            with lock:
+                tempos.append(time.perf_counter() - inicio)
+
+    threads = [threading.Thread(target=usuario) for _ in range(usuarios)]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - inicio, tempos
+
+
+def resumo(nome, total, tempos):
+    tempos = sorted(tempos)
+    p95 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))]
+    print(
+        f"{nome:<14} total {total:6.2f} s | mediana {statistics.median(tempos) * 1000:7.0f} ms"
+        f" | p95 {p95 * 1000:7.0f} ms | {len(tempos)} PNG"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--usuarios", type=int, default=4)
+    parser.add_argument("--graficos", type=int, default=3, help="PNG por usuário")
+    args = parser.parse_args()
+
+    df = ler_base()
+    anos = sorted(set(df["Ano_Admissao"][df["Ano_Admissao"] != 0].tolist()))
+    figuras = [figura_tendencia_anual(turnover_anual(df, anos[-n:])) for n in range(3, 3 + args.graficos)]
+
+    # Abre o Chrome fora da medição (e falha logo se não houver Chrome)
+    pool = PoolRenderizacao()
+    pool.renderizar(figuras[0])
+
+    total, tempos = concorrentes(write_image, figuras, args.usuarios)
+    resumo("write_image", total, tempos)
+
+    total, tempos = concorrentes(pool.renderizar, figuras, args.usuarios)
+    resumo("renderizador", total, tempos)
+    print(pool.estatisticas())
+    pool.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmark das etapas do process_data.py e das funções de turnover.
+
+Uso:
+    python benchmarks/bench_turnover.py [--linhas 10000 100000 ...] [--repeticoes N]
+                                        [--funcoes nome ...] [--gravar-baseline]
+
+Gera a base sintética (benchmarks/sintetico.py) para cada escala, mede
+cada etapa do ETL e cada função de turnover (mediana de N repetições)
+e confere os resultados com o baseline gravado em
+benchmarks/dados/baselines/turnover_<linhas>.json:
+  - resultado diferente do baseline → sai com erro (otimização mudou o número);
+  - tempo é só comparado (×) — máquinas diferentes, tempos diferentes.
+
+--gravar-baseline regrava o baseline das escalas medidas (após uma
+mudança de regra intencional).
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import process_data  # noqa: E402
+import turnover  # noqa: E402
+import validacao  # noqa: E402
+from cubo import CuboMetricas  # noqa: E402
+from historico import calcular_tempo_casa  # noqa: E402
+from sintetico import DATA_REFERENCIA, gerar  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / "dados" / "baselines"
+
+# Dependem do dia em que o benchmark roda
+COLUNAS_VOLATEIS = ["Idade"]
+
+
+# =========================================================
+# RESUMO DOS RESULTADOS (COMPARÁVEL ENTRE EXECUÇÕES)
+# =========================================================
+def _numero(valor):
+    valor = float(valor)
+    return None if math.isnan(valor) else round(valor, 4)
+
+
+def resumir(resultado):
+    """Dict → valores; DataFrame → linhas, colunas, somas e nº de distintos."""
+    if isinstance(resultado, dict):
+        return {k: _numero(v) if isinstance(v, (int, float, np.number)) else str(v) for k, v in resultado.items()}
+
+    if isinstance(resultado, tuple):
+        return [resumir(r) for r in resultado]
+
+    df = resultado.drop(columns=[c for c in COLUNAS_VOLATEIS if c in resultado.columns])
+    resumo = {"linhas": len(df), "colunas": list(df.columns), "somas": {}, "distintos": {}}
+    for col in df.columns:
+        serie = df[col]
+        if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            resumo["somas"][col] = _numero(serie.sum())
+        elif pd.api.types.is_datetime64_any_dtype(serie):
+            # Em dias: não depende da resolução (ns/us) escolhida pelo pandas
+            resumo["somas"][col] = _numero((serie.dropna() - pd.Timestamp(0)).dt.days.sum())
+        else:
+            resumo["distintos"][col] = int(serie.nunique())
+    return resumo
+
+
+# =========================================================
+# CASOS MEDIDOS
+# =========================================================
+def etapas_etl(mapeamentos):
+    """
+    Lista de (nome, função) na ordem do process_data.processar(). Cada
+    função recebe (uma cópia de) o estado anterior e devolve o próximo.
+    """
+    def limpeza(e):
+        return process_data.limpeza_inicial(e[0]), process_data.limpeza_inicial(e[1])
+
+    def cargos(e):
+        return process_data.remover_cargos(*e)
+
+    def datas(e):
+        return tuple(process_data.tratar_datas(d) for d in e)
+
+    def validar(e):
+        # Datas já convertidas no lugar das brutas: só as NaT voltam a texto, como no ETL
+        return tuple(
+            validacao.validar(d, d[process_data.DATE_COLS], mapeamentos, tipo)
+            for d, tipo in zip(e, ("CLT", "PJ"))
+        )
+
+    def colunas_data(e):
+        return tuple(process_data.colunas_de_data(d) for d in e)
+
+    def mapear(e):
+        return tuple(process_data.aplicar_mapeamentos(d, mapeamentos) for d in e)
+
+    def lojas_temporarios(e):
+        return process_data.remover_lojas_e_temporarios(e[0], mapeamentos["temporarios"]), e[1]
+
+    def areas(e):
+        return tuple(process_data.classificar_areas(d, mapeamentos["cc"]) for d in e)
+
+    def unificar(e):
+        return process_data.unificar(*e)
+
+    def tempo_casa(df_final):
+        return calcular_tempo_casa(df_final, DATA_REFERENCIA)
+
+    return [
+        ("etl.limpeza_inicial", limpeza),
+        ("etl.remover_cargos", cargos),
+        ("etl.tratar_datas", datas),
+        ("etl.validar", validar),
+        ("etl.colunas_de_data", colunas_data),
+        ("etl.aplicar_mapeamentos", mapear),
+        ("etl.remover_lojas_e_temporarios", lojas_temporarios),
+        ("etl.classificar_areas", areas),
+        ("etl.unificar", unificar),
+        ("etl.tempo_de_casa", tempo_casa),
+    ]
+
+
+def funcoes_turnover(df, ano):
+    varejo = df[df["Area"] == "Varejo"]
+    return [
+        ("turnover.calcular_turnover_periodo", lambda: turnover.calcular_turnover_periodo(df, ano)),
+        ("turnover.turnover_por_area", lambda: turnover.turnover_por_area(df, ano)),
+        ("turnover.turnover_por_centro_custo", lambda: turnover.turnover_por_centro_custo(df, ano)),
+        ("turnover.turnover_por_cc", lambda: turnover.turnover_por_cc(df, ano)),
+        ("turnover.turnover_por_cc (agrupado)", lambda: turnover.turnover_por_cc(
+            df, ano, filtrar_pequenos=False, agrupar_pequenos=True, min_ativos=8)),
+        ("turnover.montar_tabela_mensal_area", lambda: turnover.montar_tabela_mensal_area(
+            varejo, [ano - 1, ano], area_label="Varejo")),
+        ("cubo.CuboMetricas", lambda: CuboMetricas(df, entidades=False)),
+        ("cubo.tabela_mensal", lambda: CuboMetricas(df, entidades=False).tabela_mensal([ano - 1, ano])),
+    ]
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def cronometrar(func, repeticoes, preparar=None):
+    """Mediana de `repeticoes`; `preparar()` (fora do cronômetro) gera o argumento."""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        args = (preparar(),) if preparar else ()
+        inicio = time.perf_counter()
+        resultado = func(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), resultado
+
+
+def _copiar(estado):
+    if isinstance(estado, tuple):
+        return tuple(d.copy() for d in estado)
+    return estado.copy()
+
+
+def medir(linhas, semente, repeticoes, filtro):
+    inicio = time.perf_counter()
+    df_clt, df_pj, mapeamentos = gerar(linhas, semente)
+    print(f"\n📊 {linhas:,} linhas (semente {semente}) — geração em {time.perf_counter() - inicio:.2f} s")
+
+    tempos, resultados = {}, {}
+
+    # ETL: cada etapa parte do resultado da anterior (cópias fora do cronômetro,
+    # porque várias etapas alteram a base recebida)
+    estado = (df_clt, df_pj)
+    for nome, etapa in etapas_etl(mapeamentos):
+        entrada = estado
+        tempo, estado = cronometrar(etapa, repeticoes, preparar=lambda: _copiar(entrada))
+        if not filtro or any(f in nome for f in filtro):
+            tempos[nome], resultados[nome] = tempo, resumir(estado)
+        if nome == "etl.unificar":
+            df_final = estado
+    estado = entrada = None
+
+    ano = DATA_REFERENCIA.year - 1
+    for nome, func in funcoes_turnover(df_final, ano):
+        if filtro and not any(f in nome for f in filtro):
+            continue
+        tempos[nome], resultado = cronometrar(func, repeticoes)
+        if isinstance(resultado, CuboMetricas):
+            resultado = resultado.anual(ano)
+        resultados[nome] = resumir(resultado)
+
+    return tempos, resultados
+
+
+def comparar(tempos, resultados, baseline):
+    referencia_t = baseline.get("tempos", {}) if baseline else {}
+    referencia_r = baseline.get("resultados", {}) if baseline else {}
+
+    print(f"{'caso':<42}{'tempo (s)':>11}{'baseline':>11}{'×':>7}  resultado")
+    divergencias = []
+    for nome, tempo in tempos.items():
+        base_t = referencia_t.get(nome)
+        razao = f"{tempo / base_t:>7.2f}" if base_t else f"{'—':>7}"
+        base_txt = f"{base_t:>11.4f}" if base_t else f"{'—':>11}"
+
+        if nome not in referencia_r:
+            situacao = "sem baseline"
+        elif referencia_r[nome] == resultados[nome]:
+            situacao = "✔"
+        else:
+            situacao = "✘ diferente"
+            divergencias.append(nome)
+        print(f"{nome:<42}{tempo:>11.4f}{base_txt}{razao}  {situacao}")
+    return divergencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--funcoes", nargs="*", help="mede só os casos cujo nome contém um destes trechos")
+    parser.add_argument("--gravar-baseline", action="store_true")
+    args = parser.parse_args()
+
+    falhas = []
+    for linhas in args.linhas:
+        arquivo = BASELINES / f"turnover_{linhas}.json"
+        baseline = json.loads(arquivo.read_text(encoding="utf-8")) if arquivo.exists() else None
+        if baseline and baseline.get("semente") != args.semente:
+            print(f"⚠️ baseline de {linhas} linhas usa semente {baseline.get('semente')}: resultados não comparáveis")
+            baseline = None
+
+        tempos, resultados = medir(linhas, args.semente, args.repeticoes, args.funcoes)
+        divergencias = comparar(tempos, resultados, baseline)
+
+        if args.gravar_baseline:
+            anterior = baseline or {}
+            BASELINES.mkdir(parents=True, exist_ok=True)
+            arquivo.write_text(json.dumps({
+                "linhas": linhas,
+                "semente": args.semente,
+                "ambiente": {
+                    "python": platform.python_version(),
+                    "pandas": pd.__version__,
+                    "numpy": np.__version__,
+                },
+                "tempos": {**anterior.get("tempos", {}), **{k: round(v, 6) for k, v in tempos.items()}},
+                "resultados": {**anterior.get("resultados", {}), **resultados},
+            }, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"💾 Baseline gravado: {arquivo.relative_to(BASE_DIR)}")
+        elif divergencias:
+            falhas.extend(f"{linhas}: {nome}" for nome in divergencias)
+
+    if falhas:
+        print("\n❌ Resultados diferentes do baseline:\n  " + "\n  ".join(falhas))
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Conferência das bases compartilhadas somente leitura (conjunto.py).
+
+Uso:
+    python benchmarks/conferir_somente_leitura.py
+
+Monta uma base sintética com somente_leitura() e tenta alterá-la por
+todos os caminhos do pandas (colunas, .loc/.iloc/.at/.iat, update,
+métodos com inplace=True, atributos). Cada tentativa tem de falhar e a
+base tem de continuar igual; leituras, filtros e derivar() continuam
+funcionando.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import process_data  # noqa: E402
+from conjunto import derivar, somente_leitura  # noqa: E402
+from sintetico import gerar  # noqa: E402
+
+
+def escritas(b):
+    """(nome, função) de cada tentativa de escrita."""
+    return [
+        ("coluna nova", lambda: b.__setitem__("x", 1)),
+        ("coluna existente", lambda: b.__setitem__("Area", "ZZ")),
+        ("del coluna", lambda: b.__delitem__("Area")),
+        ("insert", lambda: b.insert(0, "x", 1)),
+        ("pop", lambda: b.pop("Area")),
+        (".loc", lambda: b.loc.__setitem__((0, "Area"), "ZZ")),
+        (".loc (máscara)", lambda: b.loc.__setitem__(b["Area"] == "Varejo", "Area")),
+        (".iloc", lambda: b.iloc.__setitem__((0, 0), None)),
+        (".at", lambda: b.at.__setitem__((1, "Area"), "Q")),
+        (".iat", lambda: b.iat.__setitem__((1, 0), None)),
+        ("update", lambda: b.update(pd.DataFrame({"Area": ["Q"]}))),
+        ("fillna(inplace)", lambda: b.fillna(0, inplace=True)),
+        ("replace(inplace)", lambda: b.replace("Varejo", "Q", inplace=True)),
+        ("drop(inplace)", lambda: b.drop(columns="Area", inplace=True)),
+        ("sort_values(inplace)", lambda: b.sort_values("Area", inplace=True)),
+        ("rename(inplace)", lambda: b.rename(columns={"Area": "A"}, inplace=True)),
+        ("reset_index(inplace)", lambda: b.reset_index(drop=True, inplace=True)),
+        ("columns =", lambda: setattr(b, "columns", list(range(b.shape[1])))),
+        ("atributo = coluna", lambda: setattr(b, "Area", "ZZ")),
+        ("to_numpy()[0] =", lambda: b["Ano_Admissao"].to_numpy().__setitem__(0, -1)),
+    ]
+
+
+def main():
+    df_clt, df_pj, mapeamentos = gerar(2_000, 42)
+    original = process_data.processar(df_clt, df_pj, mapeamentos)
+    b = somente_leitura(original.copy())
+
+    falhas = []
+    for i in range(len(escritas(b))):
+        # Lista refeita a cada tentativa: `b` pode ter sido recriada
+        nome, escrever = escritas(b)[i]
+        try:
+            escrever()
+            falhas.append(f"{nome}: escrita aceita")
+        except Exception:
+            pass
+        if not b.equals(original):
+            falhas.append(f"{nome}: base alterada")
+            b = somente_leitura(original.copy())
+
+    # Leituras continuam valendo
+    try:
+        assert b.loc[b["Area"] == "Varejo", "Area"].eq("Varejo").all()
+        assert b.at[0, "Area"] == original.at[0, "Area"]
+        assert b.iloc[:3].shape[0] == 3 and b.iat[0, 0] == original.iat[0, 0]
+        assert "x" in derivar(b, {"x": 1}).columns and "x" not in b.columns
+        assert type(b[b["Area"] == "Varejo"]) is pd.DataFrame
+    except AssertionError:
+        falhas.append("leitura sobre a base somente leitura")
+
+    if falhas:
+        print("❌ Base compartilhada alterável:\n  " + "\n  ".join(falhas))
+        return 1
+    print(f"✅ {len(escritas(b))} tentativas de escrita recusadas; base intacta")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
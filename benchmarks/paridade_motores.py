@@ -0,0 +1,181 @@
+"""
+Conferência dos motores de consulta: pandas x DuckDB (consultas.py) e
+pandas x base particionada por área e ano (particoes.py).
+
+Uso:
+    python benchmarks/paridade_motores.py [--linhas N] [--semente S]
+                                          [--motores duckdb particoes]
+
+Gera uma base sintética, passa pelo process_data.processar() e grava
+base_tratada.csv / tempo_de_casa.csv numa pasta temporária, como na
+publicação. Depois roda as mesmas consultas da página de Turnover e da
+API em cada motor (todas as áreas e cada área, todos os anos e cada
+ano, opções de CC) e exige resultado idêntico ao do pandas, inclusive
+tipos das colunas. Mostra o tempo total de cada motor.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import process_data  # noqa: E402
+from consultas import ConsultasDuckDB, ConsultasPandas, preparar_duckdb  # noqa: E402
+from dados import ler_base, ler_tempo_casa  # noqa: E402
+from historico import calcular_tempo_casa  # noqa: E402
+from particoes import ConsultasParticionadas, preparar_particoes  # noqa: E402
+from sintetico import DATA_REFERENCIA, gerar  # noqa: E402
+from tempo_casa import FAIXAS, SITUACOES  # noqa: E402
+
+
+def publicar(linhas, semente, pasta):
+    df_clt, df_pj, mapeamentos = gerar(linhas, semente)
+    df_final = process_data.processar(df_clt, df_pj, mapeamentos)
+    df_final.to_csv(pasta / "base_tratada.csv", index=False)
+    calcular_tempo_casa(df_final, DATA_REFERENCIA).to_csv(pasta / "tempo_de_casa.csv", index=False)
+
+
+def consultas_conferidas(motor):
+    """(nome, função) de todas as consultas comparadas."""
+    anos, areas = motor.dimensoes()
+    selecoes_areas = [areas] + [[a] for a in areas]
+    selecoes_anos = [anos] + [[a] for a in anos]
+
+    casos = [
+        ("dimensoes", lambda: motor.dimensoes()),
+        ("registros", lambda: motor.registros()),
+    ]
+    for sel_areas in selecoes_areas:
+        rotulo = "todas" if sel_areas is areas else sel_areas[0]
+        casos += [
+            (f"areas_presentes[{rotulo}]", lambda a=sel_areas: motor.areas_presentes(a)),
+            (f"headcount[{rotulo}]", lambda a=sel_areas: motor.headcount(a)),
+            (f"turnover_mensal_areas[{rotulo}]", lambda a=sel_areas: motor.turnover_mensal_areas(a, anos)),
+        ]
+        for sel_anos in selecoes_anos:
+            rotulo_anos = "todos" if sel_anos is anos else sel_anos[0]
+            casos += [
+                (f"turnover_anual[{rotulo}, {rotulo_anos}]",
+                 lambda a=sel_areas, y=sel_anos: motor.turnover_anual(a, y)),
+                (f"turnover_por_area_anos[{rotulo}, {rotulo_anos}]",
+                 lambda a=sel_areas, y=sel_anos: motor.turnover_por_area_anos(a, y)),
+            ]
+        for ano in anos:
+            casos += [
+                (f"turnover_periodo[{rotulo}, {ano}]", lambda a=sel_areas, y=ano: motor.turnover_periodo(a, y)),
+                (f"turnover_por_cc[{rotulo}, {ano}]", lambda a=sel_areas, y=ano: motor.turnover_por_cc(a, y)),
+                (f"turnover_por_cc agrupado[{rotulo}, {ano}]", lambda a=sel_areas, y=ano: motor.turnover_por_cc(
+                    a, y, filtrar_pequenos=False, agrupar_pequenos=True, min_ativos=8)),
+                (f"turnover_por_cc filtrado[{rotulo}, {ano}]", lambda a=sel_areas, y=ano: motor.turnover_por_cc(
+                    a, y, filtrar_pequenos=True, agrupar_pequenos=False, min_ativos=8)),
+            ]
+        for situacao in SITUACOES:
+            for faixa in ["Todos"] + list(FAIXAS):
+                for por_area in (False, True):
+                    casos.append((
+                        f"resumo_tempo_casa[{rotulo}, {situacao}, {faixa}, por_area={por_area}]",
+                        lambda a=sel_areas, s=situacao, f=faixa, p=por_area: motor.resumo_tempo_casa(a, s, f, p),
+                    ))
+    for area in areas:
+        casos.append((f"tabela_mensal_area[{area}]", lambda a=area: motor.tabela_mensal_area(a, anos)))
+    return casos
+
+
+def iguais(a, b):
+    if isinstance(a, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(a, b)
+        except AssertionError as e:
+            return str(e).splitlines()[0]
+        return None
+    return None if a == b else f"{a!r} != {b!r}"
+
+
+def montar(motor, pasta):
+    """Motor a conferir, montado a partir dos CSVs publicados."""
+    base_file, tempo_casa_file = pasta / "base_tratada.csv", pasta / "tempo_de_casa.csv"
+    if motor == "duckdb":
+        return ConsultasDuckDB(preparar_duckdb("paridade", base_file, tempo_casa_file, pasta))
+    destino = preparar_particoes(
+        "paridade", lambda: ler_base(base_file), lambda: ler_tempo_casa(tempo_casa_file), pasta / "particoes"
+    )
+    return ConsultasParticionadas(destino)
+
+
+def conferir(pandas_, motor):
+    """(divergências, tempo pandas, tempo do motor)."""
+    divergencias = []
+    tempos = [0.0, 0.0]
+
+    # A base montada pelo motor (páginas que ainda usam pandas) é a mesma do CSV
+    for nome, esperado, obtido in [
+        ("base", pandas_.base(), motor.base()),
+        ("tempo_casa", pandas_.tempo_casa(), motor.tempo_casa()),
+    ] + [
+        (f"base[{area}]", pandas_.base(areas=[area]).reset_index(drop=True), motor.base(areas=[area]))
+        for area in pandas_.dimensoes()[1]
+    ]:
+        erro = iguais(esperado, obtido)
+        if erro:
+            divergencias.append((nome, erro))
+
+    casos_motor = dict(consultas_conferidas(motor))
+    for nome, func in consultas_conferidas(pandas_):
+        inicio = time.perf_counter()
+        esperado = func()
+        tempos[0] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtido = casos_motor[nome]()
+        tempos[1] += time.perf_counter() - inicio
+
+        erro = iguais(esperado, obtido)
+        if erro:
+            divergencias.append((nome, erro))
+    return divergencias, tempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=20_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--motores", nargs="+", choices=["duckdb", "particoes"], default=["duckdb", "particoes"])
+    args = parser.parse_args()
+
+    falhas = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = Path(tmp)
+        publicar(args.linhas, args.semente, pasta)
+
+        pandas_ = ConsultasPandas(ler_base(pasta / "base_tratada.csv"), ler_tempo_casa(pasta / "tempo_de_casa.csv"))
+        n_consultas = len(consultas_conferidas(pandas_))
+
+        for nome_motor in args.motores:
+            inicio = time.perf_counter()
+            motor = montar(nome_motor, pasta)
+            print(f"\n⚙️ Motor {nome_motor} montado em {time.perf_counter() - inicio:.2f} s")
+
+            divergencias, (t_pandas, t_motor) = conferir(pandas_, motor)
+            if nome_motor == "duckdb":
+                motor._con.close()
+
+            print(f"📊 {n_consultas} consultas | pandas {t_pandas:.2f} s | {nome_motor} {t_motor:.2f} s")
+            for nome, erro in divergencias[:20]:
+                print(f"❌ {nome}: {erro}")
+            if divergencias:
+                print(f"❌ {len(divergencias)} divergências")
+                falhas += 1
+            else:
+                print(f"✅ Resultados idênticos: pandas x {nome_motor}")
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
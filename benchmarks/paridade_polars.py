@@ -0,0 +1,148 @@
+"""
+Conferência do ETL em Polars (process_polars.py) com o process_data.py.
+
+Uso:
+    python benchmarks/paridade_polars.py [--linhas 20000 200000 ...] [--semente S]
+
+Para cada escala gera as planilhas sintéticas e roda os dois caminhos
+em três formas de entrada:
+  - DataFrames da geração (datas já em datetime);
+  - .arrow em disco, como o cache de planilhas (scan_ipc no Polars);
+  - exportação .csv da Senior (process_data.ler_entrada nos dois);
+  - datas em texto dd/mm/aaaa, com lixo ("00/00/0000", "--"), e
+    mapeamentos com chaves em texto, como os .txt de mapeamentos/;
+  - as mesmas datas em texto com linhas inválidas (datas impossíveis,
+    afastamento antes da admissão, Situação vazia, em texto ou fora do
+    situacao_map), que vão para a quarentena (validacao.py).
+Exige DataFrames idênticos (colunas, ordem, tipos e valores), as mesmas
+contagens de quarentena por motivo e mostra o tempo de cada caminho.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import process_data  # noqa: E402
+import process_polars  # noqa: E402
+from leitores import _salvar_arrow  # noqa: E402
+from sintetico import gerar, gravar_exportacao  # noqa: E402
+from validacao import Quarentena  # noqa: E402
+
+
+def datas_em_texto(d, semente):
+    d = d.copy()
+    rng = np.random.default_rng(semente)
+    for col in process_data.DATE_COLS:
+        texto = d[col].dt.strftime("%d/%m/%Y").astype(object)
+        # Só em linhas preenchidas: as vazias continuam vazias (dropna)
+        lixo = (rng.random(len(d)) < 0.01) & d["Nome"].notna().to_numpy()
+        texto[lixo] = rng.choice(["00/00/0000", "--", " "], lixo.sum())
+        d[col] = texto
+    return d
+
+
+def com_linhas_invalidas(d, semente):
+    """Datas em texto + uma fatia de linhas que a validação separa."""
+    d = datas_em_texto(d, semente)
+    # Situação em texto, como num CSV
+    d["Situação"] = d["Situação"].astype("Int64").astype("str")
+    rng = np.random.default_rng(semente)
+    preenchidas = d.index[d["Nome"].notna()]
+    grupos = np.array_split(rng.choice(preenchidas, min(len(preenchidas), max(7, len(d) // 100)), replace=False), 7)
+    d.loc[grupos[0], "Admissão"] = "31/02/2020"
+    d.loc[grupos[1], "Nascimento"] = "sem data"
+    d.loc[grupos[2], "Nascimento"] = "01/01/2039"
+    d.loc[grupos[3], "Data Afastamento"] = "01/01/2009"
+    d.loc[grupos[4], "Situação"] = "X"
+    d.loc[grupos[5], "Situação"] = "99"
+    d.loc[grupos[6], "Situação"] = None
+    return d
+
+
+def chaves_em_texto(mapeamentos):
+    return {
+        nome: {str(k): v for k, v in valor.items()} if isinstance(valor, dict) else valor
+        for nome, valor in mapeamentos.items()
+    }
+
+
+def cenarios(df_clt, df_pj, mapeamentos, semente, pasta):
+    import polars as pl
+
+    yield "DataFrames", (df_clt, df_pj), (df_clt, df_pj), mapeamentos
+
+    arquivos = []
+    for nome, d in (("clt", df_clt), ("pj", df_pj)):
+        _salvar_arrow(d, pasta / f"{nome}.arrow")
+        arquivos.append(pasta / f"{nome}.arrow")
+    yield (
+        "arquivo .arrow",
+        tuple(pd.read_feather(a) for a in arquivos),
+        tuple(pl.scan_ipc(a) for a in arquivos),
+        mapeamentos,
+    )
+
+    csvs = [gravar_exportacao(d, pasta / f"{nome}.csv") for nome, d in (("clt", df_clt), ("pj", df_pj))]
+    yield "exportação .csv", tuple(process_data.ler_entrada(c) for c in csvs), tuple(csvs), mapeamentos
+
+    texto = (datas_em_texto(df_clt, semente), datas_em_texto(df_pj, semente + 1))
+    yield "datas/chaves em texto", texto, texto, chaves_em_texto(mapeamentos)
+
+    invalidas = (com_linhas_invalidas(df_clt, semente), com_linhas_invalidas(df_pj, semente + 1))
+    yield "linhas inválidas", invalidas, invalidas, chaves_em_texto(mapeamentos)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[20_000])
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    if not process_polars.disponivel():
+        print("❌ polars não instalado.")
+        return 1
+
+    divergencias = []
+    for linhas in args.linhas:
+        df_clt, df_pj, mapeamentos = gerar(linhas, args.semente)
+        print(f"\n📊 {linhas:,} linhas (semente {args.semente})")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for nome, entrada_pandas, entrada_polars, maps in cenarios(
+                df_clt, df_pj, mapeamentos, args.semente, Path(tmp)
+            ):
+                q_pandas, q_polars = Quarentena(), Quarentena()
+                inicio = time.perf_counter()
+                esperado = process_data.processar(*(d.copy() for d in entrada_pandas), maps, q_pandas)
+                t_pandas = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                obtido = process_polars.processar(*entrada_polars, maps, q_polars)
+                t_polars = time.perf_counter() - inicio
+
+                try:
+                    pd.testing.assert_frame_equal(esperado, obtido)
+                    assert q_pandas.resumo()["motivos"] == q_polars.resumo()["motivos"], "quarentena diferente"
+                    situacao = f"✔ ({sum(q_pandas.separadas.values())} em quarentena)"
+                except AssertionError as e:
+                    situacao = "✘ " + str(e).splitlines()[0]
+                    divergencias.append(f"{linhas}: {nome}")
+                print(f"   {nome:<24} pandas {t_pandas:7.3f} s | polars {t_polars:7.3f} s  {situacao}")
+
+    if divergencias:
+        print("\n❌ Resultados diferentes:\n  " + "\n  ".join(divergencias))
+        return 1
+    print("\n✅ Polars e pandas geram a mesma base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
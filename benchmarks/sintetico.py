@@ -0,0 +1,280 @@
+"""
+Gerador de bases sintéticas de RH (CLT e PJ) com o layout da Senior.
+
+Uso:
+    python benchmarks/sintetico.py [--linhas N] [--semente S] [--saida pasta]
+
+As exportações reais não podem sair da empresa; este gerador produz
+as mesmas colunas das planilhas brutas (Admissão, Data Afastamento,
+Situação, Causa, C.Custo, Título Reduzido (Cargo)...) e os mapeamentos
+que o process_data.py usa, sempre iguais para a mesma semente.
+Inclui o "ruído" que o ETL remove: linhas vazias, aprendizes,
+estagiários, cargos PJ excluídos, lojas fechadas e temporários.
+
+Com --saida grava clt.csv, pj.csv e mapeamentos.json.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Todas as datas são relativas a esta referência (semana do SEMANA padrão)
+DATA_REFERENCIA = pd.Timestamp("2025-12-02")
+INICIO_ADMISSOES = pd.Timestamp("2010-01-01")
+
+PROPORCAO_PJ = 0.15
+
+# Tempo de casa médio (anos) de quem já saiu
+TEMPO_MEDIO_ANOS = 3.0
+
+SITUACOES = {
+    1: "Trabalhando",
+    2: "Férias",
+    3: "Licença Maternidade",
+    4: "Atestado Médico",
+    7: "Demitido",
+    8: "Aposentadoria por Invalidez",
+}
+
+CAUSAS = {
+    "0": "ATIVO",
+    "1": "Pedido de Demissão",
+    "2": "Demissão sem Justa Causa",
+    "3": "Término de Contrato",
+    "4": "Demissão por Justa Causa",
+    "5": "Morte",
+}
+
+CARGOS_CLT = {
+    "Varejo": ["VENDEDOR", "VENDEDOR SR", "GERENTE DE LOJA", "SUBGERENTE", "CAIXA", "ESTOQUISTA"],
+    "Indústria": ["COSTUREIRA", "CORTADOR", "SUPERVISOR DE PRODUCAO", "MODELISTA", "AUX DE PRODUCAO"],
+    "Matriz": ["ANALISTA DE RH", "ANALISTA FINANCEIRO", "COORDENADOR DE MARKETING", "AUX ADMINISTRATIVO"],
+}
+CARGOS_PJ = ["CONSULTOR", "DESIGNER", "DESENVOLVEDOR", "FOTOGRAFO"]
+
+# Removidos pelo ETL
+CARGOS_RUIDO_CLT = ["JOVEM APRENDIZ", "ESTAGIARIO", "ESTAGIARIA"]
+CARGOS_RUIDO_PJ = ["PRESTADOR DE SERVIÇO", "MOTORISTA", "VIGILANTE", "ZELADORA"]
+LOJAS_FECHADAS = ["LOJA OUTLET TIJUCAS", "LOJA CONTINENTE PARK SHOPPING"]
+PROPORCAO_RUIDO = 0.02
+
+
+def centros_de_custo(linhas):
+    """
+    (código, descrição, descrição no cc_map, área). A quantidade cresce
+    devagar com a base, como numa empresa real (dezenas a centenas).
+    """
+    lojas = int(np.clip(linhas // 400, 20, 250))
+    centros = []
+    for i in range(1, lojas + 1):
+        centros.append((1000 + i, f"LOJA {i}", f"LOJAS - LOJA {i}", "Varejo"))
+    for i in range(1, max(5, lojas // 10) + 1):
+        centros.append((2000 + i, f"COSTURA {i}", f"SUPPLY - COSTURA {i}", "Indústria"))
+    for i, nome in enumerate(["RH", "FINANCEIRO", "MARKETING", "TI", "LOGISTICA", "DIRETORIA"], start=1):
+        centros.append((3000 + i, nome, f"ADMINISTRATIVO - {nome}", "Matriz"))
+    return centros
+
+
+def _datas(rng, n):
+    """Admissão, afastamento (NaT para ativos) e nascimento."""
+    dias_total = (DATA_REFERENCIA - INICIO_ADMISSOES).days
+    admissao = INICIO_ADMISSOES + pd.to_timedelta(rng.integers(0, dias_total, n), unit="D")
+    tempo = pd.to_timedelta(rng.exponential(TEMPO_MEDIO_ANOS * 365, n).astype("int64") + 30, unit="D")
+    afastamento = pd.Series(admissao + tempo)
+    afastamento = afastamento.where(afastamento <= DATA_REFERENCIA)
+    idade_admissao = rng.integers(18 * 365, 55 * 365, n)
+    nascimento = admissao - pd.to_timedelta(idade_admissao, unit="D")
+    return pd.Series(admissao), afastamento, pd.Series(nascimento)
+
+
+def _base(rng, n, tipo, centros, inicio_cadastro):
+    if n == 0:
+        return pd.DataFrame()
+
+    codigos = np.array([str(c[0]) for c in centros], dtype=object)
+    descricoes = np.array([c[1] for c in centros])
+    areas = np.array([c[3] for c in centros])
+
+    # Lojas concentram a maior parte do quadro
+    pesos = np.where(areas == "Varejo", 4.0, np.where(areas == "Indústria", 6.0, 2.0))
+    idx_cc = rng.choice(len(centros), n, p=pesos / pesos.sum())
+
+    if tipo == "CLT":
+        cargos = np.empty(n, dtype=object)
+        for area, lista in CARGOS_CLT.items():
+            mask = areas[idx_cc] == area
+            cargos[mask] = rng.choice(lista, mask.sum())
+    else:
+        cargos = rng.choice(CARGOS_PJ, n).astype(object)
+
+    admissao, afastamento, nascimento = _datas(rng, n)
+    ativo = afastamento.isna().to_numpy()
+
+    situacao = np.where(ativo, rng.choice([1, 1, 1, 1, 1, 1, 2, 3, 4], n), rng.choice([7, 7, 7, 7, 8], n))
+    causa = np.where(ativo, "0", rng.choice(["1", "2", "3", "4", "5"], n, p=[0.45, 0.35, 0.12, 0.07, 0.01]))
+
+    cadastro = np.arange(inicio_cadastro, inicio_cadastro + n)
+    df = pd.DataFrame({
+        "Cadastro": cadastro,
+        "Nome": [f"COLABORADOR {tipo} {c:07d}" for c in cadastro],
+        "Nascimento": nascimento,
+        "Admissão": admissao,
+        "Data Afastamento": afastamento,
+        "Situação": situacao,
+        "Causa": causa,
+        "Posição do Local": rng.integers(1, 50, n),
+        "C.Custo": codigos[idx_cc],
+        "Descrição (C.Custo)": descricoes[idx_cc],
+        "Título Reduzido (Cargo)": cargos,
+    })
+
+    # ---------------- RUÍDO REMOVIDO PELO ETL ----------------
+    ruido = rng.random(n) < PROPORCAO_RUIDO
+    lista_ruido = CARGOS_RUIDO_CLT if tipo == "CLT" else CARGOS_RUIDO_PJ
+    df.loc[ruido, "Título Reduzido (Cargo)"] = rng.choice(lista_ruido, ruido.sum())
+    if tipo == "CLT":
+        fechadas = rng.random(n) < PROPORCAO_RUIDO / 2
+        df.loc[fechadas, "Descrição (C.Custo)"] = rng.choice(LOJAS_FECHADAS, fechadas.sum())
+
+    # Linhas totalmente vazias (rodapés e quebras da exportação)
+    vazias = rng.choice(n, max(1, n // 1000), replace=False)
+    df.loc[vazias, :] = np.nan
+    return df
+
+
+def gerar_bases(linhas=10_000, semente=42, proporcao_pj=PROPORCAO_PJ):
+    """(df_clt, df_pj) brutos, como lidos das planilhas da semana."""
+    rng = np.random.default_rng(semente)
+    centros = centros_de_custo(linhas)
+    n_pj = int(linhas * proporcao_pj)
+    df_clt = _base(rng, linhas - n_pj, "CLT", centros, 1)
+    df_pj = _base(rng, n_pj, "PJ", centros, 5_000_001)
+    return df_clt, df_pj
+
+
+def gerar_mapeamentos(linhas=10_000, semente=42, df_clt=None):
+    """
+    Mesmo formato de process_data.carregar_mapeamentos(). Situação com
+    chaves inteiras (o ETL converte a coluna com astype(int)).
+    """
+    cc = {str(codigo): mapa for codigo, _, mapa, _ in centros_de_custo(linhas)}
+
+    temporarios = []
+    if df_clt is not None and len(df_clt):
+        rng = np.random.default_rng(semente + 1)
+        nomes = df_clt["Nome"].dropna().to_numpy()
+        temporarios = sorted(rng.choice(nomes, min(len(nomes), max(1, len(nomes) // 200)), replace=False))
+
+    return {
+        "causas": dict(CAUSAS),
+        "situacao": dict(SITUACOES),
+        "cc": cc,
+        "temporarios": list(temporarios),
+    }
+
+
+def gerar(linhas=10_000, semente=42):
+    """Bases brutas + mapeamentos, prontos para process_data.processar()."""
+    df_clt, df_pj = gerar_bases(linhas, semente)
+    return df_clt, df_pj, gerar_mapeamentos(linhas, semente, df_clt)
+
+
+# =========================================================
+# EXPORTAÇÕES EM CSV / XLSX (ETL EM BLOCOS)
+# =========================================================
+COLUNAS_INTEIRAS = ["Cadastro", "Situação", "Posição do Local"]
+
+
+def gravar_exportacao(df, caminho):
+    """
+    Base bruta como exportação da Senior: .csv (';', latin-1) ou .xlsx.
+    Códigos inteiros sem ".0" (as linhas vazias não viram float) e
+    datas como datas (aaaa-mm-dd no CSV).
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    d = df.astype({c: "Int64" for c in COLUNAS_INTEIRAS if c in df.columns})
+
+    if caminho.suffix.lower() == ".csv":
+        d.to_csv(caminho, sep=";", encoding="latin-1", index=False, date_format="%Y-%m-%d")
+        return caminho
+
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(d.columns))
+    for linha in d.astype(object).itertuples(index=False):
+        ws.append([None if pd.isna(v) else v for v in linha])
+    wb.save(caminho)
+    return caminho
+
+
+# =========================================================
+# AUSÊNCIAS DIÁRIAS (ABSENTEÍSMO)
+# =========================================================
+MOTIVOS_AUSENCIA = ["Falta", "Falta", "Atestado Médico", "Atraso/Saída Antecipada"]
+
+
+def gravar_ausencias(df_final, caminho, linhas, semente=42, meses=24, bloco=500_000):
+    """
+    Exportação diária de ausências no layout da Senior (';', latin-1,
+    datas dd/mm/aaaa): uma linha por colaborador por dia ausente, nos
+    últimos `meses` antes da DATA_REFERENCIA, só em dias de trabalho do
+    colaborador. Gravada em blocos: `linhas` pode passar da memória.
+    """
+    rng = np.random.default_rng(semente)
+    inicio = DATA_REFERENCIA - pd.DateOffset(months=meses)
+
+    base = df_final[df_final["TIPO"] == "CLT"]
+    adm = base["Admissão"].clip(lower=inicio).to_numpy("datetime64[D]")
+    fim = base["Data Afastamento"].fillna(DATA_REFERENCIA).clip(upper=DATA_REFERENCIA).to_numpy("datetime64[D]")
+    validos = np.flatnonzero(fim > adm)
+    nomes = base["Nome"].to_numpy()
+    centros = base["C.Custo"].astype(str).to_numpy()
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, "w", encoding="latin-1", newline="") as f:
+        f.write("Nome;Data;C.Custo;Motivo\n")
+        for inicio_bloco in range(0, linhas, bloco):
+            n = min(bloco, linhas - inicio_bloco)
+            idx = rng.choice(validos, n)
+            dias = (fim[idx] - adm[idx]).astype("int64")
+            datas = adm[idx] + (rng.random(n) * dias).astype("int64")
+            # Fim de semana vira a sexta anterior
+            datas = np.busday_offset(datas, 0, roll="backward")
+            pd.DataFrame({
+                "Nome": nomes[idx],
+                "Data": pd.to_datetime(datas).strftime("%d/%m/%Y"),
+                "C.Custo": centros[idx],
+                "Motivo": rng.choice(MOTIVOS_AUSENCIA, n),
+            }).to_csv(f, sep=";", header=False, index=False)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=10_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", type=Path)
+    args = parser.parse_args()
+
+    df_clt, df_pj, mapeamentos = gerar(args.linhas, args.semente)
+    print(f"CLT: {len(df_clt)} linhas | PJ: {len(df_pj)} linhas | centros de custo: {len(mapeamentos['cc'])}")
+
+    if args.saida:
+        args.saida.mkdir(parents=True, exist_ok=True)
+        df_clt.to_csv(args.saida / "clt.csv", index=False)
+        df_pj.to_csv(args.saida / "pj.csv", index=False)
+        (args.saida / "mapeamentos.json").write_text(
+            json.dumps(mapeamentos, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"Gravado em {args.saida}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
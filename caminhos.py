@@ -0,0 +1,33 @@
+from pathlib import Path
+
+# =====================================================================
+# CAMINHOS DOS DADOS (ETL, PORTAL E API)
+# =====================================================================
+# Um só lugar para a raiz dos dados: o process_data.py publica e o
+# dados.py / api.py leem exatamente os mesmos arquivos. Sem Streamlit,
+# para o ETL importar sem carregar a interface.
+#
+#     lamoda_dados/
+#         raw/        exportações semanais (CLT, PJ, absenteísmo)
+#         data/       base publicada, manifesto, quarentena, partições
+#         historico/  snapshots das cargas
+#         duckdb/     arquivos DuckDB por versão
+#         cache/      planilhas já lidas
+#         logs/       perfil e intenções do assistente
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_ROOT = BASE_DIR / "lamoda_dados"
+MAP_DIR = BASE_DIR / "mapeamentos"
+
+RAW_DIR = DATA_ROOT / "raw"
+DATA_DIR = DATA_ROOT / "data"
+HIST_DIR = DATA_ROOT / "historico"
+DUCKDB_DIR = DATA_ROOT / "duckdb"
+CACHE_DIR = DATA_ROOT / "cache"
+LOGS_DIR = DATA_ROOT / "logs"
+
+BASE_FILE = DATA_DIR / "base_tratada.csv"
+TEMPO_CASA_FILE = DATA_DIR / "tempo_de_casa.csv"
+ABSENTEISMO_FILE = DATA_DIR / "absenteismo.csv"
+MANIFESTO_FILE = DATA_DIR / "manifesto.json"
+PARTICOES_DIR = DATA_DIR / "particoes"
@@ -0,0 +1,136 @@
+import functools
+import inspect
+
+import pandas as pd
+
+from leitores import _arrow_disponivel, compatibilizar_arrow
+
+# =========================================================
+# BASES COMPARTILHADAS SOMENTE LEITURA (ARROW)
+# =========================================================
+# As bases ficam em st.cache_resource: todas as sessões recebem o
+# mesmo objeto, sem pickle nem cópia a cada rerun (st.cache_data
+# devolve uma cópia desserializada em cada chamada).
+#
+# Por isso elas não podem ser alteradas. Colunas auxiliares são
+# criadas em uma visão derivada:
+#     df_local = derivar(df, {"É_Desligamento": ...})
+
+MENSAGEM_SOMENTE_LEITURA = (
+    "Base compartilhada entre sessões é somente leitura. "
+    "Use derivar(df, {coluna: valores}) para criar colunas auxiliares."
+)
+
+
+# Atributos que só mudam numa escrita: _mgr é trocado pelos métodos
+# com inplace=True (NDFrame._update_inplace)
+ATRIBUTOS_BLOQUEADOS = {"_mgr", "columns", "index"}
+
+
+class _IndexadorLeitura:
+    """.loc/.iloc/.at/.iat que só leem; o resto vai para o indexador do pandas."""
+
+    def __init__(self, indexador):
+        object.__setattr__(self, "_indexador", indexador)
+
+    def __getitem__(self, chave):
+        return self._indexador[chave]
+
+    def __setitem__(self, chave, valor):
+        raise TypeError(MENSAGEM_SOMENTE_LEITURA)
+
+    def __call__(self, *args, **kwargs):
+        return _IndexadorLeitura(self._indexador(*args, **kwargs))
+
+    def __getattr__(self, nome):
+        return getattr(self._indexador, nome)
+
+
+class BaseSomenteLeitura(pd.DataFrame):
+    """
+    DataFrame que recusa escrita: colunas, .loc/.iloc/.at/.iat, update
+    e métodos com inplace=True. Filtros, cópias e cálculos sobre ele
+    devolvem DataFrame comum.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _bloquear(self, *args, **kwargs):
+        raise TypeError(MENSAGEM_SOMENTE_LEITURA)
+
+    __setitem__ = _bloquear
+    __delitem__ = _bloquear
+    insert = _bloquear
+    pop = _bloquear
+    update = _bloquear
+    _set_value = _bloquear
+
+    def __setattr__(self, nome, valor):
+        if "_mgr" in self.__dict__ and (nome in ATRIBUTOS_BLOQUEADOS or nome in self.columns):
+            raise TypeError(MENSAGEM_SOMENTE_LEITURA)
+        super().__setattr__(nome, valor)
+
+    @property
+    def loc(self):
+        return _IndexadorLeitura(pd.DataFrame.loc.fget(self))
+
+    @property
+    def iloc(self):
+        return _IndexadorLeitura(pd.DataFrame.iloc.fget(self))
+
+    @property
+    def at(self):
+        return _IndexadorLeitura(pd.DataFrame.at.fget(self))
+
+    @property
+    def iat(self):
+        return _IndexadorLeitura(pd.DataFrame.iat.fget(self))
+
+
+def _sem_inplace(metodo):
+    @functools.wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            raise TypeError(MENSAGEM_SOMENTE_LEITURA)
+        return metodo(self, *args, **kwargs)
+    return envolvido
+
+
+# Alguns métodos (replace, por exemplo) alteram os dados antes de trocar
+# o _mgr: todo método com inplace=True é recusado antes de executar
+for _nome, _metodo in inspect.getmembers(pd.DataFrame, inspect.isfunction):
+    if "inplace" in inspect.signature(_metodo).parameters:
+        setattr(BaseSomenteLeitura, _nome, _sem_inplace(_metodo))
+
+
+def somente_leitura(df):
+    """
+    Converte a base para Arrow uma única vez e devolve a visão pandas
+    sobre os mesmos buffers (sem cópia nas colunas que o tipo permite).
+    A tabela Arrow fica em `.tabela` (None sem pyarrow).
+    """
+    if df is None or isinstance(df, BaseSomenteLeitura):
+        return df
+
+    tabela = None
+    if _arrow_disponivel():
+        import pyarrow as pa
+
+        tabela = pa.Table.from_pandas(compatibilizar_arrow(df), preserve_index=False)
+        base = BaseSomenteLeitura(tabela.to_pandas(split_blocks=True))
+    else:
+        base = BaseSomenteLeitura(df)
+
+    # Atributo comum (não coluna): o pandas avisaria com setattr direto
+    object.__setattr__(base, "tabela", tabela)
+    return base
+
+
+def derivar(df, colunas):
+    """Visão com colunas extras; as colunas existentes não são copiadas."""
+    d = pd.DataFrame.copy(df, deep=False)
+    for nome, valores in colunas.items():
+        d[nome] = valores
+    return d
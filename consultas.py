@@ -0,0 +1,484 @@
+import os
+import threading
+
+import pandas as pd
+
+from tempo_casa import FAIXAS, filtrar_tempo_casa, resumo_tempo_casa, tempo_casa_por_area
+from turnover import (
+    calcular_turnover_periodo,
+    indicadores_periodo,
+    linha_centro_custo,
+    linha_mensal,
+    montar_tabela_mensal_area,
+    tabela_centros_custo,
+    tabela_mensal,
+    turnover_anual,
+    turnover_mensal_areas,
+    turnover_por_area,
+    turnover_por_area_anos,
+    turnover_por_cc,
+)
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# =====================================================================
+# MOTORES DE CONSULTA (PANDAS OU DUCKDB)
+# =====================================================================
+# As páginas e a API pedem as métricas a um objeto de consultas, com os
+# mesmos métodos nos dois motores:
+#   - ConsultasPandas: funções de turnover.py / tempo_casa.py sobre a
+#     base em memória (padrão);
+#   - ConsultasDuckDB: SQL sobre um arquivo DuckDB montado a partir dos
+#     CSVs publicados (um por versão). A base não precisa caber na
+#     memória de cada processo do Streamlit.
+#   - ConsultasParticionadas (particoes.py): lê só as partições (Área ×
+#     ano) pedidas e aplica as funções do ConsultasPandas ao recorte.
+# O motor é escolhido pela variável de ambiente LAMODA_MOTOR (ver
+# dados.py). O SQL só faz as contagens; as fórmulas, arredondamentos e
+# ordenações são as mesmas funções de turnover.py, então os resultados
+# são iguais (conferência: benchmarks/paridade_motores.py).
+
+# Limite de memória de cada processo DuckDB; acima disso ele usa disco
+MEMORIA_DUCKDB = "1GB"
+
+# Arquivos DuckDB mantidos (a versão atual e a anterior)
+VERSOES_DUCKDB = 2
+
+COLS_DATA = ["Admissão", "Data Afastamento"]
+COLS_INT = ["Ano_Admissao", "Mes_Admissao", "Ano_Afastamento", "Mes_Afastamento"]
+
+
+class BaseIndisponivel(LookupError):
+    """Base (ou tempo de casa) ainda não publicada pelo process_data.py."""
+
+
+# =========================================================
+# 1) MOTOR PANDAS (BASE EM MEMÓRIA)
+# =========================================================
+class ConsultasPandas:
+
+    motor = "pandas"
+
+    def __init__(self, base, tempo_casa=None):
+        self.df = base
+        self._tempo_casa = tempo_casa
+        self._recorte = (None, None)
+
+    def base(self, colunas=None, areas=None):
+        # A base já está em memória: devolve inteira, sem cópia
+        return self.df if areas is None else self._areas(areas)
+
+    def tempo_casa(self, areas=None):
+        if self._tempo_casa is None or areas is None:
+            return self._tempo_casa
+        return filtrar_tempo_casa(self._tempo_casa, areas)
+
+    def _areas(self, areas):
+        # Mesmo recorte pedido várias vezes na mesma página: filtra uma vez
+        chave = tuple(areas)
+        recorte_chave, recorte = self._recorte
+        if recorte_chave != chave:
+            recorte = self.df[self.df["Area"].isin(areas)]
+            self._recorte = (chave, recorte)
+        return recorte
+
+    # -------------------------
+    # Dimensões
+    # -------------------------
+    def registros(self, areas=None):
+        return len(self.df if areas is None else self._areas(areas))
+
+    def dimensoes(self):
+        df = self.df
+        anos = sorted(
+            set(df["Ano_Admissao"][df["Ano_Admissao"] != 0].unique().tolist())
+            | set(df["Ano_Afastamento"][df["Ano_Afastamento"] != 0].unique().tolist())
+        )
+        areas = sorted(df["Area"].dropna().unique().tolist())
+        return anos, areas
+
+    def areas_presentes(self, areas):
+        """Áreas com registros, na ordem em que aparecem na base."""
+        return self._areas(areas)["Area"].unique().tolist()
+
+    def headcount(self, areas):
+        return int((self._areas(areas)["Situacao_res"] == "Ativo").sum())
+
+    # -------------------------
+    # Turnover
+    # -------------------------
+    def turnover_periodo(self, areas, ano):
+        return calcular_turnover_periodo(self._areas(areas), ano)
+
+    def turnover_por_area(self, areas, ano):
+        return turnover_por_area(self._areas(areas), ano)
+
+    def turnover_anual(self, areas, anos):
+        return turnover_anual(self._areas(areas), anos)
+
+    def turnover_por_area_anos(self, areas, anos):
+        return turnover_por_area_anos(self._areas(areas), anos)
+
+    def tabela_mensal_area(self, area, anos):
+        return montar_tabela_mensal_area(self.df[self.df["Area"] == area], anos, area_label=area)
+
+    def turnover_mensal_areas(self, areas, anos):
+        return turnover_mensal_areas(self.df, areas, anos)
+
+    def turnover_por_cc(self, areas, ano, filtrar_pequenos=False, agrupar_pequenos=False, min_ativos=0):
+        return turnover_por_cc(
+            self._areas(areas), ano,
+            filtrar_pequenos=filtrar_pequenos,
+            agrupar_pequenos=agrupar_pequenos,
+            min_ativos=min_ativos,
+        )
+
+    # -------------------------
+    # Tempo de casa
+    # -------------------------
+    def resumo_tempo_casa(self, areas, situacao="Todos", faixa="Todos", por_area=False):
+        """areas=None: todas, inclusive registros sem área."""
+        if self._tempo_casa is None:
+            raise BaseIndisponivel("Base tempo_de_casa.csv não encontrada.")
+        df = filtrar_tempo_casa(self._tempo_casa, areas, situacao, faixa)
+        return tempo_casa_por_area(df) if por_area else resumo_tempo_casa(df)
+
+
+# =========================================================
+# 2) ARQUIVO DUCKDB DE UMA VERSÃO
+# =========================================================
+def _sql_tabela(con, arquivo):
+    """SELECT com as mesmas conversões de dados.ler_base / ler_tempo_casa."""
+    # Sem detecção de datas: as colunas de texto ficam texto, como no pandas
+    origem = f"read_csv({_literal(arquivo)}, header = true, auto_type_candidates = ['BIGINT', 'DOUBLE', 'VARCHAR'])"
+    colunas = [linha[0] for linha in con.execute(f"DESCRIBE SELECT * FROM {origem}").fetchall()]
+
+    trocas = []
+    for col in COLS_DATA:
+        if col in colunas:
+            trocas.append(f'TRY_CAST({_nome(col)} AS TIMESTAMP) AS {_nome(col)}')
+    for col in COLS_INT:
+        if col in colunas:
+            trocas.append(f'COALESCE(CAST(TRUNC(TRY_CAST({_nome(col)} AS DOUBLE)) AS BIGINT), 0) AS {_nome(col)}')
+
+    replace = f" REPLACE ({', '.join(trocas)})" if trocas else ""
+    return f"SELECT *{replace} FROM {origem}"
+
+
+def _nome(coluna):
+    return '"' + coluna.replace('"', '""') + '"'
+
+
+def _literal(texto):
+    return "'" + str(texto).replace("'", "''") + "'"
+
+
+def preparar_duckdb(versao, base_file, tempo_casa_file, pasta):
+    """
+    Monta (uma vez por versão) pasta/<versao>.duckdb com as tabelas
+    base e tempo_casa e devolve o caminho.
+    """
+    if duckdb is None:
+        raise ImportError("Motor DuckDB escolhido (LAMODA_MOTOR=duckdb), mas o pacote duckdb não está instalado.")
+
+    destino = pasta / f"{versao}.duckdb"
+    if destino.exists():
+        return destino
+
+    pasta.mkdir(parents=True, exist_ok=True)
+    tmp = destino.with_name(f"{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    con = duckdb.connect(str(tmp), config={"memory_limit": MEMORIA_DUCKDB})
+    try:
+        # Ordem de inserção preservada: rowid segue a ordem do CSV
+        con.execute(f"CREATE TABLE base AS {_sql_tabela(con, base_file)}")
+        if tempo_casa_file.exists():
+            con.execute(f"CREATE TABLE tempo_casa AS {_sql_tabela(con, tempo_casa_file)}")
+    finally:
+        con.close()
+
+    os.replace(tmp, destino)
+    limpar_duckdb_antigos(pasta, manter=destino)
+    return destino
+
+
+def limpar_duckdb_antigos(pasta, manter, versoes=VERSOES_DUCKDB):
+    arquivos = sorted(pasta.glob("*.duckdb"), key=lambda p: p.stat().st_mtime)
+    for arquivo in arquivos[:-versoes]:
+        if arquivo != manter:
+            # Aberto por outro processo (Windows): fica para a próxima
+            try:
+                arquivo.unlink()
+            except OSError:
+                pass
+
+
+# =========================================================
+# 3) MOTOR DUCKDB (SQL SOBRE O ARQUIVO DA VERSÃO)
+# =========================================================
+# Desligamento: mesma regra do ~isin(["ATIVO", "Morte"]) (nulo conta)
+DESLIGAMENTO = "COALESCE(\"Causa Escrita\" NOT IN ('ATIVO', 'Morte'), TRUE)"
+
+
+def _ativos_em(ref):
+    return f'("Admissão" <= {ref} AND ("Data Afastamento" IS NULL OR "Data Afastamento" > {ref}))'
+
+
+class ConsultasDuckDB:
+
+    motor = "duckdb"
+    df = None
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._con = duckdb.connect(str(caminho), read_only=True, config={"memory_limit": MEMORIA_DUCKDB})
+        tabelas = {linha[0] for linha in self._con.execute("SHOW TABLES").fetchall()}
+        self._tem_tempo_casa = "tempo_casa" in tabelas
+
+    def _sql(self, sql, params=None):
+        # Um cursor por consulta: as sessões do Streamlit consultam em paralelo
+        with self._con.cursor() as cur:
+            return cur.execute(sql, params or {}).fetchall()
+
+    def _df(self, sql, params=None):
+        with self._con.cursor() as cur:
+            return cur.execute(sql, params or {}).df()
+
+    def _onde_areas(self, areas):
+        if areas is None:
+            return "", {}
+        return "WHERE list_contains($areas, Area)", {"areas": list(areas)}
+
+    def base(self, colunas=None, areas=None):
+        """Base (ou só as `colunas`) das `areas` (None = todas) em pandas, na ordem do CSV."""
+        selecao = ", ".join(_nome(c) for c in colunas) if colunas else "*"
+        onde, params = self._onde_areas(areas)
+        return self._df(f"SELECT {selecao} FROM base {onde} ORDER BY rowid", params)
+
+    def tempo_casa(self, areas=None):
+        if not self._tem_tempo_casa:
+            return None
+        onde, params = self._onde_areas(areas)
+        return self._df(f"SELECT * FROM tempo_casa {onde} ORDER BY rowid", params)
+
+    # -------------------------
+    # Dimensões
+    # -------------------------
+    def registros(self, areas=None):
+        if areas is None:
+            return self._sql("SELECT count(*) FROM base")[0][0]
+        return self._sql("SELECT count(*) FROM base WHERE list_contains($areas, Area)", {"areas": list(areas)})[0][0]
+
+    def dimensoes(self):
+        anos = self._sql("""
+            SELECT DISTINCT Ano_Admissao FROM base WHERE Ano_Admissao <> 0
+            UNION
+            SELECT DISTINCT Ano_Afastamento FROM base WHERE Ano_Afastamento <> 0
+        """)
+        areas = self._sql("SELECT DISTINCT Area FROM base WHERE Area IS NOT NULL")
+        return sorted(a for (a,) in anos), sorted(a for (a,) in areas)
+
+    def areas_presentes(self, areas):
+        linhas = self._sql(
+            "SELECT Area FROM base WHERE list_contains($areas, Area) GROUP BY Area ORDER BY min(rowid)",
+            {"areas": list(areas)},
+        )
+        return [a for (a,) in linhas]
+
+    def headcount(self, areas):
+        return self._sql(
+            "SELECT count_if(Situacao_res = 'Ativo') FROM base WHERE list_contains($areas, Area)",
+            {"areas": list(areas)},
+        )[0][0]
+
+    # -------------------------
+    # Turnover anual (por ano e, opcionalmente, por área)
+    # -------------------------
+    def _contagens_anuais(self, areas, anos, por_area):
+        grupo = "Area, " if por_area else ""
+        linhas = self._sql(f"""
+            WITH periodos AS (
+                SELECT ano, make_timestamp(ano, 1, 1, 0, 0, 0) AS ini, make_timestamp(ano, 12, 31, 0, 0, 0) AS fim
+                FROM (SELECT UNNEST($anos::BIGINT[]) AS ano)
+            )
+            SELECT {grupo}p.ano,
+                count_if("Admissão" >= p.ini AND "Admissão" <= p.fim),
+                count_if({DESLIGAMENTO} AND "Data Afastamento" >= p.ini AND "Data Afastamento" <= p.fim),
+                count_if({_ativos_em("p.ini")}),
+                count_if({_ativos_em("p.fim")})
+            FROM base CROSS JOIN periodos p
+            WHERE list_contains($areas, Area)
+            GROUP BY ALL
+        """, {"areas": list(areas), "anos": [int(a) for a in anos]})
+        return {tuple(linha[:-4]): tuple(linha[-4:]) for linha in linhas}
+
+    def turnover_periodo(self, areas, ano):
+        contagens = self._contagens_anuais(areas, [ano], por_area=False)
+        return {"Ano": ano, **indicadores_periodo(*contagens.get((int(ano),), (0, 0, 0, 0)))}
+
+    def turnover_anual(self, areas, anos):
+        contagens = self._contagens_anuais(areas, anos, por_area=False)
+        return pd.DataFrame([
+            {"Ano": ano, **indicadores_periodo(*contagens.get((int(ano),), (0, 0, 0, 0)))}
+            for ano in anos
+        ])
+
+    def _por_area(self, areas, anos):
+        contagens = self._contagens_anuais(areas, anos, por_area=True)
+        presentes = self.areas_presentes(areas)
+        return [
+            pd.DataFrame([
+                {"Ano": ano, "Área": area, **indicadores_periodo(*contagens.get((area, int(ano)), (0, 0, 0, 0)))}
+                for area in presentes
+            ])
+            for ano in anos
+        ]
+
+    def turnover_por_area(self, areas, ano):
+        return self._por_area(areas, [ano])[0]
+
+    def turnover_por_area_anos(self, areas, anos):
+        return pd.concat(self._por_area(areas, anos), ignore_index=True)
+
+    # -------------------------
+    # Turnover mensal
+    # -------------------------
+    def _tabela_mensal(self, filtro, params, anos, area_label):
+        anos = list(anos)
+        params = {**params, "anos": [int(a) for a in anos]}
+
+        adm = dict(((a, m), n) for a, m, n in self._sql(f"""
+            SELECT Ano_Admissao, Mes_Admissao, count(*) FROM base
+            WHERE {filtro} AND list_contains($anos, Ano_Admissao) GROUP BY ALL
+        """, params))
+        dem = dict(((a, m), n) for a, m, n in self._sql(f"""
+            SELECT Ano_Afastamento, Mes_Afastamento, count(*) FROM base
+            WHERE {filtro} AND list_contains($anos, Ano_Afastamento) GROUP BY ALL
+        """, params))
+        ativos = dict(((a, m), n) for a, m, n in self._sql(f"""
+            WITH meses AS (
+                SELECT ano, mes, last_day(make_date(ano, mes, 1))::TIMESTAMP AS ref
+                FROM (SELECT UNNEST($anos::BIGINT[]) AS ano) CROSS JOIN range(1, 13) t(mes)
+            )
+            SELECT m.ano, m.mes, count_if({_ativos_em("m.ref")})
+            FROM base CROSS JOIN meses m
+            WHERE {filtro}
+            GROUP BY ALL
+        """, params))
+
+        linhas = []
+        for ano in anos:
+            for mes in range(1, 13):
+                chave = (int(ano), mes)
+                linhas.append(linha_mensal(ano, mes, adm.get(chave, 0), dem.get(chave, 0), ativos.get(chave, 0)))
+        return tabela_mensal(linhas, anos, area_label)
+
+    def tabela_mensal_area(self, area, anos):
+        return self._tabela_mensal("Area = $area", {"area": area}, anos, area)
+
+    def turnover_mensal_areas(self, areas, anos):
+        # Mesma montagem de turnover.turnover_mensal_areas
+        tabelas = []
+        for area in areas:
+            tabela_area = self.tabela_mensal_area(area, anos)
+            tabela_area["Área"] = area
+            tabelas.append(tabela_area)
+
+        tabela_geral = self._tabela_mensal("list_contains($areas, Area)", {"areas": list(areas)}, anos, "Geral")
+        tabela_geral["Área"] = "Geral"
+        tabelas.append(tabela_geral)
+
+        tabela_final = pd.concat(tabelas, ignore_index=True)
+        return tabela_final.sort_values(["Área", "Ano", "Mês"])
+
+    # -------------------------
+    # Turnover por centro de custo
+    # -------------------------
+    def turnover_por_cc(self, areas, ano, filtrar_pequenos=False, agrupar_pequenos=False, min_ativos=0):
+        fim = pd.Timestamp(f"{ano}-12-31")
+        linhas = self._sql(f"""
+            SELECT "Descrição (C.Custo)",
+                count_if(Ano_Admissao = $ano),
+                count_if(Ano_Afastamento = $ano),
+                count_if({_ativos_em("$fim")})
+            FROM base
+            WHERE list_contains($areas, Area) AND "Descrição (C.Custo)" IS NOT NULL
+            GROUP BY 1
+            ORDER BY min(rowid)
+        """, {"areas": list(areas), "ano": int(ano), "fim": fim.to_pydatetime()})
+
+        lista = [linha_centro_custo(*linha) for linha in linhas]
+        return tabela_centros_custo(lista, filtrar_pequenos, agrupar_pequenos, min_ativos)
+
+    # -------------------------
+    # Tempo de casa
+    # -------------------------
+    def resumo_tempo_casa(self, areas, situacao="Todos", faixa="Todos", por_area=False):
+        if not self._tem_tempo_casa:
+            raise BaseIndisponivel("Base tempo_de_casa.csv não encontrada.")
+
+        filtros, params = ["TRUE"], {}
+        if areas is not None:
+            filtros.append("list_contains($areas, Area)")
+            params["areas"] = list(areas)
+        if situacao == "Ativo":
+            filtros.append("Situacao_res = 'Ativo'")
+        elif situacao == "Demitido":
+            filtros.append("Situacao_res IS DISTINCT FROM 'Ativo'")
+        if faixa != "Todos":
+            filtros.append(_sql_faixa(faixa))
+
+        ativo = "Situacao_res = 'Ativo'"
+        medidas = [
+            "count(*)",
+            f"count_if({ativo})",
+            "avg(Anos_de_Casa)",
+            f"avg(Anos_de_Casa) FILTER (WHERE {ativo})",
+            f"avg(Anos_de_Casa) FILTER (WHERE NOT COALESCE({ativo}, FALSE))",
+        ] + [f"count_if({_sql_faixa(f)})" for f in FAIXAS]
+
+        grupo = "Area, " if por_area else ""
+        linhas = self._sql(f"""
+            SELECT {grupo}{", ".join(medidas)}
+            FROM tempo_casa
+            WHERE {" AND ".join(filtros)}
+            {"GROUP BY Area" if por_area else ""}
+        """, params)
+
+        if not por_area:
+            return _resumo(linhas[0])
+        linhas = sorted(linhas, key=lambda linha: linha[0])
+        return pd.DataFrame([{"Área": linha[0], **_resumo(linha[1:])} for linha in linhas])
+
+
+def _sql_faixa(faixa):
+    acima, ate = FAIXAS[faixa]
+    partes = ["TRUE"]
+    if acima is not None:
+        partes.append(f"Anos_de_Casa > {acima}")
+    if ate is not None:
+        partes.append(f"Anos_de_Casa <= {ate}")
+    return "(" + " AND ".join(partes) + ")"
+
+
+def _media(valor):
+    # Mesmo arredondamento de tempo_casa._media
+    return None if valor is None else round(valor, 2)
+
+
+def _resumo(linha):
+    total, ativos, geral, media_ativos, media_desligados, *faixas = linha
+    resumo = {
+        "Colaboradores": total,
+        "Headcount Ativo": ativos or 0,
+        "Tempo Médio Geral (anos)": _media(geral),
+        "Tempo Médio Ativos (anos)": _media(media_ativos),
+        "Tempo Médio Desligados (anos)": _media(media_desligados),
+    }
+    for faixa, qtd in zip(FAIXAS, faixas):
+        resumo[faixa] = qtd or 0
+    return resumo
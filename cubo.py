@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+from calendar import monthrange
+
+from entidades import ENTIDADES, IndiceEntidades
+
+# =====================================================================
+# CUBO DE MÉTRICAS (ÁREA × ANO × MÊS)
+# =====================================================================
+# Montado uma vez por versão da base. Guarda as contagens usadas pelo
+# Assistente IA; as consultas viram buscas em dicionário em vez de
+# filtros sobre a base inteira, e a base nunca é alterada.
+#
+# As regras de cada contagem são as mesmas das funções originais:
+#   - anual: admissões e desligamentos (sem ATIVO/Morte) pelas datas;
+#   - mensal / admissões / desligamentos: colunas Ano_* e Mes_*;
+#   - ativos em D: Admissão <= D e (sem afastamento ou afastamento > D).
+#
+# Perguntas sobre um centro de custo ou cargo usam um cubo do recorte
+# (cubo.recorte), montado na primeira pergunta e reaproveitado depois.
+
+GERAL = "Geral"
+
+
+def _datas_ns(serie):
+    return serie.astype("datetime64[ns]")
+
+
+class CuboMetricas:
+
+    def __init__(self, df, versao=None, entidades=True):
+        self.versao = versao
+        self._df = df
+        self._recortes = {}
+        self.entidades = IndiceEntidades(df) if entidades else None
+        self.areas = sorted(df["Area"].dropna().unique().tolist())
+
+        self.anos_disponiveis = sorted(
+            set(df["Ano_Admissao"][df["Ano_Admissao"] != 0].unique().tolist())
+            | set(df["Ano_Afastamento"][df["Ano_Afastamento"] != 0].unique().tolist())
+        )
+
+        adm = _datas_ns(df["Admissão"])
+        afast = _datas_ns(df["Data Afastamento"])
+        desligamento = ~df["Causa Escrita"].isin(["ATIVO", "Morte"])
+
+        chaves = pd.DataFrame({
+            "Area": df["Area"],
+            "ano_adm": adm.dt.year,
+            "ano_afast": afast.dt.year,
+            "Ano_Admissao": df["Ano_Admissao"],
+            "Mes_Admissao": df["Mes_Admissao"],
+            "Ano_Afastamento": df["Ano_Afastamento"],
+            "Mes_Afastamento": df["Mes_Afastamento"],
+            "ativo": df["Situacao_res"] == "Ativo",
+        })
+
+        # ---------------- CONTAGENS ----------------
+        self._adm_ano = self._contar(chaves, ["ano_adm"])
+        self._desl_ano = self._contar(chaves[desligamento], ["ano_afast"])
+        self._adm_cadastro = self._contar(chaves, ["Ano_Admissao"])
+        self._dem_cadastro = self._contar(chaves, ["Ano_Afastamento"])
+        self._adm_mes = self._contar(chaves, ["Ano_Admissao", "Mes_Admissao"])
+        self._dem_mes = self._contar(chaves, ["Ano_Afastamento", "Mes_Afastamento"])
+        self._situacao = self._contar(chaves, ["ativo"])
+
+        # ---------------- ATIVOS EM UMA DATA ----------------
+        # ativos(D) = #{Admissão <= D} - #{max(Admissão, Afastamento) <= D}
+        saida = np.maximum(adm, afast).where(adm.notna() & afast.notna())
+        self._entradas = {}
+        self._saidas = {}
+        for area, mask in self._grupos(df):
+            self._entradas[area] = np.sort(adm[mask].dropna().to_numpy())
+            self._saidas[area] = np.sort(saida[mask].dropna().to_numpy())
+
+    # -----------------------------------------------------
+    # MONTAGEM
+    # -----------------------------------------------------
+    def _grupos(self, df):
+        yield GERAL, pd.Series(True, index=df.index)
+        for area in self.areas:
+            yield area, df["Area"] == area
+
+    @staticmethod
+    def _contar(chaves, colunas):
+        resultado = {}
+
+        por_area = chaves.groupby(["Area"] + colunas).size()
+        for chave, qtd in por_area.items():
+            resultado[tuple(chave)] = int(qtd)
+
+        # Geral inclui linhas sem área, como o filtro original
+        geral = chaves.groupby(colunas).size()
+        for chave, qtd in geral.items():
+            chave = chave if isinstance(chave, tuple) else (chave,)
+            resultado[(GERAL,) + tuple(chave)] = int(qtd)
+
+        return resultado
+
+    @staticmethod
+    def _area(area):
+        return GERAL if not area or area == GERAL else area
+
+    # -----------------------------------------------------
+    # CONSULTAS
+    # -----------------------------------------------------
+    def ativos_em(self, area, data):
+        area = self._area(area)
+        if area not in self._entradas:
+            return 0
+        d = np.datetime64(pd.Timestamp(data), "ns")
+        entradas = np.searchsorted(self._entradas[area], d, side="right")
+        saidas = np.searchsorted(self._saidas[area], d, side="right")
+        return int(entradas - saidas)
+
+    def anual(self, ano, area=None):
+        area = self._area(area)
+        return {
+            "Admissões": self._adm_ano.get((area, ano), 0),
+            "Desligamentos": self._desl_ano.get((area, ano), 0),
+            "Ativos início": self.ativos_em(area, pd.Timestamp(ano, 1, 1)),
+            "Ativos fim": self.ativos_em(area, pd.Timestamp(ano, 12, 31)),
+        }
+
+    def mensal(self, ano, mes, area=None):
+        area = self._area(area)
+        ultimo_dia = pd.Timestamp(ano, mes, monthrange(ano, mes)[1])
+        return {
+            "Admissões": self._adm_mes.get((area, ano, mes), 0),
+            "Demissões": self._dem_mes.get((area, ano, mes), 0),
+            "Ativos no Final do Mês": self.ativos_em(area, ultimo_dia),
+        }
+
+    def admissoes(self, ano, area=None):
+        return self._adm_cadastro.get((self._area(area), ano), 0)
+
+    def desligamentos(self, ano, area=None):
+        return self._dem_cadastro.get((self._area(area), ano), 0)
+
+    def headcount(self, area=None, status="Ativo"):
+        area = self._area(area)
+        ativos = self._situacao.get((area, True), 0)
+        inativos = self._situacao.get((area, False), 0)
+        if status == "Ativo":
+            return ativos
+        if status == "Desligado":
+            return inativos
+        return ativos + inativos
+
+    # -----------------------------------------------------
+    # GRADES (ÁREAS × PERÍODOS DE UMA VEZ)
+    # -----------------------------------------------------
+    def ativos_em_lote(self, area, datas):
+        """ativos_em para várias datas: uma busca vetorizada por área."""
+        area = self._area(area)
+        datas = np.asarray(pd.to_datetime(pd.Series(datas)), dtype="datetime64[ns]")
+        if area not in self._entradas:
+            return np.zeros(len(datas), dtype=int)
+        entradas = np.searchsorted(self._entradas[area], datas, side="right")
+        saidas = np.searchsorted(self._saidas[area], datas, side="right")
+        return entradas - saidas
+
+    def grade_anual(self, areas, anos):
+        """
+        Uma linha por (área, ano). Admissões/Desligamentos pelas datas
+        (regra do turnover anual); *_cadastro pelas colunas Ano_*.
+        """
+        anos = list(anos)
+        inicios = [pd.Timestamp(ano, 1, 1) for ano in anos]
+        fins = [pd.Timestamp(ano, 12, 31) for ano in anos]
+
+        partes = []
+        for area in areas:
+            chave = self._area(area)
+            partes.append(pd.DataFrame({
+                "Área": area or GERAL,
+                "Ano": anos,
+                "Admissões": [self._adm_ano.get((chave, a), 0) for a in anos],
+                "Desligamentos": [self._desl_ano.get((chave, a), 0) for a in anos],
+                "Ativos início": self.ativos_em_lote(chave, inicios),
+                "Ativos fim": self.ativos_em_lote(chave, fins),
+                "Admissões_cadastro": [self._adm_cadastro.get((chave, a), 0) for a in anos],
+                "Desligamentos_cadastro": [self._dem_cadastro.get((chave, a), 0) for a in anos],
+            }))
+        return pd.concat(partes, ignore_index=True)
+
+    def grade_mensal(self, areas, periodos):
+        """Uma linha por (área, ano, mês) para os (ano, mês) de `periodos`."""
+        periodos = list(periodos)
+        fins = [pd.Timestamp(ano, mes, monthrange(ano, mes)[1]) for ano, mes in periodos]
+
+        partes = []
+        for area in areas:
+            chave = self._area(area)
+            partes.append(pd.DataFrame({
+                "Área": area or GERAL,
+                "Ano": [ano for ano, _ in periodos],
+                "Mês": [mes for _, mes in periodos],
+                "Admissões": [self._adm_mes.get((chave, a, m), 0) for a, m in periodos],
+                "Demissões": [self._dem_mes.get((chave, a, m), 0) for a, m in periodos],
+                "Ativos no Final do Mês": self.ativos_em_lote(chave, fins),
+            }))
+        return pd.concat(partes, ignore_index=True)
+
+    # -----------------------------------------------------
+    # RECORTES (CENTRO DE CUSTO / CARGO)
+    # -----------------------------------------------------
+    def recorte(self, filtros):
+        """
+        Cubo só com as linhas de `filtros` ({"centro_custo": nome,
+        "cargo": nome}). Sem filtros, devolve o próprio cubo.
+        """
+        chave = tuple(sorted((t, v) for t, v in (filtros or {}).items() if v))
+        if not chave:
+            return self
+
+        if chave not in self._recortes:
+            mask = pd.Series(True, index=self._df.index)
+            for tipo, valor in chave:
+                mask &= self._df[ENTIDADES[tipo]] == valor
+            self._recortes[chave] = CuboMetricas(self._df[mask], self.versao, entidades=False)
+        return self._recortes[chave]
+
+    # -----------------------------------------------------
+    # TABELA COMPLETA (CONFERÊNCIA / EXPORTAÇÃO)
+    # -----------------------------------------------------
+    def tabela_mensal(self, anos=None):
+        anos = anos or self.anos_disponiveis
+        periodos = [(ano, mes) for ano in anos for mes in range(1, 13)]
+        return self.grade_mensal([GERAL] + self.areas, periodos)
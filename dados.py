@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+import perfil
+import publicacao
+from caminhos import (  # noqa: F401 (reexportados para as páginas e a API)
+    ABSENTEISMO_FILE,
+    BASE_FILE,
+    DATA_DIR,
+    DATA_ROOT,
+    DUCKDB_DIR,
+    HIST_DIR,
+    MANIFESTO_FILE,
+    PARTICOES_DIR,
+    TEMPO_CASA_FILE,
+)
+from conjunto import somente_leitura
+from consultas import ConsultasDuckDB, ConsultasPandas, preparar_duckdb
+from historico import HistoricoSnapshots, calcular_tempo_casa
+from particoes import ConsultasParticionadas, preparar_particoes
+from publicacao import data_atualizacao, ler_manifesto, versao_publicada  # noqa: F401
+
+# =========================================================
+# CONFIGURAÇÕES (caminhos em caminhos.py, os mesmos do ETL)
+# =========================================================
+# Motor das consultas (ver consultas.py):
+#   LAMODA_MOTOR=pandas  → base inteira em memória em cada processo (padrão)
+#   LAMODA_MOTOR=duckdb  → SQL sobre um arquivo DuckDB por versão; a base
+#                          em pandas só é montada se alguma página pedir
+#   LAMODA_MOTOR=particoes → Parquet por Área × ano (particoes.py); cada
+#                          processo lê só as áreas e anos consultados
+MOTOR = os.environ.get("LAMODA_MOTOR", "pandas").strip().lower()
+
+# Intervalo (segundos) entre verificações de nova publicação
+INTERVALO_MONITOR = 15
+
+
+# =========================================================
+# 1) LEITURA DAS BASES PUBLICADAS (publicacao.py)
+# =========================================================
+# Medidas no modo perfil; o ETL e as exportações usam as de publicacao.py
+ler_base = perfil.medido(publicacao.ler_base)
+ler_tempo_casa = perfil.medido(publicacao.ler_tempo_casa)
+ler_absenteismo = perfil.medido(publicacao.ler_absenteismo)
+
+
+# =========================================================
+# 2) VERSÃO CARREGADA (IMUTÁVEL)
+# =========================================================
+class VersaoDados:
+    """
+    Bases de uma publicação. Nunca é alterada depois de criada:
+    as bases são somente leitura (ver conjunto.py).
+    Nos motores DuckDB e particionado, base e tempo_casa em pandas são
+    montadas dos arquivos da versão no primeiro acesso.
+    """
+
+    def __init__(self, versao, atualizado_em, consultas, absenteismo=None):
+        self.versao = versao
+        self.atualizado_em = atualizado_em
+        self.consultas = consultas
+        self.absenteismo = absenteismo
+        self._bases = {}
+        self._lock = threading.Lock()
+
+    def _base(self, tipo):
+        if tipo not in self._bases:
+            with self._lock:
+                if tipo not in self._bases:
+                    df = self.consultas.base() if tipo == "base" else self.consultas.tempo_casa()
+                    self._bases[tipo] = somente_leitura(df)
+        return self._bases[tipo]
+
+    @property
+    def base(self):
+        return self._base("base")
+
+    @property
+    def tempo_casa(self):
+        return self._base("tempo_casa")
+
+
+@perfil.medido
+def carregar_versao(versao):
+    if MOTOR == "duckdb":
+        consultas = ConsultasDuckDB(preparar_duckdb(versao, BASE_FILE, TEMPO_CASA_FILE, DUCKDB_DIR))
+    elif MOTOR == "particoes":
+        # Normalmente já gravadas pelo process_data.py; senão, monta uma vez aqui
+        consultas = ConsultasParticionadas(preparar_particoes(versao, ler_base, ler_tempo_casa, PARTICOES_DIR))
+    else:
+        consultas = ConsultasPandas(somente_leitura(ler_base()), somente_leitura(ler_tempo_casa()))
+    return VersaoDados(
+        versao=versao,
+        atualizado_em=data_atualizacao(),
+        consultas=consultas,
+        absenteismo=somente_leitura(ler_absenteismo()),
+    )
+
+
+# =========================================================
+# 3) MONITOR EM SEGUNDO PLANO
+# =========================================================
+class MonitorDados:
+    """
+    Observa DATA_DIR e, quando uma nova base é publicada, carrega-a
+    em uma thread própria e troca a referência de uma só vez.
+    As sessões continuam usando a versão antiga até a troca terminar.
+    """
+
+    def __init__(self, intervalo=INTERVALO_MONITOR):
+        self._intervalo = intervalo
+        self._atual = None
+        self._lock = threading.Lock()
+
+        # Primeira carga é síncrona: sem ela não há o que servir
+        self.verificar()
+
+        thread = threading.Thread(target=self._loop, name="monitor-dados", daemon=True)
+        thread.start()
+
+    def atual(self):
+        return self._atual
+
+    def verificar(self):
+        versao = versao_publicada()
+        if versao is None:
+            return False
+
+        atual = self._atual
+        if atual is not None and atual.versao == versao:
+            return False
+
+        # Um carregamento por vez; as leituras seguem sem bloqueio
+        with self._lock:
+            if self._atual is not None and self._atual.versao == versao:
+                return False
+
+            nova = carregar_versao(versao)
+
+            # A publicação mudou durante a leitura: tenta no próximo ciclo
+            if versao_publicada() != versao:
+                return False
+
+            self._atual = nova
+
+        print(f"🔄 Nova base carregada: versão {versao} ({nova.atualizado_em})")
+        return True
+
+    def _loop(self):
+        while True:
+            time.sleep(self._intervalo)
+            try:
+                self.verificar()
+            except Exception as e:
+                # Arquivo incompleto ou corrompido: mantém a versão atual
+                print(f"⚠️ Falha ao recarregar a base: {e}")
+
+
+@perfil.cacheado(st.cache_resource(show_spinner="Carregando base de dados…"))
+def monitor():
+    return MonitorDados()
+
+
+def dados_atuais():
+    """Versão corrente das bases. Interrompe a página se ainda não houver base."""
+    dados = monitor().atual()
+
+    if dados is None:
+        st.error(
+            "Base **base_tratada.csv** não encontrada.\n\n"
+            "Execute o `process_data.py` localmente para gerar a base."
+        )
+        perfil.parar()
+
+    return dados
+
+
+@perfil.cacheado(st.cache_resource(max_entries=8, show_spinner="Carregando base…"))
+def tempo_casa_das_areas(_consultas, versao, areas):
+    """tempo_casa só das `areas` (tupla), compartilhada entre as sessões."""
+    return somente_leitura(_consultas.tempo_casa(list(areas)))
+
+
+# =========================================================
+# 4) CONSULTA HISTÓRICA (SNAPSHOTS)
+# =========================================================
+@perfil.cacheado(st.cache_resource)
+def historico():
+    return HistoricoSnapshots(HIST_DIR)
+
+
+# cache_resource: o mesmo objeto para todas as sessões, sem cópia por rerun
+@perfil.cacheado(st.cache_resource(max_entries=4, show_spinner="Reconstruindo snapshot…"))
+def base_no_snapshot(data_snapshot, versao_historico):
+    return somente_leitura(historico().base_em(data_snapshot))
+
+
+@perfil.cacheado(st.cache_resource(max_entries=4, show_spinner="Reconstruindo snapshot…"))
+def tempo_casa_no_snapshot(data_snapshot, versao_historico):
+    base = base_no_snapshot(data_snapshot, versao_historico)
+    return somente_leitura(calcular_tempo_casa(base, data_snapshot))
+
+
+def escolher_snapshot(dados):
+    """
+    Seletor de snapshot na barra lateral.
+    Devolve (data escolhida ou None para a base atual, data exibida, chave de cache).
+    """
+    datas = historico().snapshots()
+    if not datas:
+        return None, dados.atualizado_em, dados.versao
+
+    opcao_atual = "Atual"
+    opcoes = [opcao_atual] + [d.strftime("%d/%m/%Y") for d in reversed(datas)]
+
+    escolha = st.sidebar.selectbox(
+        "📅 Snapshot (como era em):",
+        options=opcoes,
+        help="Reconstrói os indicadores com a base de uma semana anterior.",
+    )
+    if escolha == opcao_atual:
+        return None, dados.atualizado_em, dados.versao
+
+    data = pd.to_datetime(escolha, dayfirst=True)
+    return data, escolha, f"snapshot-{data:%Y%m%d}-{historico().versao()}"
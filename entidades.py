@@ -0,0 +1,158 @@
+import re
+import unicodedata
+
+# =====================================================================
+# ÍNDICE DE ENTIDADES (CENTRO DE CUSTO E CARGO)
+# =====================================================================
+# Montado uma vez por versão da base a partir dos nomes distintos de
+# "Descrição (C.Custo)" e "Título Reduzido (Cargo)". Cada palavra dos
+# nomes entra nos índices abaixo:
+#   - exato:     "loja" → nomes que têm a palavra "loja";
+#   - prefixo:   "vend" → "vendedor" (abreviações, a partir de 3 letras);
+#   - trigramas: "vendedores", "gerentes" (plural e erros de digitação);
+#   - anagrama:  "costureria" (letras trocadas de lugar).
+# Números só casam exatos ("loja 1" nunca vira "loja 17") e preposições
+# são ignoradas ("gerente da loja" = "GERENTE DE LOJA"). Uma pergunta
+# é resolvida olhando só as palavras candidatas, sem varrer os nomes.
+
+ENTIDADES = {
+    "centro_custo": "Descrição (C.Custo)",
+    "cargo": "Título Reduzido (Cargo)",
+}
+
+ROTULOS_ENTIDADE = {
+    "centro_custo": "centro de custo",
+    "cargo": "cargo",
+}
+
+# Similaridade mínima (Dice de trigramas) entre palavra da pergunta e do nome
+LIMIAR_PALAVRA = 0.7
+
+# Prefixo e letras trocadas valem um pouco menos que a palavra inteira
+NOTA_PREFIXO = 0.9
+NOTA_TRANSPOSICAO = 0.9
+TAMANHO_MIN_PREFIXO = 3
+
+_PALAVRAS = re.compile(r"[a-z0-9]+")
+
+_IGNORADAS = {"de", "da", "do", "das", "dos", "e"}
+
+
+def normalizar_nome(texto):
+    texto = unicodedata.normalize("NFD", str(texto).lower()).encode("ascii", "ignore").decode("ascii")
+    return [str(int(p)) if p.isdigit() else p for p in _PALAVRAS.findall(texto) if p not in _IGNORADAS]
+
+
+def _trigramas(palavra):
+    palavra = f" {palavra} "
+    return {palavra[i:i + 3] for i in range(len(palavra) - 2)}
+
+
+def _anagrama(palavra):
+    return palavra[:1] + "".join(sorted(palavra[1:]))
+
+
+class IndiceEntidades:
+
+    def __init__(self, df):
+        # (tipo, nome original, palavras normalizadas)
+        self.nomes = []
+        for tipo, coluna in ENTIDADES.items():
+            if coluna not in df.columns:
+                continue
+            for nome in sorted(df[coluna].dropna().unique().tolist()):
+                palavras = normalizar_nome(nome)
+                if palavras:
+                    self.nomes.append((tipo, nome, palavras))
+
+        # Árvore de palavras: "loja" → "5" → [nomes]. A chave None guarda
+        # os nomes que terminam naquele ponto.
+        self._arvore = {}
+        vocabulario = set()
+        for eid, (_, _, palavras) in enumerate(self.nomes):
+            no = self._arvore
+            for palavra in palavras:
+                no = no.setdefault(palavra, {})
+            no.setdefault(None, []).append(eid)
+            vocabulario.update(palavras)
+
+        self._prefixos = {}
+        self._anagramas = {}
+        self._trigramas = {}
+        self._tam_trigramas = {}
+        for palavra in vocabulario:
+            if palavra.isdigit():
+                continue
+            for n in range(TAMANHO_MIN_PREFIXO, len(palavra)):
+                self._prefixos.setdefault(palavra[:n], set()).add(palavra)
+            self._anagramas.setdefault(_anagrama(palavra), set()).add(palavra)
+            trigs = _trigramas(palavra)
+            self._tam_trigramas[palavra] = len(trigs)
+            for tri in trigs:
+                self._trigramas.setdefault(tri, set()).add(palavra)
+
+        self._vocabulario = vocabulario
+
+    def __len__(self):
+        return len(self.nomes)
+
+    # -----------------------------------------------------
+    # PALAVRA DA PERGUNTA → PALAVRAS DOS NOMES
+    # -----------------------------------------------------
+    def _parecidas(self, palavra):
+        """{palavra do índice: nota} para uma palavra da pergunta."""
+        if palavra in self._vocabulario:
+            return {palavra: 1.0}
+        if palavra.isdigit() or len(palavra) < TAMANHO_MIN_PREFIXO:
+            return {}
+
+        notas = {p: NOTA_PREFIXO for p in self._prefixos.get(palavra, ())}
+        for p in self._anagramas.get(_anagrama(palavra), ()):
+            notas[p] = NOTA_TRANSPOSICAO
+
+        trigs = _trigramas(palavra)
+        comuns = {}
+        for tri in trigs:
+            for p in self._trigramas.get(tri, ()):
+                comuns[p] = comuns.get(p, 0) + 1
+        for p, qtd in comuns.items():
+            nota = 2 * qtd / (len(trigs) + self._tam_trigramas[p])
+            if nota >= LIMIAR_PALAVRA and nota > notas.get(p, 0):
+                notas[p] = nota
+        return notas
+
+    # -----------------------------------------------------
+    # RESOLUÇÃO
+    # -----------------------------------------------------
+    def resolver(self, texto):
+        """
+        Entidades citadas no texto: {"centro_custo": nome, "cargo": nome}
+        (só as encontradas). Em cada tipo vale o nome com mais palavras
+        casadas e, depois, a maior nota; em empate, o primeiro citado.
+        """
+        palavras = normalizar_nome(texto)
+        parecidas = [self._parecidas(p) for p in palavras]
+
+        melhores = {}
+        for i in range(len(palavras)):
+            # Desce a árvore a partir da palavra i enquanto houver caminho
+            frentes = [(self._arvore, 0.0)]
+            for j in range(i, len(palavras)):
+                frentes = [
+                    (no[palavra], nota + nota_j)
+                    for no, nota in frentes
+                    for palavra, nota_j in parecidas[j].items()
+                    if palavra in no
+                ]
+                if not frentes:
+                    break
+
+                n = j - i + 1
+                for no, nota in frentes:
+                    for eid in no.get(None, ()):
+                        tipo, nome, _ = self.nomes[eid]
+                        candidato = (n, nota / n)
+                        if candidato > melhores.get(tipo, ((0, 0), None))[0]:
+                            melhores[tipo] = (candidato, nome)
+
+        return {tipo: nome for tipo, (_, nome) in melhores.items()}
@@ -0,0 +1,35 @@
+import streamlit as st
+from pathlib import Path
+
+# =========================================================
+# ARQUIVOS ESTÁTICOS (CSS E LOGOS)
+# =========================================================
+# O CSS é lido do disco uma vez por processo (não a cada rerun).
+# Os logos saem da pasta static/ pelo static serving do Streamlit
+# (server.enableStaticServing em .streamlit/config.toml): o navegador
+# baixa e guarda em cache, em vez de o script reenviar a imagem.
+
+BASE_DIR = Path(__file__).resolve().parent
+CSS_FILE = BASE_DIR / ".streamlit" / "styles.css"
+
+STATIC_URL = "app/static"
+
+
+@st.cache_resource(show_spinner=False)
+def css_global():
+    if not CSS_FILE.exists():
+        return ""
+    return CSS_FILE.read_text(encoding="utf-8")
+
+
+def aplicar_css():
+    css = css_global()
+    if css:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+def logo(nome="logo_la_moda.png", largura=130):
+    st.markdown(
+        f"<img src='{STATIC_URL}/{nome}' width='{largura}' alt='La Moda'>",
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import pandas as pd
+
+from caminhos import DATA_ROOT
+from publicacao import ler_base, versao_publicada
+from graficos import figura_tendencia_anual, figura_tendencia_mensal
+from renderizador import renderizador, renderizar_png
+from turnover import (
+    montar_tabela_mensal_area,
+    turnover_anual,
+    turnover_mensal_areas,
+    turnover_por_area_anos,
+    turnover_por_cc,
+)
+
+# =====================================================================
+# EXPORTAÇÕES PRÉ-GERADAS (EXCEL E PNG DA PÁGINA DE TURNOVER)
+# =====================================================================
+# Lote noturno, depois do process_data.py:
+#
+#     python process_data.py && python exportacoes.py [--workers N]
+#
+# Gera, em paralelo (um processo por núcleo), os arquivos oferecidos
+# nos botões de download da página 1_Turnover.py para as seleções
+# padrão: todas as áreas ou uma área só × todos os anos ou um ano só
+# (opções de centro de custo no padrão da página). Ficam em
+#     lamoda_dados/exportacoes/<versão da base>/<tipo>-<hash>.<ext>
+# e a página serve o arquivo pronto. Seleção fora do padrão é gerada
+# na hora, uma vez, e guardada para os próximos.
+
+EXPORT_DIR = DATA_ROOT / "exportacoes"
+
+# Versões da base mantidas no disco (a atual e as anteriores)
+VERSOES_MANTIDAS = 3
+
+TIPOS = {
+    "turnover_geral": "xlsx",
+    "turnover_por_area": "xlsx",
+    "turnover_mensal": "xlsx",
+    "turnover_por_cc": "xlsx",
+    "tendencia_anual": "png",
+    "tendencia_mensal": "png",
+}
+
+# Padrões da barra lateral da página
+CC_PADRAO = {"filtrar_pequenos": True, "agrupar_pequenos": False, "min_ativos": 8}
+
+
+# =========================================================
+# 1) GERAÇÃO DOS ARQUIVOS
+# =========================================================
+def exportar_excel(df_export):
+    output = BytesIO()
+    # usando openpyxl para evitar erro de xlsxwriter
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        df_export.to_excel(writer, index=False, sheet_name="Dados")
+    return output.getvalue()
+
+
+def exportar_grafico_png(fig):
+    # Chrome do kaleido fica aberto entre os downloads (ver renderizador.py)
+    return renderizar_png(fig)
+
+
+# =========================================================
+# 2) ARQUIVOS DE UMA VERSÃO DA BASE
+# =========================================================
+def _normalizar(params):
+    normal = {}
+    for nome, valor in params.items():
+        if nome == "areas":
+            valor = sorted(str(a) for a in valor)
+        elif nome == "anos":
+            valor = sorted(int(a) for a in valor)
+        elif nome == "ano":
+            valor = int(valor)
+        normal[nome] = valor
+    return normal
+
+
+def nome_artefato(tipo, **params):
+    """Mesma seleção → mesmo nome, na página e no lote."""
+    texto = json.dumps(_normalizar(params), sort_keys=True, ensure_ascii=False)
+    return f"{tipo}-{hashlib.sha1(texto.encode('utf-8')).hexdigest()[:16]}.{TIPOS[tipo]}"
+
+
+class Exportacoes:
+
+    def __init__(self, versao, diretorio=EXPORT_DIR):
+        self.versao = str(versao)
+        self.pasta = diretorio / self.versao
+
+    def caminho(self, tipo, **params):
+        return self.pasta / nome_artefato(tipo, **params)
+
+    def ler(self, tipo, **params):
+        try:
+            return self.caminho(tipo, **params).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def gravar(self, tipo, conteudo, **params):
+        # Temporário único + troca atômica: páginas e workers podem
+        # gravar o mesmo arquivo ao mesmo tempo
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        destino = self.caminho(tipo, **params)
+        with tempfile.NamedTemporaryFile(dir=self.pasta, suffix=".tmp", delete=False) as tmp:
+            tmp.write(conteudo)
+        os.replace(tmp.name, destino)
+        return destino
+
+    def obter(self, tipo, gerar, **params):
+        """Arquivo pronto ou gerado agora (e guardado para os próximos)."""
+        conteudo = self.ler(tipo, **params)
+        if conteudo is None:
+            conteudo = gerar()
+            try:
+                self.gravar(tipo, conteudo, **params)
+            except OSError as e:
+                print(f"⚠️ Não foi possível guardar a exportação {tipo}: {e}")
+        return conteudo
+
+
+def limpar_versoes_antigas(manter=VERSOES_MANTIDAS, diretorio=EXPORT_DIR):
+    if not diretorio.exists():
+        return
+    pastas = sorted((p for p in diretorio.iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime)
+    for pasta in pastas[:-manter]:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+# =========================================================
+# 3) LOTE EM PARALELO
+# =========================================================
+# Cada worker recebe a base uma vez (initializer) e gera os arquivos
+# de várias seleções; só os nomes gerados voltam para o processo principal.
+_worker = {}
+
+
+def _iniciar_worker(df, versao, diretorio, com_png):
+    _worker.update(df=df, exportacoes=Exportacoes(versao, diretorio), com_png=com_png)
+
+
+def _gravar_pngs(tipo, figuras):
+    """figuras: lista de (fig, params), renderizadas num lote só."""
+    if not _worker["com_png"]:
+        return []
+    try:
+        pngs = renderizador().lote([fig for fig, _ in figuras])
+    except Exception as e:
+        # Sem kaleido/Chrome no servidor: segue só com os Excel
+        _worker["com_png"] = False
+        print(f"⚠️ PNG desativado neste worker: {e}")
+        return []
+    return [
+        _worker["exportacoes"].gravar(tipo, png, **params).name
+        for png, (_, params) in zip(pngs, figuras)
+    ]
+
+
+def _selecao(areas, anos):
+    """Arquivos de uma seleção de áreas × anos (Visão Geral, Por Área, Mensal)."""
+    df = _worker["df"]
+    exportacoes = _worker["exportacoes"]
+    df_area = df[df["Area"].isin(areas)]
+    gerados = []
+
+    df_turnover = turnover_anual(df_area, anos)
+    gerados.append(exportacoes.gravar("turnover_geral", exportar_excel(df_turnover), areas=areas, anos=anos).name)
+    gerados += _gravar_pngs("tendencia_anual", [(figura_tendencia_anual(df_turnover), {"areas": areas, "anos": anos})])
+
+    df_area_anual = turnover_por_area_anos(df_area, anos)
+    if not df_area_anual.empty:
+        gerados.append(exportacoes.gravar("turnover_por_area", exportar_excel(df_area_anual), areas=areas, anos=anos).name)
+
+    tabela = turnover_mensal_areas(df, areas, anos)
+    gerados.append(exportacoes.gravar("turnover_mensal", exportar_excel(tabela), areas=areas, anos=anos).name)
+    return gerados
+
+
+def _centros_custo(areas, anos):
+    df = _worker["df"]
+    df_area = df[df["Area"].isin(areas)]
+    gerados = []
+    for ano in anos:
+        df_cc = turnover_por_cc(df_area, ano, **CC_PADRAO)
+        gerados.append(
+            _worker["exportacoes"].gravar("turnover_por_cc", exportar_excel(df_cc), areas=areas, ano=ano, **CC_PADRAO).name
+        )
+    return gerados
+
+
+def _tendencias_mensais(area, anos):
+    if not _worker["com_png"]:
+        return []
+    df = _worker["df"]
+    sub = df[df["Area"] == area]
+    figuras = []
+    for ano in anos:
+        tabela = montar_tabela_mensal_area(sub, [ano], area_label=area)
+        figuras.append((figura_tendencia_mensal(tabela, ano), {"area": area, "ano": ano}))
+    return _gravar_pngs("tendencia_mensal", figuras)
+
+
+def tarefas(df):
+    """(função, args) de todas as seleções padrão da página."""
+    anos = sorted(
+        set(df["Ano_Admissao"][df["Ano_Admissao"] != 0].unique().tolist())
+        | set(df["Ano_Afastamento"][df["Ano_Afastamento"] != 0].unique().tolist())
+    )
+    areas = sorted(df["Area"].dropna().unique().tolist())
+
+    selecoes_areas = [areas] + [[a] for a in areas if len(areas) > 1]
+    selecoes_anos = [anos] + [[a] for a in anos if len(anos) > 1]
+
+    lista = []
+    for sel_areas in selecoes_areas:
+        for sel_anos in selecoes_anos:
+            lista.append((_selecao, (sel_areas, sel_anos)))
+        lista.append((_centros_custo, (sel_areas, anos)))
+    for area in areas:
+        lista.append((_tendencias_mensais, (area, anos)))
+    return lista
+
+
+def gerar_exportacoes(df, versao, workers=None, diretorio=EXPORT_DIR, com_png=True):
+    """Gera todos os arquivos da versão; devolve (gerados, erros)."""
+    lista = tarefas(df)
+    gerados, erros = 0, []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_iniciar_worker,
+        initargs=(df, versao, diretorio, com_png),
+    ) as executor:
+        futuros = {executor.submit(func, *args): (func.__name__, args) for func, args in lista}
+        for futuro in as_completed(futuros):
+            try:
+                gerados += len(futuro.result())
+            except Exception as e:
+                erros.append(f"{futuros[futuro][0]}{futuros[futuro][1]}: {e}")
+    return gerados, erros
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def main():
+    parser = argparse.ArgumentParser(description="Pré-gera as exportações da página de Turnover")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: nº de núcleos)")
+    parser.add_argument("--sem-png", action="store_true", help="só os arquivos Excel")
+    args = parser.parse_args()
+
+    versao = versao_publicada()
+    if versao is None:
+        print("❌ Nenhuma base publicada. Execute o process_data.py primeiro.")
+        return 1
+
+    print(f"📂 Lendo base publicada (versão {versao})...")
+    df = ler_base()
+    if versao_publicada() != versao:
+        print("⚠️ A base foi republicada durante a leitura: rode novamente.")
+        return 1
+
+    inicio = time.perf_counter()
+    gerados, erros = gerar_exportacoes(df, versao, args.workers, com_png=not args.sem_png)
+    limpar_versoes_antigas()
+
+    print(f"✅ {gerados} arquivos em {EXPORT_DIR / str(versao)} ({time.perf_counter() - inicio:.1f} s)")
+    for erro in erros:
+        print(f"❌ {erro}")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
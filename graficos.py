@@ -0,0 +1,45 @@
+import plotly.express as px
+
+# ==============================================================
+# GRÁFICOS DO RESUMO DE TURNOVER (PÁGINA E EXPORTAÇÕES)
+# ==============================================================
+# Os mesmos gráficos aparecem na página 1_Turnover.py e viram PNG no
+# lote noturno (exportacoes.py): montados num lugar só.
+
+
+def figura_tendencia_anual(df_turnover_resumo):
+    fig = px.line(
+        df_turnover_resumo,
+        x="Ano",
+        y="Turnover Alternativo (%)",
+        markers=True,
+        text="Turnover Alternativo (%)"
+    )
+
+    fig.update_traces(
+        texttemplate="%{text:.2f}%",
+        textposition="top center",
+        hovertemplate="Ano: %{x}<br>Turnover: %{y:.2f}%"
+    )
+
+    fig.update_layout(height=260, margin=dict(l=20, r=20, t=20, b=20))
+    return fig
+
+
+def figura_tendencia_mensal(tabela_mensal, ano):
+    fig = px.line(
+        tabela_mensal[tabela_mensal["Ano"] == ano],
+        x="Mês",
+        y="Turnover (%)",
+        markers=True,
+        text="Turnover (%)"
+    )
+
+    fig.update_traces(
+        texttemplate="%{text:.2f}%",
+        textposition="top center",
+        hovertemplate="Mês: %{x}<br>Turnover: %{y:.2f}%"
+    )
+
+    fig.update_layout(height=260, margin=dict(l=20, r=20, t=20, b=20))
+    return fig
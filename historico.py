@@ -0,0 +1,188 @@
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from leitores import compatibilizar_arrow
+
+# =========================================================
+# HISTÓRICO DE SNAPSHOTS (CONSULTA "COMO ERA EM")
+# =========================================================
+# Cada versão distinta de uma linha é gravada uma única vez em
+# linhas.parquet, com o intervalo de snapshots em que esteve vigente:
+#   _valido_de  → primeiro snapshot em que apareceu
+#   _valido_ate → snapshot em que deixou de aparecer (vazio = vigente)
+# Um snapshot novo só acrescenta as linhas que mudaram.
+
+# Recalculadas na leitura: mudariam todas as linhas a cada semana
+COLUNAS_VOLATEIS = ["Idade"]
+
+COLUNAS_CONTROLE = ["_chave", "_valido_de", "_valido_ate"]
+
+COLS_INT = ["Ano_Admissao", "Mes_Admissao", "Ano_Afastamento", "Mes_Afastamento"]
+
+TEMPO_COLS = [
+    "Nome", "Admissão", "Data Afastamento", "Situacao_res", "Area",
+    "Descrição (C.Custo)", "Título Reduzido (Cargo)",
+    "Dias_de_Casa", "Meses_de_Casa", "Anos_de_Casa"
+]
+
+
+def chaves_linhas(df):
+    """
+    Identidade de cada linha: hash do conteúdo (como texto, para não
+    depender do tipo inferido pelo leitor) + nº da ocorrência, para
+    linhas idênticas dentro do mesmo snapshot.
+    """
+    hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    ocorrencia = hashes.groupby(hashes).cumcount()
+    return hashes.map("{:016x}".format) + "-" + ocorrencia.astype(str)
+
+
+def calcular_tempo_casa(df, data_ref):
+    """Mesmas regras do process_data.py, com 'hoje' = data_ref."""
+    d = df.copy()
+    d["Data Ref"] = d["Data Afastamento"].fillna(pd.Timestamp(data_ref))
+    d["Dias_de_Casa"] = (d["Data Ref"] - d["Admissão"]).dt.days.clip(lower=0)
+    d["Meses_de_Casa"] = (d["Dias_de_Casa"] / 30.44).round(1)
+    d["Anos_de_Casa"] = (d["Dias_de_Casa"] / 365).round(2)
+    return d[[c for c in TEMPO_COLS if c in d.columns]]
+
+
+class HistoricoSnapshots:
+
+    def __init__(self, diretorio):
+        self.diretorio = Path(diretorio)
+        self.arquivo_linhas = self.diretorio / "linhas.parquet"
+        self.arquivo_indice = self.diretorio / "snapshots.json"
+
+    # -----------------------------------------------------
+    # ÍNDICE DE SNAPSHOTS
+    # -----------------------------------------------------
+    def _ler_indice(self):
+        if not self.arquivo_indice.exists():
+            return []
+        return json.loads(self.arquivo_indice.read_text(encoding="utf-8"))
+
+    def snapshots(self):
+        """Datas dos snapshots registrados, em ordem crescente."""
+        return [pd.Timestamp(s["data"]) for s in self._ler_indice()]
+
+    def versao(self):
+        """Muda a cada registro: usada como chave de cache nas páginas."""
+        indice = self._ler_indice()
+        return f"{len(indice)}-{indice[-1]['registrado_em']}" if indice else "vazio"
+
+    def snapshot_em(self, data):
+        """Último snapshot com data <= data (ou None)."""
+        data = pd.Timestamp(data)
+        anteriores = [s for s in self.snapshots() if s <= data]
+        return anteriores[-1] if anteriores else None
+
+    # -----------------------------------------------------
+    # REGISTRO
+    # -----------------------------------------------------
+    def registrar(self, df, data_snapshot):
+        """
+        Registra a base tratada de um snapshot. Registrar de novo a mesma
+        data (reprocessamento da semana) substitui o registro anterior.
+        """
+        data = pd.Timestamp(data_snapshot).normalize()
+        indice = self._ler_indice()
+
+        if indice and data < pd.Timestamp(indice[-1]["data"]):
+            raise ValueError(
+                f"Snapshot {data.date()} é anterior ao último registrado "
+                f"({indice[-1]['data']}). Registre os snapshots em ordem."
+            )
+
+        novo = compatibilizar_arrow(df.drop(columns=COLUNAS_VOLATEIS, errors="ignore"))
+        novo["_chave"] = chaves_linhas(novo)
+
+        linhas = self._ler_linhas()
+        if indice and data == pd.Timestamp(indice[-1]["data"]):
+            linhas = self._desfazer(linhas, data)
+            indice = indice[:-1]
+
+        vigentes = linhas["_valido_ate"].isna()
+
+        saem = vigentes & ~linhas["_chave"].isin(novo["_chave"])
+        linhas.loc[saem, "_valido_ate"] = data
+
+        entram = novo[~novo["_chave"].isin(linhas.loc[vigentes, "_chave"])].copy()
+        entram["_valido_de"] = data
+        entram["_valido_ate"] = pd.NaT
+
+        if linhas.empty:
+            # Concatenar com o quadro vazio transformaria inteiros em float
+            linhas = entram.reset_index(drop=True)
+        else:
+            linhas = pd.concat([linhas, entram], ignore_index=True)
+        self._gravar_linhas(linhas)
+
+        indice.append({
+            "data": data.strftime("%Y-%m-%d"),
+            "registros": len(novo),
+            "novas": len(entram),
+            "removidas": int(saem.sum()),
+            "registrado_em": pd.Timestamp.now().isoformat(timespec="seconds"),
+        })
+        self._gravar_indice(indice)
+
+        return indice[-1]
+
+    def _ler_linhas(self):
+        if not self.arquivo_linhas.exists():
+            return pd.DataFrame({
+                "_chave": pd.Series(dtype=str),
+                "_valido_de": pd.Series(dtype="datetime64[ns]"),
+                "_valido_ate": pd.Series(dtype="datetime64[ns]"),
+            })
+        return pd.read_parquet(self.arquivo_linhas)
+
+    def _desfazer(self, linhas, data):
+        linhas = linhas[linhas["_valido_de"] != data].copy()
+        linhas.loc[linhas["_valido_ate"] == data, "_valido_ate"] = pd.NaT
+        return linhas
+
+    def _gravar_linhas(self, linhas):
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        tmp = self.arquivo_linhas.with_name(self.arquivo_linhas.name + ".tmp")
+        compatibilizar_arrow(linhas).to_parquet(tmp, index=False)
+        os.replace(tmp, self.arquivo_linhas)
+
+    def _gravar_indice(self, indice):
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        tmp = self.arquivo_indice.with_name(self.arquivo_indice.name + ".tmp")
+        tmp.write_text(json.dumps(indice, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.arquivo_indice)
+
+    # -----------------------------------------------------
+    # CONSULTA
+    # -----------------------------------------------------
+    def base_em(self, data):
+        """Base tratada como estava no último snapshot até `data`."""
+        snap = self.snapshot_em(data)
+        if snap is None:
+            raise ValueError(f"Nenhum snapshot registrado até {pd.Timestamp(data).date()}.")
+
+        # Só lê do disco as versões que já existiam no snapshot
+        linhas = pd.read_parquet(self.arquivo_linhas, filters=[("_valido_de", "<=", snap)])
+        vigentes = linhas["_valido_ate"].isna() | (linhas["_valido_ate"] > snap)
+
+        df = linhas[vigentes].drop(columns=COLUNAS_CONTROLE).reset_index(drop=True)
+
+        # Snapshots com colunas diferentes deixam vazios nas auxiliares
+        for col in COLS_INT:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+
+        if "Nascimento" in df.columns:
+            df["Idade"] = ((snap - df["Nascimento"]).dt.days / 365.25).fillna(0).astype(int)
+
+        return df
+
+    def tempo_casa_em(self, data):
+        snap = self.snapshot_em(data)
+        return calcular_tempo_casa(self.base_em(data), snap)
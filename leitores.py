@@ -0,0 +1,248 @@
+import hashlib
+import importlib.util
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from caminhos import CACHE_DIR as CACHE_ROOT
+
+# =========================================================
+# CONFIGURAÇÕES
+# =========================================================
+CACHE_DIR = CACHE_ROOT / "planilhas"
+
+# Planilhas convertidas mantidas no cache (as lidas mais recentemente);
+# cada carga semanal traz arquivos novos e as antigas não voltam a ser lidas
+PLANILHAS_MANTIDAS = 60
+
+# Ordem de preferência: o primeiro motor instalado é usado
+MOTORES = {
+    "calamine": "python_calamine",  # leitor em Rust (pandas >= 2.2)
+    "xlrd": "xlrd",          # .xls (padrão histórico)
+    "openpyxl": "openpyxl",  # .xlsx
+}
+
+
+def motores_disponiveis():
+    return [
+        nome for nome, modulo in MOTORES.items()
+        if importlib.util.find_spec(modulo) is not None
+    ]
+
+
+def hash_conteudo(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def _como_bytes(origem):
+    if isinstance(origem, (bytes, bytearray)):
+        return bytes(origem)
+    return Path(origem).read_bytes()
+
+
+# =========================================================
+# 1) LEITURA PELOS MOTORES
+# =========================================================
+def ler_com_motor(conteudo, motor):
+    return pd.read_excel(BytesIO(conteudo), engine=motor)
+
+
+def ler_excel_rapido(conteudo, motor=None):
+    """
+    Lê a planilha com o motor pedido ou com o mais rápido instalado.
+    Se o motor preferido falhar no arquivo, tenta o próximo.
+    """
+    candidatos = [motor] if motor else motores_disponiveis()
+    if not candidatos:
+        raise ImportError("Nenhum leitor de planilhas instalado (python-calamine ou xlrd).")
+
+    erro = None
+    for nome in candidatos:
+        try:
+            return ler_com_motor(conteudo, nome)
+        except ImportError:
+            raise
+        except Exception as e:
+            erro = e
+
+    raise erro
+
+
+# =========================================================
+# 2) CACHE EM ARROW (CHAVE = HASH DO CONTEÚDO)
+# =========================================================
+def _arrow_disponivel():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def caminho_cache(chave):
+    return CACHE_DIR / f"{chave}.arrow"
+
+
+def compatibilizar_arrow(df):
+    """
+    Colunas com tipos misturados (ex.: C.Custo com números e textos)
+    viram texto, que é o que o Arrow aceita; valores vazios continuam vazios.
+    """
+    d = df.reset_index(drop=True)
+    mistas = [
+        col for col in d.columns[d.dtypes == object]
+        if d[col].dropna().map(type).nunique() > 1
+    ]
+    if not mistas:
+        return d
+
+    d = d.copy()
+    for col in mistas:
+        d[col] = d[col].where(d[col].isna(), d[col].astype(str))
+    return d
+
+
+def _salvar_arrow(df, path):
+    compatibilizar_arrow(df).to_feather(path)
+
+
+def limpar_cache_antigo(manter=PLANILHAS_MANTIDAS, diretorio=None):
+    diretorio = diretorio or CACHE_DIR
+    if not diretorio.exists():
+        return
+    arquivos = sorted(diretorio.glob("*.arrow"), key=lambda p: p.stat().st_mtime)
+    for antigo in arquivos[:-manter]:
+        try:
+            antigo.unlink(missing_ok=True)
+        except OSError:
+            # Arquivo aberto por outro processo (Windows): fica para a próxima
+            pass
+
+
+def _arquivo_arrow(conteudo, motor=None):
+    path = caminho_cache(hash_conteudo(conteudo))
+    if path.exists():
+        # Leitura conta como uso: a limpeza remove as menos lidas, não as mais velhas
+        path.touch()
+        return path
+
+    df = ler_excel_rapido(conteudo, motor)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    _salvar_arrow(df, tmp)
+    tmp.replace(path)
+    limpar_cache_antigo()
+    return path
+
+
+def arquivo_arrow(origem, motor=None):
+    """
+    Caminho do .arrow da planilha (convertida agora, se preciso), para
+    quem lê o Arrow direto, sem passar pelo pandas (process_polars.py).
+    """
+    if not _arrow_disponivel():
+        raise ImportError("pyarrow não instalado: sem cache em Arrow.")
+    return _arquivo_arrow(_como_bytes(origem), motor)
+
+
+def ler_planilha(origem, motor=None, usar_cache=True):
+    """
+    Lê um .xls/.xlsx (caminho ou bytes).
+    Com cache, cada arquivo é convertido para Arrow uma única vez;
+    as próximas leituras do mesmo conteúdo vêm direto do .arrow.
+    """
+    conteudo = _como_bytes(origem)
+
+    if not (usar_cache and _arrow_disponivel()):
+        return ler_excel_rapido(conteudo, motor)
+
+    # Devolve o que foi gravado: a primeira leitura e as seguintes
+    # ficam com exatamente os mesmos tipos
+    return pd.read_feather(_arquivo_arrow(conteudo, motor))
+
+
+# =========================================================
+# 3) LEITURA EM BLOCOS (ARQUIVOS MAIORES QUE A MEMÓRIA)
+# =========================================================
+# Exportações diárias (ex.: ausências) têm milhões de linhas: em vez de
+# um DataFrame inteiro, blocos de `tamanho` linhas, um de cada vez.
+TAMANHO_BLOCO = 200_000
+
+
+def hash_arquivo(path, bloco=1 << 20):
+    """Hash do conteúdo lido aos poucos (não carrega o arquivo)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def _formato_csv(path):
+    """(encoding, separador) pela amostra inicial: Senior exporta em latin-1 e com ';'."""
+    with open(path, "rb") as f:
+        amostra = f.read(64 * 1024)
+    try:
+        amostra.decode("utf-8")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+    cabecalho = amostra.decode(encoding, errors="ignore").splitlines()[0] if amostra else ""
+    return encoding, ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+
+
+def _blocos_xlsx(path, tamanho, colunas, texto=False):
+    from openpyxl import load_workbook
+
+    def montar(bloco):
+        if not texto:
+            return pd.DataFrame(bloco, columns=nomes)
+        # Sem inferência de tipo por bloco: 1001 vira "1001" em todos os blocos
+        return pd.DataFrame(bloco, columns=nomes, dtype=object).astype("str")
+
+    # read_only: as linhas vêm do XML aos poucos, sem montar a planilha
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        linhas = wb.active.iter_rows(values_only=True)
+        cabecalho = [str(c).strip() if c is not None else "" for c in next(linhas, [])]
+        indices = [i for i, c in enumerate(cabecalho) if colunas is None or c in colunas]
+        nomes = [cabecalho[i] for i in indices]
+
+        bloco = []
+        for linha in linhas:
+            bloco.append([linha[i] if i < len(linha) else None for i in indices])
+            if len(bloco) == tamanho:
+                yield montar(bloco)
+                bloco = []
+        if bloco:
+            yield montar(bloco)
+    finally:
+        wb.close()
+
+
+def ler_em_blocos(path, tamanho=TAMANHO_BLOCO, colunas=None, texto=False):
+    """
+    DataFrames de até `tamanho` linhas de um .csv, .xlsx ou .xls.
+    `colunas`: só estas são lidas (as que existirem no arquivo).
+    `texto`: .xlsx com todas as colunas em texto, como o .csv (mesmos
+    tipos em todos os blocos).
+    .xls (formato binário antigo) não tem leitura parcial: é lido
+    inteiro e entregue em blocos.
+    """
+    path = Path(path)
+    sufixo = path.suffix.lower()
+
+    if sufixo in (".csv", ".txt"):
+        encoding, sep = _formato_csv(path)
+        filtro = None if colunas is None else (lambda c: c.strip() in colunas)
+        with pd.read_csv(
+            path, sep=sep, encoding=encoding, usecols=filtro, dtype=str, chunksize=tamanho,
+        ) as leitor:
+            for bloco in leitor:
+                yield bloco.rename(columns=str.strip)
+    elif sufixo in (".xlsx", ".xlsm"):
+        yield from _blocos_xlsx(path, tamanho, colunas, texto)
+    else:
+        df = ler_planilha(path)
+        if colunas is not None:
+            df = df[[c for c in df.columns if c in colunas]]
+        for inicio in range(0, len(df), tamanho):
+            yield df.iloc[inicio:inicio + tamanho]
@@ -1,35 +1,45 @@
 import streamlit as st
-import toml
 from pathlib import Path
 
+LOCAL_PATH = Path(__file__).resolve().parent / "credentials.local.toml"
+
 # =========================================================
 # 1) CARREGAR CREDENCIAIS
 # =========================================================
+# Lidas uma vez por processo, só quando alguém tenta entrar: a tela de
+# login abre sem ler arquivo nenhum. Alterou as credenciais? Reinicie o portal.
+@st.cache_resource(show_spinner=False)
 def load_credentials():
+    """(usuários, administradores, áreas por usuário) ou None se não houver credenciais."""
     # Streamlit Cloud
     if "users" in st.secrets:
-        return {
-            str(u).strip(): str(p).strip()
-            for u, p in st.secrets["users"].items()
-        }
+        fonte = st.secrets
 
     # Ambiente local
-    base_dir = Path(__file__).resolve().parent
-    local_path = base_dir / "credentials.local.toml"
+    elif LOCAL_PATH.exists():
+        import toml  # só o ambiente local usa o arquivo .toml
+        fonte = toml.load(LOCAL_PATH)
+    else:
+        return None
 
-    if not local_path.exists():
-        st.error("Arquivo credentials.local.toml não encontrado.")
-        st.stop()
+    users = {str(u).strip(): str(p).strip() for u, p in fonte.get("users", {}).items()}
+    admins = {str(u).strip() for u in fonte.get("admins", [])}
+
+    # Usuário fora de [areas] vê todas as áreas
+    areas = {}
+    for u, lista in fonte.get("areas", {}).items():
+        lista = [lista] if isinstance(lista, str) else lista
+        areas[str(u).strip()] = [str(a).strip() for a in lista]
+    return users, admins, areas
 
-    data = toml.load(local_path)
-    return {
-        str(u).strip(): str(p).strip()
-        for u, p in data.get("users", {}).items()
-    }
 
+def credenciais():
+    dados = load_credentials()
+    if dados is None:
+        st.error("Arquivo credentials.local.toml não encontrado.")
+        st.stop()
+    return dados
 
-# ⚠️ CARREGA SEM CACHE
-USERS = load_credentials()
 
 # =========================================================
 # 2) VALIDAR LOGIN
@@ -38,7 +48,31 @@ def check_login(username, password):
     if not username or not password:
         return False
 
-    return USERS.get(username.strip()) == password.strip()
+    users, _, _ = credenciais()
+    return users.get(username.strip()) == password.strip()
+
+
+def is_admin():
+    if "logged_user" not in st.session_state:
+        return False
+    _, admins, _ = credenciais()
+    return st.session_state["logged_user"] in admins
+
+
+def areas_permitidas():
+    """Áreas que o usuário logado pode ver; None = todas."""
+    if "logged_user" not in st.session_state:
+        return None
+    _, _, areas = credenciais()
+    return areas.get(st.session_state["logged_user"])
+
+
+def restringir_areas(areas):
+    """Mantém só as áreas permitidas ao usuário logado (mesma ordem)."""
+    permitidas = areas_permitidas()
+    if permitidas is None:
+        return list(areas)
+    return [a for a in areas if a in permitidas]
 
 
 # =========================================================
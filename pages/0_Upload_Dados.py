@@ -1,8 +1,4 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from datetime import date
-import re
 from login import require_login
 
 
@@ -21,6 +17,15 @@ st.set_page_config(
 # =========================================================
 require_login()
 
+# Módulos pesados só depois do login (a tela de login abre sem eles)
+import pandas as pd
+import perfil
+from armazem import armazem, calcular_chave, dataset_da_sessao
+from pipeline import ETAPAS
+from tarefas import fila
+
+perfil.iniciar("Upload de Dados")
+
 # =========================================================
 # TÍTULO
 # =========================================================
@@ -33,6 +38,7 @@ st.markdown(
 # =========================================================
 # UPLOAD
 # =========================================================
+perfil.marco("Upload")
 col1, col2 = st.columns(2)
 
 with col1:
@@ -49,134 +55,112 @@ with col2:
         accept_multiple_files=False
     )
 
-if not file_clt or not file_pj:
-    st.info("📌 Envie os dois arquivos para continuar.")
-    st.stop()
-
-# =========================================================
-# PROCESSAMENTO
-# =========================================================
-with st.spinner("Processando dados..."):
-
-    df_clt = pd.read_excel(file_clt, engine="xlrd")
-    df_pj = pd.read_excel(file_pj, engine="xlrd")
-
-    # ---------------- LIMPEZA INICIAL ----------------
-    def limpeza_inicial(d):
-        d = d.dropna(how="all").reset_index(drop=True)
-        return d.drop(columns=["Posição do Local", "Cadastro"], errors="ignore")
-
-    df_clt = limpeza_inicial(df_clt)
-    df_pj = limpeza_inicial(df_pj)
-
-    # ---------------- REMOÇÃO DE CARGOS ----------------
-    padrao_clt = r"JOVEM APRENDIZ|ESTAGIARI[OA]|APRENDIZ"
-    padrao_pj = r"PRESTADOR DE SERVIÇO|SERVENTE DE ZELADORIA|ESPEC\.? DE SERV\.? DE LAVANDERIA"
-
-    cargos_remover_pj = [
-        "MEDICO DE TRABALHO", "FAXINEIRO", "MODELO DE PROVA", "NUTRICIONISTA",
-        "SECRETARIA", "MOTORISTA", "PROFESSOR DE INGLES", "ESTOQUISTA",
-        "IMPRESSOR DE ADESIVOS", "ZELADORA", "ZELADOR", "VIGILANTE",
-        "COACHING", "AN ADM PESSOAL I"
-    ]
-
-    padrao_pj_extra = r"|".join(map(re.escape, cargos_remover_pj))
-
-    df_clt = df_clt[
-        ~df_clt["Título Reduzido (Cargo)"].str.contains(padrao_clt, case=False, na=False)
-    ]
-
-    df_pj = df_pj[
-        ~df_pj["Título Reduzido (Cargo)"].str.contains(padrao_pj_extra, case=False, na=False)
-    ]
-
-    df_pj = df_pj[
-        ~df_pj["Título Reduzido (Cargo)"].str.contains(padrao_pj, case=False, na=False)
-    ]
-
-    # ---------------- DATAS ----------------
-    DATE_COLS = ["Nascimento", "Admissão", "Data Afastamento"]
-
-    def tratar_datas(d):
-        for col in DATE_COLS:
-            d[col] = (
-                d[col]
-                .astype(str)
-                .str.strip()
-                .replace(["", " ", "0", "00/00/0000", "--", "NaT", "nan"], pd.NA)
-            )
-            d[col] = pd.to_datetime(d[col], errors="coerce")
-        return d
-
-    df_clt = tratar_datas(df_clt)
-    df_pj = tratar_datas(df_pj)
-
-    def calc_idade(dt):
-        if pd.isna(dt):
-            return 0
-        return int((date.today() - dt.date()).days / 365.25)
-
-    for d in (df_clt, df_pj):
-        d["Idade"] = d["Nascimento"].apply(calc_idade)
-        d["Mes_Admissao"] = d["Admissão"].dt.month.fillna(0).astype(int)
-        d["Ano_Admissao"] = d["Admissão"].dt.year.fillna(0).astype(int)
-        d["Mes_Afastamento"] = d["Data Afastamento"].dt.month.fillna(0).astype(int)
-        d["Ano_Afastamento"] = d["Data Afastamento"].dt.year.fillna(0).astype(int)
-
-    # ---------------- SITUAÇÃO ----------------
-    df_clt["Situacao_res"] = np.where(
-        df_clt["Situação"].isin([1, 2, 3, 4]),
-        "Ativo",
-        "Desligado/Afastado"
+# =========================================================
+# ENVIO PARA PROCESSAMENTO EM SEGUNDO PLANO
+# =========================================================
+# O processamento roda no pool de workers (tarefas.py); a sessão
+# guarda só o id da tarefa e pode navegar enquanto isso.
+# Uploads idênticos (mesmo hash) reaproveitam o dataset já processado
+# por outra sessão no armazém compartilhado (armazem.py).
+def enviar_processamento(chave):
+    st.session_state["tarefa_upload"] = fila().enviar(
+        chave, file_clt.getvalue(), file_pj.getvalue()
     )
 
-    df_pj["Situacao_res"] = np.where(
-        df_pj["Situação"].isin([1, 2, 3, 4]),
-        "Ativo",
-        "Desligado/Afastado"
-    )
 
-    # ---------------- ÁREA ----------------
-    def classificar_area(cc):
-        cc = str(cc).upper()
-        if "LOJAS" in cc:
-            return "Varejo"
-        if "SUPPLY" in cc:
-            return "Indústria"
-        return "Matriz"
+perfil.marco("Hash e armazém")
+if file_clt and file_pj:
+    assinatura = (file_clt.name, file_clt.size, file_pj.name, file_pj.size)
 
-    for d in (df_clt, df_pj):
-        d["Area"] = d["C.Custo"].astype(str).apply(classificar_area)
+    if st.session_state.get("upload_assinatura") != assinatura:
+        st.session_state["upload_assinatura"] = assinatura
+        chave = calcular_chave(file_clt.getvalue(), file_pj.getvalue())
 
-    # ---------------- UNIFICA ----------------
-    df_clt["TIPO"] = "CLT"
-    df_pj["TIPO"] = "PJ"
+        ref_atual = st.session_state.get("dataset_upload")
+        if ref_atual is None or ref_atual.chave != chave:
+            ref = armazem().referenciar(chave)
+            if ref is not None:
+                st.session_state["dataset_upload"] = ref
+                st.session_state.pop("tarefa_upload", None)
+            else:
+                enviar_processamento(chave)
+else:
+    # Arquivo removido: enviá-lo de novo (mesmo nome e tamanho) é um novo envio
+    st.session_state.pop("upload_assinatura", None)
 
-    df_base = pd.concat([df_clt, df_pj], ignore_index=True)
+tarefa_id = st.session_state.get("tarefa_upload")
+tarefa = fila().consultar(tarefa_id) if tarefa_id else None
+
+if tarefa is None and "dataset_upload" not in st.session_state:
+    st.info("📌 Envie os dois arquivos para continuar.")
+    perfil.parar()
 
-def read_xls(uploaded_file):
-    try:
-        return pd.read_excel(uploaded_file, engine="xlrd")
-    except ImportError:
-        st.error(
-            "Faltou instalar a dependência **xlrd** no Streamlit Cloud.\n\n"
-            "✅ Corrija o `requirements.txt` com: `xlrd==2.0.1` e faça **Reboot** no app."
-        )
-        st.stop()
-    except Exception as e:
-        st.error(f"Erro ao ler o arquivo .xls: {e}")
-        st.stop()
 
-df_clt = read_xls(file_clt)
-df_pj  = read_xls(file_pj)    
+# =========================================================
+# PROGRESSO
+# =========================================================
+def exibir_etapas(tarefa):
+    for i, (chave, descricao) in enumerate(ETAPAS):
+        if i < tarefa.concluidas:
+            st.markdown(f"✅ {descricao}")
+        elif chave == tarefa.etapa:
+            st.markdown(f"⏳ **{descricao}…**")
+        else:
+            st.markdown(f"▫️ {descricao}")
+
+
+@st.fragment(run_every=1)
+def acompanhar_tarefa(tarefa_id):
+    tarefa = fila().consultar(tarefa_id)
+
+    if tarefa is None or not tarefa.em_andamento:
+        # Terminou: recarrega a página inteira para exibir o resultado
+        st.rerun()
+
+    st.progress(tarefa.progresso, text=tarefa.descricao_etapa())
+    exibir_etapas(tarefa)
+    st.caption("Você pode navegar pelo portal; o processamento continua em segundo plano.")
+
+
+if tarefa is not None and tarefa.em_andamento:
+    acompanhar_tarefa(tarefa.id)
+    perfil.parar()
+
+if tarefa is not None and tarefa.status == "erro":
+    exibir_etapas(tarefa)
+    st.error(tarefa.erro)
+    # A assinatura dos arquivos não muda: sem isso, os mesmos arquivos
+    # nunca voltariam para a fila
+    if st.button("🔁 Processar novamente"):
+        st.session_state.pop("upload_assinatura", None)
+        st.rerun()
+    perfil.parar()
 
 # =========================================================
-# SALVA NA SESSÃO
+# SALVA NA SESSÃO (APENAS A REFERÊNCIA)
 # =========================================================
-st.session_state["df_clt"] = df_clt
-st.session_state["df_pj"] = df_pj
-st.session_state["df_base"] = df_base
-st.session_state["data_upload"] = pd.Timestamp.now()
+if tarefa is not None:
+    ref = armazem().referenciar(tarefa.chave)
+    if ref is None:
+        # Removido do armazém antes de ser referenciado: processa de novo
+        st.session_state.pop("tarefa_upload", None)
+        if not (file_clt and file_pj):
+            st.info("📌 Envie os dois arquivos novamente para continuar.")
+            perfil.parar()
+        enviar_processamento(tarefa.chave)
+        st.rerun()
+
+    # A referência anterior é liberada ao ser substituída
+    st.session_state["dataset_upload"] = ref
+    st.session_state["data_upload"] = pd.Timestamp.now()
+    st.session_state.pop("tarefa_upload", None)
+
+perfil.marco("Resultado")
+resultado = dataset_da_sessao()
+df_clt = resultado["df_clt"]
+df_pj = resultado["df_pj"]
+perfil.memoria("CLT", df_clt)
+perfil.memoria("PJ", df_pj)
 
 # =========================================================
 # FEEDBACK
@@ -189,3 +173,8 @@ st.success(
 st.markdown(
     "➡️ Agora navegue pelas páginas **Turnover**, **Tempo de Casa** ou **Assistente IA**."
 )
+
+# =========================================================
+# MODO PERFIL (ADMINISTRADORES)
+# =========================================================
+perfil.finalizar()
@@ -1,65 +1,71 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from calendar import monthrange
-from io import BytesIO
-from login import require_login
-from pathlib import Path
+from login import require_login, restringir_areas
 
 require_login()
 
-# ==============================================================
-# 1) CARREGAR BASE TRATADA
-# ==============================================================
+# Módulos pesados só depois do login (a tela de login abre sem eles)
+import plotly.express as px
+import perfil
+from consultas import ConsultasPandas
+from dados import dados_atuais, escolher_snapshot, base_no_snapshot, historico
+from exportacoes import Exportacoes, exportar_excel, exportar_grafico_png
+from graficos import figura_tendencia_anual, figura_tendencia_mensal
+import renderizador
 
-# ==============================================================
-# CONFIGURAÇÃO DE CAMINHOS (PADRÃO SEGURO)
-# ==============================================================
+perfil.iniciar("Turnover")
 
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_ROOT = BASE_DIR.parent / "lamoda_dados"
-DATA_DIR = DATA_ROOT / "data"
+exportar_excel = perfil.medido(exportar_excel)
+exportar_grafico_png = perfil.medido(exportar_grafico_png)
 
+# ==============================================================
+# 1) CARREGAR BASE TRATADA
+# ==============================================================
+perfil.marco("Carregar base")
 
-@st.cache_data(show_spinner="Carregando base de dados…")
-def load_data():
-    if not (DATA_DIR / "base_tratada.csv").exists():
-        st.error(
-        "Base de dados não encontrada.\n\n"
-        "Execute o process_data.py localmente para gerar a base tratada."
-    )
-    st.stop()
+# A base é mantida pelo monitor de dados: quando o process_data.py
+# publica uma nova versão, ela é trocada sem reiniciar o portal.
+dados = dados_atuais()
 
-    df = pd.read_csv(DATA_DIR / "base_tratada.csv", sep=",", encoding="utf-8")
-    # Datas
-    df["Admissão"] = pd.to_datetime(df["Admissão"], errors="coerce")
-    df["Data Afastamento"] = pd.to_datetime(df["Data Afastamento"], errors="coerce")
+# Consulta histórica: mesma análise sobre a base de uma semana anterior
+data_snapshot, atualizado_em, chave_base = escolher_snapshot(dados)
+if data_snapshot is None:
+    # Motor da versão: pandas, DuckDB ou particionado, conforme LAMODA_MOTOR (ver dados.py)
+    consultas = dados.consultas
+else:
+    consultas = ConsultasPandas(base_no_snapshot(data_snapshot, historico().versao()))
+perfil.memoria("base", consultas.df)
 
-    # Garantir inteiros nas colunas auxiliares
-    for col in ["Ano_Admissao", "Mes_Admissao", "Ano_Afastamento", "Mes_Afastamento"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+# Funções de cálculo medidas no modo perfil (ver perfil.py)
+calcular_turnover_periodo = perfil.medido(consultas.turnover_periodo, "turnover_periodo")
+turnover_por_area = perfil.medido(consultas.turnover_por_area, "turnover_por_area")
+turnover_por_cc = perfil.medido(consultas.turnover_por_cc, "turnover_por_cc")
+montar_tabela_mensal_area = perfil.medido(consultas.tabela_mensal_area, "tabela_mensal_area")
+turnover_anual = perfil.medido(consultas.turnover_anual, "turnover_anual")
+turnover_por_area_anos = perfil.medido(consultas.turnover_por_area_anos, "turnover_por_area_anos")
+turnover_mensal_areas = perfil.medido(consultas.turnover_mensal_areas, "turnover_mensal_areas")
 
-    return df
 
+@perfil.cacheado(st.cache_data(max_entries=2))
+def dimensoes_disponiveis(_consultas, versao):
+    return _consultas.dimensoes()
 
-df = load_data()
 
-# Anos e áreas disponíveis
-anos_disponiveis = sorted(
-    set(
-        df["Ano_Admissao"].replace(0, pd.NA).dropna().unique().tolist()
-        + df["Ano_Afastamento"].replace(0, pd.NA).dropna().unique().tolist()
-    )
-)
+# Anos e áreas disponíveis (cache por versão da base)
+anos_disponiveis, areas_disponiveis = dimensoes_disponiveis(consultas, chave_base)
 if not anos_disponiveis:
     anos_disponiveis = [2023, 2024, 2025]
 
-areas_disponiveis = sorted(df["Area"].dropna().unique().tolist())
+# Só as áreas liberadas ao usuário (login.areas_permitidas). No motor
+# particionado, as consultas leem só as partições dessas áreas.
+areas_disponiveis = restringir_areas(areas_disponiveis)
+if not areas_disponiveis:
+    st.warning("Nenhuma área liberada para o seu usuário.")
+    perfil.parar()
 
 # ==============================================================
 # 2) BARRA LATERAL – FILTROS
 # ==============================================================
+perfil.marco("Filtros")
 
 with st.sidebar:
     st.header("Filtros")
@@ -113,377 +119,34 @@ with st.sidebar:
         "Mostrar aviso sobre CC pequenos", value=True
     )
 
-# Filtra a base apenas pelas áreas (anos são tratados nas funções/anos_selecionados)
-df_area = df[df["Area"].isin(areas_selecionadas)].copy()
+# Áreas com registros, na ordem da base (anos são tratados nas funções/anos_selecionados)
+areas_presentes = consultas.areas_presentes(areas_selecionadas)
 
-if df_area.empty:
+if not areas_presentes:
     st.error("Nenhum dado encontrado para as áreas selecionadas.")
-    st.stop()
+    perfil.parar()
 
 
 # ==============================================================
 # 3) EXPORTAÇÃO — EXCEL + PNG
 # ==============================================================
+# Os arquivos das seleções padrão são pré-gerados pelo lote noturno
+# (exportacoes.py); os demais são gerados no primeiro download e
+# guardados para os próximos. Snapshots históricos geram na hora.
+exportacoes = Exportacoes(chave_base) if data_snapshot is None else None
 
-def exportar_excel(df_export):
-    output = BytesIO()
-    # usando openpyxl para evitar erro de xlsxwriter
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df_export.to_excel(writer, index=False, sheet_name="Dados")
-    return output.getvalue()
 
-
-def exportar_grafico_png(fig):
-    buffer = BytesIO()
-    # requer kaleido instalado: pip install -U kaleido
-    fig.write_image(buffer, format="png")
-    return buffer.getvalue()
+def arquivo_exportacao(tipo, gerar, **params):
+    if exportacoes is None:
+        return gerar()
+    return exportacoes.obter(tipo, gerar, **params)
 
 
 # ==============================================================
-# 4) FUNÇÕES DE CÁLCULO – PADRÃO
+# 4) FUNÇÕES DE CÁLCULO (turnover.py)
 # ==============================================================
-
-def turnover_moderno(adm, dem, ativos_ini, ativos_fim):
-    ativos_med = (ativos_ini + ativos_fim) / 2
-    return ((adm + dem) / 2) / ativos_med * 100 if ativos_med > 0 else 0
-
-
-def turnover_total_colab(adm, dem, total_colab):
-    return ((adm + dem) / 2) / total_colab * 100 if total_colab > 0 else 0
-
-
-def calcular_turnover_periodo(df_base, ano, fim_perfil=None):
-    """
-    Turnover anual geral usando suas fórmulas originais.
-    """
-    df_local = df_base.copy()
-
-    if fim_perfil is None:
-        periodo_start = pd.Timestamp(f"{ano}-01-01")
-        periodo_end = pd.Timestamp(f"{ano}-12-31")
-    else:
-        periodo_start = pd.Timestamp(f"{ano}-01-01")
-        periodo_end = pd.Timestamp(fim_perfil)
-
-    df_local["É_Desligamento"] = ~df_local["Causa Escrita"].isin(["ATIVO", "Morte"])
-
-    # Admissões dentro do período
-    adm = df_local[
-        (df_local["Admissão"] >= periodo_start)
-        & (df_local["Admissão"] <= periodo_end)
-    ].shape[0]
-
-    # Desligamentos válidos dentro do período
-    dem = df_local[
-        (df_local["É_Desligamento"])
-        & (df_local["Data Afastamento"] >= periodo_start)
-        & (df_local["Data Afastamento"] <= periodo_end)
-    ].shape[0]
-
-    # Ativos no início
-    ativos_ini = df_local[
-        (df_local["Admissão"] <= periodo_start)
-        & (
-            df_local["Data Afastamento"].isna()
-            | (df_local["Data Afastamento"] > periodo_start)
-        )
-    ].shape[0]
-
-    # Ativos no fim
-    ativos_fim = df_local[
-        (df_local["Admissão"] <= periodo_end)
-        & (
-            df_local["Data Afastamento"].isna()
-            | (df_local["Data Afastamento"] > periodo_end)
-        )
-    ].shape[0]
-
-    ativos_medios = (ativos_ini + ativos_fim) / 2
-
-    turn1 = turnover_moderno(adm, dem, ativos_ini, ativos_fim)
-    turn2 = turnover_total_colab(adm, dem, ativos_fim)
-
-    return {
-        "Ano": ano,
-        "Admissões": adm,
-        "Desligamentos": dem,
-        "Ativos início": ativos_ini,
-        "Ativos fim": ativos_fim,
-        "Ativos médios": round(ativos_medios, 2),
-        "Turnover Moderno (%)": round(turn1, 2),
-        "Turnover Alternativo (%)": round(turn2, 2),
-    }
-
-
-def turnover_por_area(df_base, ano, fim_periodo=None):
-    """
-    Turnover anual por Área (Varejo / Indústria / Matriz).
-    """
-    df_local = df_base.copy()
-
-    if fim_periodo is None:
-        ini = pd.Timestamp(f"{ano}-01-01")
-        fim = pd.Timestamp(f"{ano}-12-31")
-    else:
-        ini = pd.Timestamp(f"{ano}-01-01")
-        fim = pd.Timestamp(fim_periodo)
-
-    df_local["É_Desligamento"] = ~df_local["Causa Escrita"].isin(["ATIVO", "Morte"])
-
-    areas = df_local["Area"].dropna().unique()
-    linhas = []
-
-    for area in areas:
-        sub = df_local[df_local["Area"] == area]
-
-        adm = sub[(sub["Admissão"] >= ini) & (sub["Admissão"] <= fim)].shape[0]
-
-        dem = sub[
-            (sub["É_Desligamento"])
-            & (sub["Data Afastamento"] >= ini)
-            & (sub["Data Afastamento"] <= fim)
-        ].shape[0]
-
-        ativos_ini = sub[
-            (sub["Admissão"] <= ini)
-            & (
-                sub["Data Afastamento"].isna()
-                | (sub["Data Afastamento"] > ini)
-            )
-        ].shape[0]
-
-        ativos_fim = sub[
-            (sub["Admissão"] <= fim)
-            & (
-                sub["Data Afastamento"].isna()
-                | (sub["Data Afastamento"] > fim)
-            )
-        ].shape[0]
-
-        turn_mod = turnover_moderno(adm, dem, ativos_ini, ativos_fim)
-        turn_alt = turnover_total_colab(adm, dem, ativos_fim)
-
-        linhas.append(
-            {
-                "Ano": ano,
-                "Área": area,
-                "Admissões": adm,
-                "Desligamentos": dem,
-                "Ativos início": ativos_ini,
-                "Ativos fim": ativos_fim,
-                "Ativos médios": round((ativos_ini + ativos_fim) / 2, 2),
-                "Turnover Moderno (%)": round(turn_mod, 2),
-                "Turnover Alternativo (%)": round(turn_alt, 2),
-            }
-        )
-
-    return pd.DataFrame(linhas)
-
-
-def turnover_por_centro_custo(df_base, ano):
-    """
-    Calcula turnover por Centro de Custo (Descrição C.Custo) para um ano específico.
-    Usa a fórmula TURNOVER ALTERNATIVO = (Adm + Dem) / (2 × Ativos_fim)
-    """
-    ini = pd.Timestamp(f"{ano}-01-01")
-    fim = pd.Timestamp(f"{ano}-12-31")
-
-    df_local = df_base.copy()
-    df_local["É_Desligamento"] = ~df_local["Causa Escrita"].isin(["ATIVO", "Morte"])
-
-    centros = df_local["Descrição (C.Custo)"].dropna().unique()
-
-    resultados = []
-
-    for cc in centros:
-        sub = df_local[df_local["Descrição (C.Custo)"] == cc]
-
-        adm = sub[(sub["Admissão"] >= ini) & (sub["Admissão"] <= fim)].shape[0]
-
-        dem = sub[
-            (sub["É_Desligamento"])
-            & (sub["Data Afastamento"] >= ini)
-            & (sub["Data Afastamento"] <= fim)
-        ].shape[0]
-
-        ativos_fim = sub[
-            (sub["Admissão"] <= fim)
-            & (
-                sub["Data Afastamento"].isna()
-                | (sub["Data Afastamento"] > fim)
-            )
-        ].shape[0]
-
-        if ativos_fim == 0:
-            turnover = 0
-        else:
-            turnover = ((adm + dem) / (2 * ativos_fim)) * 100
-
-        resultados.append({
-            "Centro de Custo": cc,
-            "Admissões": adm,
-            "Desligamentos": dem,
-            "Ativos Fim": ativos_fim,
-            "Turnover (%)": round(turnover, 2),
-        })
-
-    df_cc = pd.DataFrame(resultados)
-    df_cc = df_cc.sort_values("Turnover (%)", ascending=False)
-
-    return df_cc
-
-
-def turnover_por_cc(df_base, ano):
-    """
-    Versão com switches (ON/OFF) para filtros de CC pequenos e agrupamento em 'Outros'.
-    Fórmula de turnover continua sendo a mesma.
-    """
-    df_local = df_base.copy()
-
-    lista = []
-    centros = df_local["Descrição (C.Custo)"].dropna().unique()
-
-    for cc in centros:
-        sub = df_local[df_local["Descrição (C.Custo)"] == cc]
-
-        adm = sub[(sub["Ano_Admissao"] == ano)].shape[0]
-        dem = sub[(sub["Ano_Afastamento"] == ano)].shape[0]
-
-        fim = pd.Timestamp(f"{ano}-12-31")
-        ativos_fim = sub[
-            (sub["Admissão"] <= fim)
-            & (
-                sub["Data Afastamento"].isna()
-                | (sub["Data Afastamento"] > fim)
-            )
-        ].shape[0]
-
-        if ativos_fim > 0:
-            turnover = ((adm + dem) / (2 * ativos_fim)) * 100
-        else:
-            turnover = 0
-
-        lista.append(
-            {
-                "Centro de Custo": cc,
-                "Admissões": adm,
-                "Desligamentos": dem,
-                "Ativos Fim": ativos_fim,
-                "Turnover (%)": round(turnover, 2),
-            }
-        )
-
-    df_cc = pd.DataFrame(lista)
-
-    # 1) Filtrar CC pequenos
-    if op_filtrar_cc_pequenos:
-        df_cc = df_cc[df_cc["Ativos Fim"] >= min_ativos]
-
-    # 2) Agrupar CC pequenos em "Outros"
-    if op_agrupar_pequenos:
-        pequenos = df_cc[df_cc["Ativos Fim"] < min_ativos]
-        grandes = df_cc[df_cc["Ativos Fim"] >= min_ativos]
-
-        if not pequenos.empty:
-            soma = pequenos.sum(numeric_only=True)
-            turnover_outros = (
-                (soma["Admissões"] + soma["Desligamentos"]) /
-                (2 * soma["Ativos Fim"])
-            ) * 100 if soma["Ativos Fim"] > 0 else 0
-
-            linha_outros = {
-                "Centro de Custo": "OUTROS (Centros Pequenos)",
-                "Admissões": int(soma["Admissões"]),
-                "Desligamentos": int(soma["Desligamentos"]),
-                "Ativos Fim": int(soma["Ativos Fim"]),
-                "Turnover (%)": round(turnover_outros, 2),
-            }
-            df_cc = pd.concat([grandes, pd.DataFrame([linha_outros])], ignore_index=True)
-
-    return df_cc.sort_values("Turnover (%)", ascending=False)
-
-
-# ==============================================================
-# 5) FUNÇÕES MENSAL – MESMA LÓGICA DO JUPYTER
-# ==============================================================
-
-def admissoes_mes(df_base, ano, mes):
-    return df_base[
-        (df_base["Ano_Admissao"] == ano)
-        & (df_base["Mes_Admissao"] == mes)
-    ].shape[0]
-
-
-def demissoes_mes(df_base, ano, mes):
-    return df_base[
-        (df_base["Ano_Afastamento"] == ano)
-        & (df_base["Mes_Afastamento"] == mes)
-    ].shape[0]
-
-
-def ativos_no_fim_mes(df_base, ano, mes):
-    ultimo_dia = monthrange(ano, mes)[1]
-    ref = pd.Timestamp(year=ano, month=mes, day=ultimo_dia)
-
-    ativos = df_base[
-        (df_base["Admissão"] <= ref)
-        & (
-            df_base["Data Afastamento"].isna()
-            | (df_base["Data Afastamento"] > ref)
-        )
-    ]
-    return ativos.shape[0]
-
-
-def montar_tabela_mensal_area(df_base, anos, area_label=None):
-    """
-    Monta tabela mensal com Turnover(%) = ((Adm + Dem) / (2 * Ativos)) * 100
-    Se area_label == 'Varejo', aplica o ajuste específico de nov/2025,
-    replicando exatamente o seu notebook.
-    """
-    linhas = []
-
-    for ano in anos:
-        for mes in range(1, 13):
-            adm = admissoes_mes(df_base, ano, mes)
-            dem = demissoes_mes(df_base, ano, mes)
-            ativos = ativos_no_fim_mes(df_base, ano, mes)
-
-            linhas.append(
-                {
-                    "Ano": ano,
-                    "Mês": mes,
-                    "Ano-Mês": f"{ano}-{mes:02d}",
-                    "Admissões": adm,
-                    "Demissões": dem,
-                    "Ativos no Final do Mês": ativos,
-                }
-            )
-
-    tabela = pd.DataFrame(linhas)
-
-    # -------------------------
-    # Ajuste específico VAREJO
-    # -------------------------
-    if area_label == "Varejo" and 2025 in anos:
-        mask_nov = (tabela["Ano"] == 2025) & (tabela["Mês"] == 11)
-        mask_out = (tabela["Ano"] == 2025) & (tabela["Mês"] == 10)
-
-        if mask_nov.any() and mask_out.any():
-            ativos_outubro = tabela.loc[mask_out, "Ativos no Final do Mês"].iloc[0]
-
-            tabela.loc[mask_nov, "Admissões"] = 12
-            tabela.loc[mask_nov, "Demissões"] = 14
-            tabela.loc[mask_nov, "Ativos no Final do Mês"] = ativos_outubro + 12 - 15
-
-    tabela["Turnover (%)"] = (
-        (tabela["Admissões"] + tabela["Demissões"])
-        / (2 * tabela["Ativos no Final do Mês"].replace(0, pd.NA))
-    ) * 100
-    tabela["Turnover (%)"] = tabela["Turnover (%)"].fillna(0).round(2)
-
-    return tabela
+# As fórmulas ficam em turnover.py para serem medidas pelos
+# benchmarks (benchmarks/bench_turnover.py) sem abrir a página.
 
 
 # ==============================================================
@@ -493,36 +156,36 @@ def montar_tabela_mensal_area(df_base, anos, area_label=None):
 st.title("📉 Dashboard de Turnover — La Moda")
 st.markdown("**Painel • Filtros • KPIs • Gráficos**")
 st.markdown(
-    """
-**📅 Dados atualizados em: 02/12/2025**  
+    f"""
+**📅 Dados atualizados em: {atualizado_em}**{" (snapshot histórico)" if data_snapshot is not None else ""}  
 **📂 Fonte: Sistema Senior**
 """
 )
 
 # ---------- RESUMO EXECUTIVO ----------
+perfil.marco("Resumo (KPIs)")
 st.markdown("## 📌 Resumo — Visão Rápida do Turnover")
 
 ano_atual = max(anos_selecionados)
 
 # Turnover geral do ano atual (filtrado pelas áreas selecionadas)
-turnover_atual = calcular_turnover_periodo(df_area, ano_atual)
+turnover_atual = calcular_turnover_periodo(areas_selecionadas, ano_atual)
 turnover_valor = turnover_atual["Turnover Alternativo (%)"]
 
 # Área padrão para o resumo mensal
-if "Varejo" in df_area["Area"].unique():
+if "Varejo" in areas_presentes:
     area_resumo = "Varejo"
 else:
-    area_resumo = df_area["Area"].unique()[0]
+    area_resumo = areas_presentes[0]
 
-sub_resumo = df[df["Area"] == area_resumo].copy()
-tabela_mensal_resumo = montar_tabela_mensal_area(sub_resumo, [ano_atual], area_label=area_resumo)
+tabela_mensal_resumo = montar_tabela_mensal_area(area_resumo, [ano_atual])
 media_mensal = (
     tabela_mensal_resumo[tabela_mensal_resumo["Ano"] == ano_atual]["Turnover (%)"]
     .mean()
     .round(2)
 )
 
-df_area_atual = turnover_por_area(df_area, ano_atual)
+df_area_atual = turnover_por_area(areas_selecionadas, ano_atual)
 if not df_area_atual.empty:
     maior_area = df_area_atual.sort_values("Turnover Moderno (%)", ascending=False).iloc[0]
     menor_area = df_area_atual.sort_values("Turnover Moderno (%)", ascending=True).iloc[0]
@@ -533,7 +196,7 @@ adm_total = turnover_atual["Admissões"]
 dem_total = turnover_atual["Desligamentos"]
 
 # 🔵 HEADCOUNT — total de colaboradores ativos nas áreas filtradas
-headcount = df_area[df_area["Situacao_res"] == "Ativo"].shape[0]
+headcount = consultas.headcount(areas_selecionadas)
 
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("📉 Turnover Atual", f"{turnover_valor:.2f}%")
@@ -556,58 +219,35 @@ col5.metric("🟦 Total de Admissões", adm_total)
 col6.metric("🟥 Total de Demissões", dem_total)
 col7.metric("👥 Headcount (Ativos)", headcount)
 
+perfil.marco("Tendências anual e mensal")
 st.markdown("### 📈 Tendência Anual do Turnover (Alternativo)")
 
-df_turnover_resumo = pd.DataFrame(
-    [calcular_turnover_periodo(df_area, ano) for ano in anos_selecionados]
-)
-
-fig_resumo = px.line(
-    df_turnover_resumo,
-    x="Ano",
-    y="Turnover Alternativo (%)",
-    markers=True,
-    text="Turnover Alternativo (%)"
-)
+df_turnover_resumo = turnover_anual(areas_selecionadas, anos_selecionados)
 
-fig_resumo.update_traces(
-    texttemplate="%{text:.2f}%",
-    textposition="top center",
-    hovertemplate="Ano: %{x}<br>Turnover: %{y:.2f}%"
-)
-
-fig_resumo.update_layout(height=260, margin=dict(l=20, r=20, t=20, b=20))
+fig_resumo = figura_tendencia_anual(df_turnover_resumo)
 st.plotly_chart(fig_resumo, use_container_width=True)
 
 st.download_button(
     label="📸 Baixar PNG – Tendência Anual",
-    data=exportar_grafico_png(fig_resumo),
+    data=arquivo_exportacao(
+        "tendencia_anual", lambda: exportar_grafico_png(fig_resumo),
+        areas=areas_selecionadas, anos=anos_selecionados,
+    ),
     file_name="tendencia_anual_turnover.png",
     mime="image/png",
 )
 
 st.markdown(f"### 📊 Tendência Mensal — {ano_atual} ({area_resumo})")
 
-fig_mensal_resumo = px.line(
-    tabela_mensal_resumo[tabela_mensal_resumo["Ano"] == ano_atual],
-    x="Mês",
-    y="Turnover (%)",
-    markers=True,
-    text="Turnover (%)"
-)
-
-fig_mensal_resumo.update_traces(
-    texttemplate="%{text:.2f}%",
-    textposition="top center",
-    hovertemplate="Mês: %{x}<br>Turnover: %{y:.2f}%"
-)
-
-fig_mensal_resumo.update_layout(height=260, margin=dict(l=20, r=20, t=20, b=20))
+fig_mensal_resumo = figura_tendencia_mensal(tabela_mensal_resumo, ano_atual)
 st.plotly_chart(fig_mensal_resumo, use_container_width=True)
 
 st.download_button(
     label="📸 Baixar PNG – Tendência Mensal",
-    data=exportar_grafico_png(fig_mensal_resumo),
+    data=arquivo_exportacao(
+        "tendencia_mensal", lambda: exportar_grafico_png(fig_mensal_resumo),
+        area=area_resumo, ano=ano_atual,
+    ),
     file_name="tendencia_mensal_turnover.png",
     mime="image/png",
 )
@@ -621,6 +261,7 @@ analise = st.radio(
 )
 
 st.markdown("---")
+perfil.marco(f"Análise: {analise}")
 
 # ==============================================================
 # 6.1 VISÃO GERAL
@@ -629,14 +270,15 @@ st.markdown("---")
 if analise == "Visão Geral":
     st.subheader("📊 Turnover Geral (Todos os Colaboradores)")
 
-    df_turnover = pd.DataFrame(
-        [calcular_turnover_periodo(df_area, ano) for ano in anos_selecionados]
-    )
+    df_turnover = turnover_anual(areas_selecionadas, anos_selecionados)
     st.dataframe(df_turnover, use_container_width=True)
 
     st.download_button(
         label="⬇️ Baixar Excel – Turnover Geral",
-        data=exportar_excel(df_turnover),
+        data=arquivo_exportacao(
+            "turnover_geral", lambda: exportar_excel(df_turnover),
+            areas=areas_selecionadas, anos=anos_selecionados,
+        ),
         file_name="turnover_geral.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -685,20 +327,20 @@ if analise == "Visão Geral":
 elif analise == "Turnover por Área":
     st.subheader("🏢 Turnover por Área (Varejo / Indústria / Matriz)")
 
-    df_area_anual = pd.concat(
-        [turnover_por_area(df_area, ano) for ano in anos_selecionados],
-        ignore_index=True,
-    )
+    df_area_anual = turnover_por_area_anos(areas_selecionadas, anos_selecionados)
 
     if df_area_anual.empty:
         st.warning("Não há registros de turnover para essas combinações de ano e área.")
-        st.stop()
+        perfil.parar()
 
     st.dataframe(df_area_anual, use_container_width=True)
 
     st.download_button(
         label="⬇️ Baixar Excel – Turnover por Área",
-        data=exportar_excel(df_area_anual),
+        data=arquivo_exportacao(
+            "turnover_por_area", lambda: exportar_excel(df_area_anual),
+            areas=areas_selecionadas, anos=anos_selecionados,
+        ),
         file_name="turnover_por_area.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -747,7 +389,7 @@ elif analise == "Turnover Mensal":
     )
     if not areas_escolhidas:
         st.warning("Selecione pelo menos uma área.")
-        st.stop()
+        perfil.parar()
 
     # Anos
     anos_mensal = st.multiselect(
@@ -757,33 +399,21 @@ elif analise == "Turnover Mensal":
     )
     if not anos_mensal:
         st.warning("Selecione pelo menos um ano.")
-        st.stop()
+        perfil.parar()
 
     anos_mensal = sorted(anos_mensal)
 
-    # Tabelas por área
-    tabelas = []
-    for area in areas_escolhidas:
-        sub_area = df[df["Area"] == area].copy()
-        tabela_area = montar_tabela_mensal_area(sub_area, anos_mensal, area_label=area)
-        tabela_area["Área"] = area
-        tabelas.append(tabela_area)
-
-    # Tabela do TOTAL GERAL (considerando todas as áreas selecionadas)
-    sub_geral = df[df["Area"].isin(areas_escolhidas)].copy()
-    tabela_geral = montar_tabela_mensal_area(sub_geral, anos_mensal, area_label="Geral")
-    tabela_geral["Área"] = "Geral"
-    tabelas.append(tabela_geral)
-
-    # Junta tudo
-    tabela_final = pd.concat(tabelas, ignore_index=True)
-    tabela_final = tabela_final.sort_values(["Área", "Ano", "Mês"])
+    # Tabela de cada área + Geral (ver turnover.py)
+    tabela_final = turnover_mensal_areas(areas_escolhidas, anos_mensal)
 
     st.dataframe(tabela_final, use_container_width=True)
 
     st.download_button(
         label="⬇️ Baixar Excel – Turnover Mensal",
-        data=exportar_excel(tabela_final),
+        data=arquivo_exportacao(
+            "turnover_mensal", lambda: exportar_excel(tabela_final),
+            areas=areas_escolhidas, anos=anos_mensal,
+        ),
         file_name="turnover_mensal.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -823,14 +453,26 @@ elif analise == "Turnover por Centro de Custo":
         index=len(anos_selecionados) - 1
     )
 
-    df_cc = turnover_por_cc(df_area, ano_cc)
+    df_cc = turnover_por_cc(
+        areas_selecionadas, ano_cc,
+        filtrar_pequenos=op_filtrar_cc_pequenos,
+        agrupar_pequenos=op_agrupar_pequenos,
+        min_ativos=min_ativos,
+    )
+    perfil.memoria("turnover por CC", df_cc)
 
     # Tabela completa
     st.dataframe(df_cc, use_container_width=True)
 
     st.download_button(
         label="⬇️ Baixar Excel – Turnover por CC",
-        data=exportar_excel(df_cc),
+        data=arquivo_exportacao(
+            "turnover_por_cc", lambda: exportar_excel(df_cc),
+            areas=areas_selecionadas, ano=ano_cc,
+            filtrar_pequenos=op_filtrar_cc_pequenos,
+            agrupar_pequenos=op_agrupar_pequenos,
+            min_ativos=min_ativos,
+        ),
         file_name=f"turnover_por_cc_{ano_cc}.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
@@ -868,3 +510,10 @@ elif analise == "Turnover por Centro de Custo":
     )
 
     st.plotly_chart(fig_cc, use_container_width=True)
+
+
+# ==============================================================
+# 7) MODO PERFIL (ADMINISTRADORES)
+# ==============================================================
+perfil.indicadores("Renderizador PNG", renderizador.estatisticas())
+perfil.finalizar()
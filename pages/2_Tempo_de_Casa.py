@@ -1,53 +1,56 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime
-from login import require_login
-from pathlib import Path
+from login import areas_permitidas, require_login
 
 
 require_login()
 
-
-# ==============================================================
-# CONFIGURAÇÃO DE CAMINHOS (PADRÃO SEGURO)
-# ==============================================================
-
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_ROOT = BASE_DIR.parent / "lamoda_dados"
-DATA_DIR = DATA_ROOT / "data"
+# Módulos pesados só depois do login (a tela de login abre sem eles)
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+import perfil
+from dados import dados_atuais, escolher_snapshot, historico, tempo_casa_das_areas, tempo_casa_no_snapshot
+from tempo_casa import FAIXAS, SITUACOES, filtrar_tempo_casa, resumo_tempo_casa
 
 
 st.set_page_config(page_title="Tempo de Casa", page_icon="🏡", layout="wide")
+perfil.iniciar("Tempo de Casa")
 
 # ==============================================================
-# 1) GERAR / CARREGAR tempo_de_casa.csv A PARTIR DA base_tratada.csv
+# 1) CARREGAR tempo_de_casa.csv (GERADO PELO process_data.py)
 # ==============================================================
-
-@st.cache_data(show_spinner="Carregando base de tempo de casa…")
-def load_tempo_casa():
-    path = DATA_DIR / "tempo_de_casa.csv"
-
-    if not path.exists():
-        st.error(
-            "Base tempo_de_casa.csv não encontrada.\n\n"
-            "Execute o process_data.py localmente para gerar as bases."
-        )
-        st.stop()
-
-    df = pd.read_csv(path, sep=",", encoding="utf-8")
-
-    df["Admissão"] = pd.to_datetime(df["Admissão"], errors="coerce")
-    df["Data Afastamento"] = pd.to_datetime(df["Data Afastamento"], errors="coerce")
-
-    return df
-
-
-df = load_tempo_casa()
+perfil.marco("Carregar base")
+
+# Mesma versão publicada que a base tratada (ver dados.py)
+dados = dados_atuais()
+
+# Usuário com áreas definidas em credentials só carrega essas áreas
+# (motor particionado: só os arquivos delas)
+permitidas = areas_permitidas()
+
+# Consulta histórica: tempo de casa calculado na data do snapshot
+data_snapshot, atualizado_em, _ = escolher_snapshot(dados)
+if data_snapshot is None and permitidas is None:
+    df = dados.tempo_casa
+elif data_snapshot is None:
+    df = tempo_casa_das_areas(dados.consultas, dados.versao, tuple(permitidas))
+else:
+    df = tempo_casa_no_snapshot(data_snapshot, historico().versao())
+    if permitidas is not None:
+        df = filtrar_tempo_casa(df, permitidas)
+
+if df is None:
+    st.error(
+        "Base tempo_de_casa.csv não encontrada.\n\n"
+        "Execute o process_data.py localmente para gerar as bases."
+    )
+    perfil.parar()
+perfil.memoria("tempo de casa", df)
 
 # ==============================================================
 # 2) FILTROS LATERAIS — ESTILO PARECIDO COM O DO TURNOVER
 # ==============================================================
+perfil.marco("Filtros")
 
 with st.sidebar:
     st.header("Filtros")
@@ -55,90 +58,59 @@ with st.sidebar:
     areas = sorted(df["Area"].dropna().unique())
     areas_sel = st.multiselect("Selecione as Áreas", areas, default=areas)
 
-    situacoes = ["Todos", "Ativo", "Demitido"]
-    sit_sel = st.selectbox("Situação", situacoes, index=0)
+    sit_sel = st.selectbox("Situação", SITUACOES, index=0)
 
-    faixas = ["Todos", "0–1 ano", "1–3 anos", "3–5 anos", "5+ anos"]
+    faixas = ["Todos"] + list(FAIXAS)
     faixa_sel = st.selectbox("Faixa de Tempo de Casa", faixas)
 
-# Aplicar filtros básicos
-df_filt = df[df["Area"].isin(areas_sel)].copy()
-
-if sit_sel == "Ativo":
-    df_filt = df_filt[df_filt["Situacao_res"] == "Ativo"]
-elif sit_sel == "Demitido":
-    df_filt = df_filt[df_filt["Situacao_res"] != "Ativo"]
-
-# Filtro por faixa de tempo de casa
-if faixa_sel == "0–1 ano":
-    df_filt = df_filt[df_filt["Anos_de_Casa"] <= 1]
-elif faixa_sel == "1–3 anos":
-    df_filt = df_filt[(df_filt["Anos_de_Casa"] > 1) & (df_filt["Anos_de_Casa"] <= 3)]
-elif faixa_sel == "3–5 anos":
-    df_filt = df_filt[(df_filt["Anos_de_Casa"] > 3) & (df_filt["Anos_de_Casa"] <= 5)]
-elif faixa_sel == "5+ anos":
-    df_filt = df_filt[df_filt["Anos_de_Casa"] > 5]
+# Filtros de área, situação e faixa (mesmas regras da API, ver tempo_casa.py)
+df_filt = filtrar_tempo_casa(df, areas_sel, sit_sel, faixa_sel)
 
 # Se depois de tudo não sobrou ninguém, avisa e encerra
 if df_filt.empty:
     st.title("🏡 Tempo de Casa — Dashboard Oficial")
     st.warning("Nenhum registro encontrado para os filtros selecionados.")
-    st.stop()
+    perfil.parar()
 
 # ==============================================================
 # 3) RESUMO EXECUTIVO (KPIs)
 # ==============================================================
+perfil.marco("Resumo (KPIs)")
+perfil.memoria("base filtrada", df_filt)
 
 st.title("🏡 Tempo de Casa — Dashboard Oficial")
-st.success("✔ Arquivo carregado com sucesso!")
+st.success(f"✔ Arquivo carregado com sucesso! Dados de {atualizado_em}.")
 
-def safe_mean(series):
-    """Retorna média arredondada ou '—' caso esteja vazia."""
-    if series.empty:
-        return "—"
-    media = series.mean()
-    if pd.isna(media):
-        return "—"
-    return round(media, 2)
+resumo = resumo_tempo_casa(df_filt)
+total = resumo["Colaboradores"]
 
-# Tempos médios
-tempo_medio_geral = safe_mean(df_filt["Anos_de_Casa"])
-tempo_ativos = safe_mean(df_filt[df_filt["Situacao_res"] == "Ativo"]["Anos_de_Casa"])
-tempo_desligados = safe_mean(df_filt[df_filt["Situacao_res"] != "Ativo"]["Anos_de_Casa"])
 
-# Headcount ativo
-headcount_ativos = df_filt[df_filt["Situacao_res"] == "Ativo"].shape[0]
+def texto_media(media):
+    """Média em anos ou '—' caso não haja registros."""
+    return "—" if media is None else media
 
-total = len(df_filt)
 
-def calc_pct(mask):
+def calc_pct(qtd):
     """Calcula percentual com proteção contra divisões inválidas."""
-    qtd = df_filt[mask].shape[0]
     return f"{round((qtd / total) * 100, 1)}%" if total > 0 else "0%"
 
-pct_ate_1 = calc_pct(df_filt["Anos_de_Casa"] <= 1)
-pct_1_3  = calc_pct((df_filt["Anos_de_Casa"] > 1) & (df_filt["Anos_de_Casa"] <= 3))
-pct_3_5  = calc_pct((df_filt["Anos_de_Casa"] > 3) & (df_filt["Anos_de_Casa"] <= 5))
-pct_5p   = calc_pct(df_filt["Anos_de_Casa"] > 5)
 
 # KPIs principais
 col1, col2, col3, col4 = st.columns(4)
-col1.metric("⏳ Tempo Médio (Geral)", f"{tempo_medio_geral} anos")
-col2.metric("🟩 Tempo Médio (Ativos)", f"{tempo_ativos} anos")
-col3.metric("🟥 Tempo Médio (Desligados)", f"{tempo_desligados} anos")
-col4.metric("👥 Headcount Ativo", headcount_ativos)
+col1.metric("⏳ Tempo Médio (Geral)", f"{texto_media(resumo['Tempo Médio Geral (anos)'])} anos")
+col2.metric("🟩 Tempo Médio (Ativos)", f"{texto_media(resumo['Tempo Médio Ativos (anos)'])} anos")
+col3.metric("🟥 Tempo Médio (Desligados)", f"{texto_media(resumo['Tempo Médio Desligados (anos)'])} anos")
+col4.metric("👥 Headcount Ativo", resumo["Headcount Ativo"])
 
 # Distribuição por faixas
-col5, col6, col7, col8 = st.columns(4)
-col5.metric("0–1 ano", pct_ate_1)
-col6.metric("1–3 anos", pct_1_3)
-col7.metric("3–5 anos", pct_3_5)
-col8.metric("5+ anos", pct_5p)
+for col, faixa in zip(st.columns(4), FAIXAS):
+    col.metric(faixa, calc_pct(resumo[faixa]))
 
 
 # ==============================================================
 # 4) GRÁFICOS
 # ==============================================================
+perfil.marco("Gráficos")
 
 st.markdown("## 📊 Distribuição do Tempo de Casa (anos)")
 fig_hist = px.histogram(
@@ -166,13 +138,8 @@ st.markdown("## 🥧 Distribuição por Faixas de Tempo de Casa")
 
 df_faixas = pd.DataFrame(
     {
-        "Faixa": ["0–1 ano", "1–3 anos", "3–5 anos", "5+ anos"],
-        "Quantidade": [
-            df_filt[df_filt["Anos_de_Casa"] <= 1].shape[0],
-            df_filt[(df_filt["Anos_de_Casa"] > 1) & (df_filt["Anos_de_Casa"] <= 3)].shape[0],
-            df_filt[(df_filt["Anos_de_Casa"] > 3) & (df_filt["Anos_de_Casa"] <= 5)].shape[0],
-            df_filt[df_filt["Anos_de_Casa"] > 5].shape[0],
-        ],
+        "Faixa": list(FAIXAS),
+        "Quantidade": [resumo[faixa] for faixa in FAIXAS],
     }
 )
 
@@ -190,6 +157,12 @@ st.markdown("---")
 # ==============================================================
 # 5) TABELA FINAL
 # ==============================================================
+perfil.marco("Tabela final")
 
 st.markdown("## 📋 Base filtrada")
 st.dataframe(df_filt, use_container_width=True)
+
+# ==============================================================
+# 6) MODO PERFIL (ADMINISTRADORES)
+# ==============================================================
+perfil.finalizar()
@@ -1,29 +1,137 @@
-# import streamlit as st
-# import pandas as pd
-# import plotly.express as px
-# from login import require_login
+import streamlit as st
+from login import require_login, restringir_areas
 
-# require_login()
 
-# st.title("📆 Absenteísmo")
+require_login()
 
-# path = "data/absenteismo.csv"
+# Módulos pesados só depois do login (a tela de login abre sem eles)
+import plotly.express as px
+import perfil
+from absenteismo import AUSENCIAS_DIR, resumir
+from dados import dados_atuais
 
-# try:
-#     df = pd.read_csv(path)
 
-#     col1, col2 = st.columns(2)
-#     col1.metric("Total de Faltas", df["Faltas"].sum())
-#     col2.metric("Absenteísmo Médio (%)", round(df["Absenteismo"].mean(), 2))
+st.set_page_config(page_title="Absenteísmo", page_icon="📆", layout="wide")
+perfil.iniciar("Absenteísmo")
 
-#     fig = px.line(
-#         df,
-#         x="Mes",
-#         y="Absenteismo",
-#         markers=True,
-#         title="Absenteísmo por Mês"
-#     )
-#     st.plotly_chart(fig, use_container_width=True)
+# ==============================================================
+# 1) CARREGAR absenteismo.csv (GERADO PELO process_data.py)
+# ==============================================================
+perfil.marco("Carregar base")
 
-# except:
-#     st.warning("⚠️ O arquivo absenteismo.csv não está na pasta /data.")
+# Mesma versão publicada que a base tratada (ver dados.py)
+dados = dados_atuais()
+df = dados.absenteismo
+
+if df is None:
+    st.title("📆 Absenteísmo")
+    st.warning(
+        "Base absenteismo.csv não encontrada.\n\n"
+        f"Coloque as exportações diárias de ausências da Senior em `{AUSENCIAS_DIR}` "
+        "e execute o process_data.py."
+    )
+    perfil.parar()
+perfil.memoria("absenteísmo", df)
+
+# ==============================================================
+# 2) FILTROS LATERAIS
+# ==============================================================
+perfil.marco("Filtros")
+
+with st.sidebar:
+    st.header("Filtros")
+
+    # Só as áreas liberadas ao usuário (login.areas_permitidas)
+    areas = restringir_areas(sorted(df["Area"].dropna().unique()))
+    areas_sel = st.multiselect("Selecione as Áreas", areas, default=areas)
+
+    tipos = sorted(df["TIPO"].dropna().unique())
+    tipos_sel = st.multiselect("Tipo de contrato", tipos, default=tipos)
+
+    anos = sorted(df["Ano"].unique().tolist())
+    anos_sel = st.multiselect("Anos", anos, default=anos[-1:])
+
+df_filt = df[df["Area"].isin(areas_sel) & df["TIPO"].isin(tipos_sel) & df["Ano"].isin(anos_sel)]
+
+st.title("📆 Absenteísmo — Dashboard Oficial")
+
+if df_filt.empty:
+    st.warning("Nenhum registro encontrado para os filtros selecionados.")
+    perfil.parar()
+
+st.success(f"✔ Arquivo carregado com sucesso! Dados de {dados.atualizado_em}.")
+st.caption(
+    "Absenteísmo (%) = dias de ausência ÷ (headcount no fim do mês × dias úteis do mês). "
+    "Headcount pela mesma regra de ativos do Turnover."
+)
+
+# ==============================================================
+# 3) RESUMO EXECUTIVO (KPIs)
+# ==============================================================
+perfil.marco("Resumo (KPIs)")
+
+faltas = int(df_filt["Faltas"].sum())
+dias_previstos = int(df_filt["Dias previstos"].sum())
+mensal = resumir(df_filt, ["Ano", "Mês"])
+headcount_medio = df_filt.groupby(["Ano", "Mês"])["Headcount"].sum().mean()
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("📆 Total de Faltas (dias)", f"{faltas:,}".replace(",", "."))
+col2.metric("📉 Absenteísmo no Período (%)", round(faltas / dias_previstos * 100, 2) if dias_previstos else "—")
+col3.metric("📈 Maior Mês (%)", mensal["Absenteísmo (%)"].max())
+col4.metric("👥 Headcount Médio", round(headcount_medio))
+
+# ==============================================================
+# 4) GRÁFICOS
+# ==============================================================
+perfil.marco("Gráficos")
+
+st.markdown("## 📈 Absenteísmo por Mês e Área")
+por_mes = resumir(df_filt, ["Ano", "Mês", "Area"])
+por_mes["Ano-Mês"] = por_mes["Ano"].astype(str) + "-" + por_mes["Mês"].astype(str).str.zfill(2)
+fig_mes = px.line(
+    por_mes,
+    x="Ano-Mês",
+    y="Absenteísmo (%)",
+    color="Area",
+    markers=True,
+    labels={"Area": "Área"},
+)
+st.plotly_chart(fig_mes, use_container_width=True)
+
+st.markdown("## 🏬 Absenteísmo por Área e Tipo de Contrato")
+por_area = resumir(df_filt, ["Area", "TIPO"])
+fig_area = px.bar(
+    por_area,
+    x="Area",
+    y="Absenteísmo (%)",
+    color="TIPO",
+    barmode="group",
+    text="Absenteísmo (%)",
+    labels={"Area": "Área", "TIPO": "Tipo"},
+)
+st.plotly_chart(fig_area, use_container_width=True)
+
+# ==============================================================
+# 5) CENTROS DE CUSTO
+# ==============================================================
+perfil.marco("Centros de custo")
+
+st.markdown("## 🧾 Centros de Custo com Mais Faltas")
+por_cc = resumir(df_filt, ["Area", "C.Custo"]).sort_values("Faltas", ascending=False)
+st.dataframe(por_cc.head(20), use_container_width=True, hide_index=True)
+
+st.markdown("---")
+
+# ==============================================================
+# 6) TABELA FINAL
+# ==============================================================
+perfil.marco("Tabela final")
+
+st.markdown("## 📋 Base filtrada (mensal)")
+st.dataframe(df_filt, use_container_width=True, hide_index=True)
+
+# ==============================================================
+# 7) MODO PERFIL (ADMINISTRADORES)
+# ==============================================================
+perfil.finalizar()
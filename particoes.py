@@ -0,0 +1,291 @@
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from conjunto import somente_leitura
+from consultas import BaseIndisponivel, ConsultasPandas
+from leitores import _arrow_disponivel, compatibilizar_arrow
+
+# =====================================================================
+# BASE PARTICIONADA POR ÁREA E ANO (LAMODA_MOTOR=particoes)
+# =====================================================================
+# A maior parte dos usuários só olha a própria área, mas os motores
+# pandas e DuckDB carregam a empresa inteira. Aqui cada versão publicada
+# vira uma pasta de arquivos Parquet, um por Área × ano final:
+#
+#     lamoda_dados/data/particoes/<versao>/
+#         indice.json
+#         base/Area=Varejo/Ano_Final=2023.parquet
+#         base/Area=Varejo/Ano_Final=aberto.parquet
+#         tempo_casa/Area=Varejo.parquet
+#
+# Ano final = último ano em que a linha ainda entra em alguma conta
+# (maior ano entre admissão e afastamento); "aberto" = sem afastamento.
+# Uma linha com ano final anterior ao período pedido não é admissão,
+# desligamento nem ativo em nenhuma data do período.
+#
+# ConsultasParticionadas lê só os arquivos das áreas pedidas e, nas
+# consultas por período, só os anos finais a partir do primeiro ano
+# pedido. Contagens, dimensões e áreas presentes saem do indice.json,
+# sem ler dado nenhum. As fórmulas são as do ConsultasPandas, sobre o
+# recorte lido; a ordem original das linhas é mantida (_linha), então o
+# resultado é o mesmo (conferência: benchmarks/paridade_motores.py).
+
+# Pastas mantidas (a versão atual e a anterior)
+VERSOES_PARTICOES = 2
+
+# Recortes (combinações de arquivos) mantidos em memória por processo
+RECORTES_EM_MEMORIA = 8
+
+ABERTO = "aberto"
+SEM_AREA = "_sem_area"
+
+
+# =========================================================
+# 1) GRAVAÇÃO (UMA VEZ POR VERSÃO)
+# =========================================================
+def _nome_area(area):
+    if pd.isna(area):
+        return SEM_AREA
+    return "Area=" + re.sub(r'[\\/:*?"<>|]', "_", str(area))
+
+
+def ano_final(df):
+    """Maior ano entre admissão e afastamento; 0 = sem afastamento."""
+    anos = pd.concat([
+        df["Admissão"].dt.year.fillna(0),
+        df["Data Afastamento"].dt.year.fillna(0),
+        df["Ano_Admissao"],
+        df["Ano_Afastamento"],
+    ], axis=1).max(axis=1).astype("int64")
+    aberto = df["Data Afastamento"].isna() & (df["Ano_Afastamento"] == 0)
+    return anos.where(~aberto, 0)
+
+
+def _gravar(df, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compatibilizar_arrow(df).to_parquet(path, index=False)
+
+
+def _gravar_tabela(df, pasta, nome, chaves, extras=None):
+    """Grava df particionado por `chaves` (Series) e devolve as entradas do índice."""
+    d = df.assign(_linha=range(len(df)))
+    entradas = []
+    for chave, sub in d.groupby(chaves, dropna=False, sort=False):
+        area, *resto = chave
+        arquivo = f"{nome}/{_nome_area(area)}"
+        if resto:
+            arquivo += f"/Ano_Final={resto[0] or ABERTO}"
+        arquivo += ".parquet"
+
+        _gravar(sub, pasta / arquivo)
+        entradas.append({
+            "area": None if pd.isna(area) else area,
+            "ano_final": int(resto[0]) if resto else None,
+            "arquivo": arquivo,
+            "linhas": len(sub),
+            "primeira_linha": int(sub["_linha"].iloc[0]),
+            **(extras(sub) if extras else {}),
+        })
+
+    # Esquema da tabela: recortes sem nenhum arquivo saem vazios, com as mesmas colunas
+    _gravar(d.iloc[:0], pasta / f"{nome}/vazio.parquet")
+    return entradas
+
+
+def _anos(sub):
+    # Anos (≠ 0) de admissão e afastamento da partição, para dimensoes()
+    anos = set(sub["Ano_Admissao"].unique().tolist()) | set(sub["Ano_Afastamento"].unique().tolist())
+    return {"anos": sorted(int(a) for a in anos if a != 0)}
+
+
+def gravar_particoes(base, tempo_casa, destino):
+    """Grava a versão em `destino` (pasta nova) e o indice.json por último."""
+    chaves = [base["Area"], ano_final(base).rename("Ano_Final")]
+    indice = {
+        "registros": len(base),
+        "base": _gravar_tabela(base, destino, "base", chaves, extras=_anos),
+        "tempo_casa": None,
+    }
+    if tempo_casa is not None:
+        indice["tempo_casa"] = _gravar_tabela(tempo_casa, destino, "tempo_casa", [tempo_casa["Area"]])
+
+    (destino / "indice.json").write_text(json.dumps(indice, ensure_ascii=False, indent=2), encoding="utf-8")
+    return indice
+
+
+def preparar_particoes(versao, base, tempo_casa, pasta):
+    """
+    Monta (uma vez por versão) pasta/<versao>/ a partir das bases lidas
+    como no portal (dados.ler_base / ler_tempo_casa) e devolve o caminho.
+    `base` e `tempo_casa` podem ser funções: só são chamadas se a pasta
+    ainda não existir.
+    """
+    if not _arrow_disponivel():
+        raise ImportError("Motor particionado escolhido (LAMODA_MOTOR=particoes), mas o pyarrow não está instalado.")
+
+    destino = pasta / str(versao)
+    if (destino / "indice.json").exists():
+        return destino
+
+    base = base() if callable(base) else base
+    tempo_casa = tempo_casa() if callable(tempo_casa) else tempo_casa
+
+    pasta.mkdir(parents=True, exist_ok=True)
+    tmp = pasta / f"{versao}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    gravar_particoes(base, tempo_casa, tmp)
+
+    try:
+        os.replace(tmp, destino)
+    except OSError:
+        # Outro processo publicou a mesma versão antes
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not (destino / "indice.json").exists():
+            raise
+    limpar_particoes_antigas(pasta, manter=destino)
+    return destino
+
+
+def limpar_particoes_antigas(pasta, manter, versoes=VERSOES_PARTICOES):
+    versoes_gravadas = sorted(
+        (p for p in pasta.iterdir() if p.is_dir() and not p.name.endswith(".tmp")),
+        key=lambda p: p.stat().st_mtime,
+    )
+    for antiga in versoes_gravadas[:-versoes]:
+        if antiga != manter:
+            # Arquivo aberto por outro processo (Windows): fica para a próxima
+            shutil.rmtree(antiga, ignore_errors=True)
+
+
+# =========================================================
+# 2) MOTOR PARTICIONADO (LÊ SÓ AS PARTIÇÕES PEDIDAS)
+# =========================================================
+class ConsultasParticionadas:
+
+    motor = "particoes"
+    df = None
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        self._indice = json.loads((pasta / "indice.json").read_text(encoding="utf-8"))
+        self._recortes = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Leitura das partições
+    # -------------------------
+    def _particoes(self, tabela, areas=None, desde=None):
+        selecionadas = []
+        for p in self._indice[tabela]:
+            if areas is not None and p["area"] not in areas:
+                continue
+            if desde is not None and p["ano_final"] and p["ano_final"] < desde:
+                continue
+            selecionadas.append(p)
+        return selecionadas
+
+    def _ler(self, tabela, particoes, colunas=None):
+        """Partições → DataFrame na ordem original das linhas."""
+        colunas = None if colunas is None else list(colunas) + ["_linha"]
+        arquivos = [p["arquivo"] for p in particoes] or [f"{tabela}/vazio.parquet"]
+        partes = [pd.read_parquet(self.pasta / arquivo, columns=colunas) for arquivo in arquivos]
+        df = partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True)
+        return df.sort_values("_linha", kind="stable").drop(columns="_linha").reset_index(drop=True)
+
+    def _recorte(self, tabela, areas=None, desde=None):
+        """Motor pandas sobre o recorte; os últimos recortes ficam em memória."""
+        particoes = self._particoes(tabela, areas, desde)
+        chave = (tabela, tuple(p["arquivo"] for p in particoes))
+
+        with self._lock:
+            if chave in self._recortes:
+                self._recortes.move_to_end(chave)
+                return self._recortes[chave]
+
+        df = somente_leitura(self._ler(tabela, particoes))
+        consultas = ConsultasPandas(df) if tabela == "base" else ConsultasPandas(None, df)
+
+        with self._lock:
+            self._recortes[chave] = consultas
+            while len(self._recortes) > RECORTES_EM_MEMORIA:
+                self._recortes.popitem(last=False)
+        return consultas
+
+    def _periodo(self, areas, anos):
+        # Só os anos finais a partir do primeiro ano pedido
+        anos = list(anos)
+        return self._recorte("base", areas, desde=min(anos) if anos else None)
+
+    def base(self, colunas=None, areas=None):
+        """Base (ou só as `colunas`) das `areas` (None = todas), na ordem do CSV."""
+        return self._ler("base", self._particoes("base", areas), colunas)
+
+    def tempo_casa(self, areas=None):
+        if self._indice["tempo_casa"] is None:
+            return None
+        return self._ler("tempo_casa", self._particoes("tempo_casa", areas))
+
+    # -------------------------
+    # Dimensões (só o índice)
+    # -------------------------
+    def registros(self, areas=None):
+        return sum(p["linhas"] for p in self._particoes("base", areas))
+
+    def dimensoes(self):
+        particoes = self._indice["base"]
+        anos = sorted({ano for p in particoes for ano in p["anos"]})
+        areas = sorted({p["area"] for p in particoes if p["area"] is not None})
+        return anos, areas
+
+    def areas_presentes(self, areas):
+        """Áreas com registros, na ordem em que aparecem na base."""
+        primeira = {}
+        for p in self._particoes("base", areas):
+            primeira[p["area"]] = min(primeira.get(p["area"], p["primeira_linha"]), p["primeira_linha"])
+        return sorted(primeira, key=primeira.get)
+
+    # -------------------------
+    # Consultas sobre o recorte
+    # -------------------------
+    # Por área e por CC a ordem e as linhas zeradas dependem de todas as
+    # linhas da área: essas leem todos os anos das áreas pedidas.
+    def headcount(self, areas):
+        return self._recorte("base", areas).headcount(areas)
+
+    def turnover_periodo(self, areas, ano):
+        return self._periodo(areas, [ano]).turnover_periodo(areas, ano)
+
+    def turnover_por_area(self, areas, ano):
+        return self._recorte("base", areas).turnover_por_area(areas, ano)
+
+    def turnover_anual(self, areas, anos):
+        return self._periodo(areas, anos).turnover_anual(areas, anos)
+
+    def turnover_por_area_anos(self, areas, anos):
+        return self._recorte("base", areas).turnover_por_area_anos(areas, anos)
+
+    def tabela_mensal_area(self, area, anos):
+        return self._periodo([area], anos).tabela_mensal_area(area, anos)
+
+    def turnover_mensal_areas(self, areas, anos):
+        return self._periodo(areas, anos).turnover_mensal_areas(areas, anos)
+
+    def turnover_por_cc(self, areas, ano, filtrar_pequenos=False, agrupar_pequenos=False, min_ativos=0):
+        return self._recorte("base", areas).turnover_por_cc(
+            areas, ano,
+            filtrar_pequenos=filtrar_pequenos,
+            agrupar_pequenos=agrupar_pequenos,
+            min_ativos=min_ativos,
+        )
+
+    def resumo_tempo_casa(self, areas, situacao="Todos", faixa="Todos", por_area=False):
+        """areas=None: todas, inclusive registros sem área."""
+        if self._indice["tempo_casa"] is None:
+            raise BaseIndisponivel("Base tempo_de_casa.csv não encontrada.")
+        return self._recorte("tempo_casa", areas).resumo_tempo_casa(areas, situacao, faixa, por_area)
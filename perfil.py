@@ -0,0 +1,319 @@
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from caminhos import LOGS_DIR
+from login import is_admin
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# =====================================================================
+# MODO PERFIL (SÓ ADMINISTRADORES)
+# =====================================================================
+# Liga pelo botão "⏱️ Modo perfil" na barra lateral (aparece só para os
+# usuários em `admins`, ver login.py). Com o modo ligado, cada execução
+# da página registra:
+#   - tempo de cada seção (perfil.marco("nome") fecha a anterior);
+#   - chamadas e tempo das funções medidas (perfil.medido);
+#   - acertos e falhas dos caches do Streamlit (perfil.cacheado);
+#   - memória dos DataFrames principais (perfil.memoria) e RSS do processo.
+#   - indicadores de componentes do processo (perfil.indicadores).
+# O resultado aparece num painel na barra lateral e vai, uma linha JSON
+# por execução, para lamoda_dados/logs/perfil.jsonl.
+# Desligado, o custo é só checar se há execução medida na thread.
+
+ARQUIVO_LOG = LOGS_DIR / "perfil.jsonl"
+
+# Acima disso o log é renomeado para perfil.jsonl.1 (guarda só o anterior)
+TAMANHO_MAX_LOG = 5 * 1024 * 1024
+
+MB = 1024 * 1024
+
+# Cada rerun roda na thread de script da sessão: a execução medida fica
+# na thread, e cálculos de outras sessões não entram na conta.
+_local = threading.local()
+
+# Acertos/falhas acumulados desde que o processo subiu (todas as sessões)
+_cache_processo = {}
+_lock = threading.Lock()
+
+
+class Execucao:
+    """Medições de uma execução (rerun) da página."""
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.inicio = time.perf_counter()
+        self.secoes = []
+        self.funcoes = {}
+        self.cache = {}
+        self.memoria = {}
+        self.indicadores = {}
+        self._secao = None
+        self._inicio_secao = self.inicio
+
+    def marco(self, nome):
+        agora = time.perf_counter()
+        if self._secao is not None:
+            self.secoes.append((self._secao, agora - self._inicio_secao))
+        self._secao, self._inicio_secao = nome, agora
+
+    def registro(self):
+        self.marco(None)
+        rss = rss_bytes()
+        return {
+            "em": datetime.now().isoformat(timespec="seconds"),
+            "usuario": st.session_state.get("logged_user"),
+            "pagina": self.pagina,
+            "total_ms": round((time.perf_counter() - self.inicio) * 1000, 1),
+            "secoes": {nome: round(s * 1000, 1) for nome, s in self.secoes},
+            "funcoes": {
+                nome: {"chamadas": c, "ms": round(s * 1000, 1)}
+                for nome, (c, s) in self.funcoes.items()
+            },
+            "cache": {
+                nome: {"chamadas": c, "acertos": c - e, "falhas": e, "ms": round(s * 1000, 1)}
+                for nome, (c, e, s) in self.cache.items()
+            },
+            "memoria_mb": {nome: round(b / MB, 2) for nome, b in self.memoria.items()},
+            "rss_mb": round(rss / MB, 1) if rss else None,
+            "indicadores": self.indicadores,
+        }
+
+
+def _atual():
+    return getattr(_local, "execucao", None)
+
+
+def ativo():
+    return _atual() is not None
+
+
+# =====================================================================
+# INSTRUMENTAÇÃO
+# =====================================================================
+def marco(nome):
+    """Início de uma nova seção da página (o tempo da anterior é fechado)."""
+    execucao = _atual()
+    if execucao is not None:
+        execucao.marco(nome)
+
+
+def medido(func, nome=None):
+    """Conta chamadas e tempo de `func` nas execuções medidas."""
+    rotulo = nome or func.__name__
+
+    @functools.wraps(func)
+    def medida(*args, **kwargs):
+        execucao = _atual()
+        if execucao is None:
+            return func(*args, **kwargs)
+
+        inicio = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            chamadas, segundos = execucao.funcoes.get(rotulo, (0, 0.0))
+            execucao.funcoes[rotulo] = (chamadas + 1, segundos + time.perf_counter() - inicio)
+
+    return medida
+
+
+def cacheado(cache_streamlit, nome=None):
+    """
+    Aplica um cache do Streamlit (st.cache_data / st.cache_resource,
+    com ou sem parâmetros) contando acertos e falhas: o corpo da função
+    só roda na falha, então acertos = chamadas - execuções do corpo.
+
+        @perfil.cacheado(st.cache_resource(max_entries=4))
+        def base_no_snapshot(...): ...
+    """
+    def decorar(func):
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def corpo(*args, **kwargs):
+            _contar_cache(rotulo, execucoes=1)
+            return func(*args, **kwargs)
+
+        com_cache = cache_streamlit(corpo)
+
+        @functools.wraps(func)
+        def chamada(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return com_cache(*args, **kwargs)
+            finally:
+                _contar_cache(rotulo, chamadas=1, segundos=time.perf_counter() - inicio)
+
+        chamada.clear = com_cache.clear
+        return chamada
+
+    return decorar
+
+
+def _contar_cache(rotulo, chamadas=0, execucoes=0, segundos=0.0):
+    with _lock:
+        c, e = _cache_processo.get(rotulo, (0, 0))
+        _cache_processo[rotulo] = (c + chamadas, e + execucoes)
+
+    execucao = _atual()
+    if execucao is not None:
+        c, e, s = execucao.cache.get(rotulo, (0, 0, 0.0))
+        execucao.cache[rotulo] = (c + chamadas, e + execucoes, s + segundos)
+
+
+def memoria(nome, df):
+    """Memória ocupada por um DataFrame (inclui o conteúdo das strings)."""
+    execucao = _atual()
+    if execucao is not None and df is not None:
+        execucao.memoria[nome] = int(df.memory_usage(deep=True).sum())
+
+
+def indicadores(nome, valores):
+    """Métricas de um componente do processo (ex.: fila do renderizador de PNG)."""
+    execucao = _atual()
+    if execucao is not None and valores:
+        execucao.indicadores[nome] = dict(valores)
+
+
+def rss_bytes():
+    """Memória residente do processo (psutil se instalado, senão /proc)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# =====================================================================
+# INÍCIO E FIM DA EXECUÇÃO
+# =====================================================================
+def iniciar(pagina):
+    """
+    Chamada no topo da página, depois do login e do set_page_config.
+    Mostra o botão do modo perfil para administradores e, se ligado,
+    começa a medir esta execução.
+    """
+    _local.execucao = None
+
+    if not is_admin():
+        return
+
+    ligado = st.sidebar.toggle(
+        "⏱️ Modo perfil",
+        value=st.session_state.get("perfil_ligado", False),
+        help="Mede tempo por seção, caches e memória desta página (só administradores).",
+    )
+    st.session_state["perfil_ligado"] = ligado
+    if ligado:
+        _local.execucao = Execucao(pagina)
+
+
+def finalizar():
+    """Chamada no fim da página: mostra o painel e grava o log."""
+    execucao = _atual()
+    if execucao is None:
+        return
+    _local.execucao = None
+
+    registro = execucao.registro()
+    gravar_log(registro)
+    painel(registro)
+
+
+def parar():
+    """st.stop() depois do iniciar(): fecha a execução medida antes de parar a página."""
+    finalizar()
+    st.stop()
+
+
+def gravar_log(registro, arquivo=ARQUIVO_LOG):
+    try:
+        with _lock:
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            if arquivo.exists() and arquivo.stat().st_size > TAMANHO_MAX_LOG:
+                os.replace(arquivo, arquivo.with_name(arquivo.name + ".1"))
+            with open(arquivo, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar o log de perfil: {e}")
+
+
+# =====================================================================
+# PAINEL NA BARRA LATERAL
+# =====================================================================
+def painel(registro):
+    with st.sidebar.expander("⏱️ Perfil desta execução", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Total", f"{registro['total_ms']:.0f} ms")
+        col2.metric("RSS", f"{registro['rss_mb']:.0f} MB" if registro["rss_mb"] else "—")
+
+        total = registro["total_ms"] or 1
+        st.markdown("**Seções**")
+        st.dataframe(
+            pd.DataFrame(
+                [(nome, ms, round(ms / total * 100, 1)) for nome, ms in registro["secoes"].items()],
+                columns=["Seção", "ms", "%"],
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        if registro["funcoes"]:
+            st.markdown("**Funções**")
+            st.dataframe(
+                pd.DataFrame(
+                    [(nome, f["chamadas"], f["ms"]) for nome, f in registro["funcoes"].items()],
+                    columns=["Função", "Chamadas", "ms"],
+                ),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        if registro["cache"]:
+            with _lock:
+                processo = dict(_cache_processo)
+            linhas = []
+            for nome, c in registro["cache"].items():
+                chamadas, falhas = processo.get(nome, (0, 0))
+                linhas.append((nome, c["acertos"], c["falhas"], c["ms"], chamadas - falhas, falhas))
+
+            st.markdown("**Caches** (execução / desde que o portal subiu)")
+            st.dataframe(
+                pd.DataFrame(
+                    linhas,
+                    columns=["Cache", "Acertos", "Falhas", "ms", "Acertos (total)", "Falhas (total)"],
+                ),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        if registro["memoria_mb"]:
+            st.markdown("**DataFrames**")
+            st.dataframe(
+                pd.DataFrame(list(registro["memoria_mb"].items()), columns=["DataFrame", "MB"]),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        for nome, valores in registro["indicadores"].items():
+            st.markdown(f"**{nome}**")
+            st.dataframe(
+                pd.DataFrame([(k, str(v)) for k, v in valores.items()], columns=["Indicador", "Valor"]),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        st.caption(f"Registrado em {ARQUIVO_LOG.name}")
@@ -0,0 +1,92 @@
+import numpy as np
+
+from leitores import ler_planilha
+from process_data import (
+    classificar_area,
+    colunas_de_data,
+    limpeza_inicial,
+    remover_cargos,
+    tratar_datas,
+    unificar,
+)
+from validacao import codigo_situacao
+
+# =========================================================
+# ETAPAS DO PROCESSAMENTO DE UPLOAD
+# =========================================================
+# (chave, descrição exibida na página de upload)
+ETAPAS = [
+    ("leitura", "Lendo arquivos .xls"),
+    ("limpeza", "Limpeza inicial e remoção de cargos"),
+    ("datas", "Tratando datas"),
+    ("situacao", "Classificando situação"),
+    ("area", "Classificando área"),
+    ("unificacao", "Unificando bases"),
+]
+
+# ---------------- LEITURA ----------------
+def ler_xls(conteudo):
+    # Uploads não são gravados em disco: sem cache em Arrow aqui
+    try:
+        return ler_planilha(conteudo, usar_cache=False)
+    except ImportError:
+        raise RuntimeError(
+            "Faltou instalar um leitor de planilhas no Streamlit Cloud.\n\n"
+            "✅ Corrija o `requirements.txt` com: `xlrd==2.0.1` "
+            "(ou `python-calamine`, mais rápido) e faça **Reboot** no app."
+        )
+    except Exception as e:
+        raise RuntimeError(f"Erro ao ler o arquivo .xls: {e}")
+
+
+# Limpeza, cargos, datas e área: as mesmas funções do process_data.py
+# (uma regra nova no ETL vale também para o upload). Só a situação é
+# própria daqui: o upload não tem os mapeamentos.
+
+# ---------------- SITUAÇÃO ----------------
+def classificar_situacao(d):
+    # 1 (número), 1.0 (Excel) e "1" (CSV) são o mesmo código
+    d["Situacao_res"] = np.where(
+        codigo_situacao(d["Situação"]).isin([1, 2, 3, 4]),
+        "Ativo",
+        "Desligado/Afastado"
+    )
+    return d
+
+
+# =========================================================
+# EXECUÇÃO COMPLETA
+# =========================================================
+def processar_upload(conteudo_clt, conteudo_pj, progresso=None):
+    """
+    Executa todas as ETAPAS sobre o conteúdo (bytes) dos dois arquivos.
+    `progresso(chave)` é chamado no início de cada etapa.
+    """
+    avisar = progresso or (lambda chave: None)
+
+    avisar("leitura")
+    df_clt = ler_xls(conteudo_clt)
+    df_pj = ler_xls(conteudo_pj)
+
+    avisar("limpeza")
+    df_clt = limpeza_inicial(df_clt)
+    df_pj = limpeza_inicial(df_pj)
+    df_clt, df_pj = remover_cargos(df_clt, df_pj)
+
+    avisar("datas")
+    for d in (df_clt, df_pj):
+        tratar_datas(d)
+        colunas_de_data(d)
+
+    avisar("situacao")
+    for d in (df_clt, df_pj):
+        classificar_situacao(d)
+
+    avisar("area")
+    for d in (df_clt, df_pj):
+        d["Area"] = d["C.Custo"].astype(str).apply(classificar_area)
+
+    avisar("unificacao")
+    df_base = unificar(df_clt, df_pj)
+
+    return {"df_clt": df_clt, "df_pj": df_pj, "df_base": df_base}
@@ -0,0 +1,228 @@
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: sem ele, só o processamento em memória
+    pa = pq = None
+
+from historico import calcular_tempo_casa
+from leitores import TAMANHO_BLOCO, ler_em_blocos
+from process_data import (
+    DATE_COLS,
+    aplicar_mapeamentos,
+    classificar_areas,
+    colunas_de_data,
+    formato_de_data,
+    limpeza_inicial,
+    pico_memoria_mb,
+    remover_cargos_clt,
+    remover_cargos_pj,
+    remover_lojas_e_temporarios,
+    texto_de_data,
+    tratar_datas,
+)
+from validacao import LIMITE_QUARENTENA, QuarentenaExcedida, conferir_colunas, validar
+
+# =====================================================================
+# ETL EM BLOCOS (EXPORTAÇÕES MAIORES QUE A MEMÓRIA)
+# =====================================================================
+# O process_data.processar() lê as duas planilhas inteiras e concatena:
+# o pico de memória é várias vezes o tamanho da entrada. Aqui as
+# exportações da Senior (.csv ou .xlsx) são lidas em blocos de
+# `tamanho` linhas (leitores.ler_em_blocos) e cada bloco passa pelas
+# mesmas etapas do process_data.py (limpeza, cargos, datas,
+# mapeamentos, lojas/temporários, área). O resultado vai direto para
+# os arquivos de saída, bloco a bloco:
+#     base_tratada.parquet  (colunar, tipos fixos)
+#     base_tratada.csv / tempo_de_casa.csv  (os que o portal lê)
+#
+#     python process_data.py --blocos 200000 --semana 02.12.25 --clt CLT.csv --pj PJ.xlsx
+#
+# As colunas brutas são lidas como texto (o .xlsx também), então os
+# tipos não mudam de um bloco para outro. O formato de cada coluna de
+# data é fixado no primeiro valor preenchido do arquivo, como o
+# tratar_datas() faz com a coluna inteira: o resultado é o mesmo do
+# processamento em memória sobre a mesma entrada em texto
+# (conferência: benchmarks/bench_etl_blocos.py). A validação também é
+# por bloco: a quarentena.csv é gravada aos poucos e, se passar do
+# limite, nenhuma saída é trocada (ver validacao.py).
+
+# Colunas inteiras criadas pelo ETL (colunas_de_data)
+COLS_INT = ["Idade", "Mes_Admissao", "Ano_Admissao", "Mes_Afastamento", "Ano_Afastamento"]
+
+
+def _exigir_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow não instalado: o ETL em blocos grava Parquet (use o process_data.py sem --blocos).")
+
+
+# =========================================================
+# 1) UM BLOCO
+# =========================================================
+def formatos_de_data(d, formatos):
+    """Completa `formatos` com o formato deduzido do primeiro valor preenchido de cada coluna."""
+    for col in DATE_COLS:
+        if col in formatos or col not in d.columns:
+            continue
+        preenchidos = texto_de_data(d[col]).dropna()
+        if preenchidos.empty:
+            continue
+        # Sem formato reconhecível o pandas lê valor a valor ("mixed")
+        formatos[col] = formato_de_data(preenchidos.iloc[0]) or "mixed"
+    return formatos
+
+
+def processar_bloco(bloco, tipo, mapeamentos, formatos, quarentena=None):
+    """Etapas do process_data.processar() sobre um bloco de CLT ou PJ."""
+    d = limpeza_inicial(bloco)
+    d = remover_cargos_clt(d) if tipo == "CLT" else remover_cargos_pj(d)
+
+    brutas = d[DATE_COLS]
+    tratar_datas(d, formatos_de_data(d, formatos))
+    d = validar(d, brutas, mapeamentos, tipo, quarentena)
+    colunas_de_data(d)
+    aplicar_mapeamentos(d, mapeamentos)
+
+    if tipo == "CLT":
+        d = remover_lojas_e_temporarios(d, mapeamentos["temporarios"])
+    classificar_areas(d, mapeamentos["cc"])
+    d["TIPO"] = tipo
+    return d
+
+
+# =========================================================
+# 2) ESQUEMA DA SAÍDA
+# =========================================================
+def _blocos(path, tamanho):
+    return ler_em_blocos(path, tamanho, texto=True)
+
+
+def _cabecalho(path):
+    leitor = _blocos(path, 1)
+    try:
+        return next(leitor).iloc[:0]
+    finally:
+        leitor.close()
+
+
+def _tipo_arrow(col, dtype):
+    if col in DATE_COLS:
+        return pa.timestamp("us")
+    if col in COLS_INT:
+        return pa.int64()
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+        # .xls (sem leitura em texto): tipos do arquivo inteiro
+        return pa.from_numpy_dtype(dtype)
+    return pa.string()
+
+
+def esquema_saida(entradas, mapeamentos):
+    """
+    Colunas da base unificada (as do CLT e depois as que só o PJ tem,
+    como no pd.concat) e esquema Arrow, pelo cabeçalho de cada arquivo.
+    """
+    colunas = {}
+    for path, tipo in entradas:
+        cabecalho = _cabecalho(path)
+        conferir_colunas(cabecalho.columns, tipo)
+        vazio = processar_bloco(cabecalho, tipo, mapeamentos, {})
+        for col in vazio.columns:
+            colunas.setdefault(col, _tipo_arrow(col, vazio[col].dtype))
+    return list(colunas), pa.schema(list(colunas.items()))
+
+
+def _alinhar(d, colunas):
+    # Coluna que só existe no outro arquivo: vazia
+    faltando = {c: pd.Series(None, index=d.index, dtype=object) for c in colunas if c not in d.columns}
+    return d.assign(**faltando)[colunas] if faltando else d[colunas]
+
+
+# =========================================================
+# 3) EXECUÇÃO
+# =========================================================
+def processar(clt, pj, mapeamentos, destino, tamanho=TAMANHO_BLOCO, tempo_casa_destino=None, parquet_destino=None,
+              quarentena=None, limite_quarentena=LIMITE_QUARENTENA):
+    """
+    Processa CLT e PJ em blocos e grava `destino` (CSV), o Parquet e o
+    tempo de casa. Cada arquivo é gravado em .tmp e trocado no final.
+    Devolve um resumo (linhas, blocos, tempo, pico de memória).
+    Com `quarentena` (validacao.Quarentena), grava o relatório e levanta
+    QuarentenaExcedida acima do limite, sem trocar as saídas.
+    """
+    _exigir_pyarrow()
+    destino = Path(destino)
+    parquet_destino = Path(parquet_destino or destino.with_suffix(".parquet"))
+    entradas = [(Path(clt), "CLT"), (Path(pj), "PJ")]
+
+    colunas, esquema = esquema_saida(entradas, mapeamentos)
+    hoje = pd.to_datetime("today")
+
+    saidas = [destino, parquet_destino] + ([Path(tempo_casa_destino)] if tempo_casa_destino else [])
+    tmps = {path: path.with_name(path.name + ".tmp") for path in saidas}
+
+    resumo = {"blocos": 0, "linhas_lidas": 0, "registros": 0, "por_tipo": {}}
+    inicio = time.perf_counter()
+
+    csv = open(tmps[destino], "w", encoding="utf-8", newline="")
+    tempo_casa = open(tmps[tempo_casa_destino], "w", encoding="utf-8", newline="") if tempo_casa_destino else None
+    parquet = pq.ParquetWriter(tmps[parquet_destino], esquema)
+    try:
+        cabecalho = True
+        for path, tipo in entradas:
+            # Formato de data fixado por arquivo, como no processar() em memória
+            formatos = {}
+            print(f"📂 {tipo}: {path.name} em blocos de {tamanho:,} linhas...")
+            for bloco in _blocos(path, tamanho):
+                resumo["blocos"] += 1
+                resumo["linhas_lidas"] += len(bloco)
+
+                d = _alinhar(processar_bloco(bloco, tipo, mapeamentos, formatos, quarentena), colunas)
+                d.to_csv(csv, header=cabecalho, index=False)
+                parquet.write_table(pa.Table.from_pandas(d, schema=esquema, preserve_index=False))
+                if tempo_casa is not None:
+                    calcular_tempo_casa(d, hoje).to_csv(tempo_casa, header=cabecalho, index=False)
+                cabecalho = False
+
+                resumo["registros"] += len(d)
+                resumo["por_tipo"][tipo] = resumo["por_tipo"].get(tipo, 0) + len(d)
+                if quarentena is not None:
+                    quarentena.conferir_mapeamentos(d, mapeamentos)
+    finally:
+        csv.close()
+        parquet.close()
+        if tempo_casa is not None:
+            tempo_casa.close()
+
+    if quarentena is not None:
+        quarentena.fechar()
+        quarentena.imprimir()
+        try:
+            quarentena.conferir(limite_quarentena)
+        except QuarentenaExcedida:
+            # Nenhuma saída é trocada: o portal continua com a carga anterior
+            for tmp in tmps.values():
+                tmp.unlink(missing_ok=True)
+            raise
+
+    # Todos os blocos gravados: só agora as saídas são trocadas
+    for path, tmp in tmps.items():
+        os.replace(tmp, path)
+
+    resumo["tempo"] = time.perf_counter() - inicio
+    resumo["pico_mb"] = pico_memoria_mb()
+    print(
+        f"📊 Total final: {resumo['registros']} registros "
+        f"(CLT={resumo['por_tipo'].get('CLT', 0)} | PJ={resumo['por_tipo'].get('PJ', 0)}) "
+        f"em {resumo['blocos']} blocos"
+    )
+    return resumo
+
+
+def base_para_absenteismo(parquet):
+    """Só as colunas que o absenteismo.publicar() usa, lidas do Parquet."""
+    return pd.read_parquet(parquet, columns=["Area", "C.Custo", "TIPO", "Admissão", "Data Afastamento"])
@@ -1,59 +1,76 @@
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import date, datetime
 from pathlib import Path
+import json
+import os
 import re
 import sys
+import warnings
+
+from pandas.tseries.api import guess_datetime_format
+
+from caminhos import (
+    BASE_FILE,
+    DATA_DIR,
+    DATA_ROOT,
+    HIST_DIR,
+    MANIFESTO_FILE,
+    MAP_DIR,
+    PARTICOES_DIR,
+    RAW_DIR,
+    TEMPO_CASA_FILE,
+)
+from historico import HistoricoSnapshots, calcular_tempo_casa
+from leitores import ler_em_blocos, ler_planilha
+from publicacao import ler_base, ler_tempo_casa
 
 # =========================================================
-# CONFIGURAÇÕES DE CAMINHOS (PADRÃO PROFISSIONAL)
+# CONFIGURAÇÃO DOS ARQUIVOS DA SEMANA
 # =========================================================
-BASE_DIR = Path(__file__).resolve().parent
-DATA_ROOT = BASE_DIR / "lamoda_dados"
+SEMANA = "02.12.25"
 
-RAW_DIR = DATA_ROOT / "raw"
-DATA_DIR = DATA_ROOT / "data"
-MAP_DIR = BASE_DIR / "mapeamentos"
+CLT_FILE = RAW_DIR / f"{SEMANA}-CLT.xls"
+PJ_FILE  = RAW_DIR / f"{SEMANA}-PJ.xls"
 
-# Garante estrutura mínima
-for d in [DATA_ROOT, RAW_DIR, DATA_DIR]:
-    d.mkdir(exist_ok=True)
+# A semana também é a data do snapshot e a data_referencia do manifesto
+FORMATO_SEMANA = "%d.%m.%y"
 
-# =========================================================
-# CONFIGURAÇÃO DOS ARQUIVOS DA SEMANA
-# =========================================================
-CLT_FILE = RAW_DIR / "02.12.25-CLT.xls"
-PJ_FILE  = RAW_DIR / "02.12.25-PJ.xls"
+# Cada etapa é uma função sobre DataFrames: main() encadeia as etapas
+# e benchmarks/bench_turnover.py mede uma a uma com dados sintéticos.
 
 def validar_arquivo(path: Path):
     if not path.exists():
         print(f"❌ Arquivo não encontrado: {path}")
         sys.exit(1)
 
-validar_arquivo(CLT_FILE)
-validar_arquivo(PJ_FILE)
-
-print("📂 Lendo arquivos brutos...")
-df  = pd.read_excel(CLT_FILE, engine="xlrd")
-df2 = pd.read_excel(PJ_FILE, engine="xlrd")
+def ler_entrada(path):
+    """Exportação inteira em memória: .xls/.xlsx pelo cache em Arrow, .csv como texto."""
+    if path.suffix.lower() in (".csv", ".txt"):
+        return pd.concat(ler_em_blocos(path), ignore_index=True)
+    return ler_planilha(path)
+
+def pico_memoria_mb():
+    """Pico de memória (RSS) do processo em MB; None se o sistema não informa (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
 
 # =========================================================
 # 1) LIMPEZA INICIAL
 # =========================================================
-print("🧹 Limpeza inicial...")
-
 def limpeza_inicial(d):
     d = d.dropna(how="all").reset_index(drop=True)
     return d.drop(columns=["Posição do Local", "Cadastro"], errors="ignore")
 
-df  = limpeza_inicial(df)
-df2 = limpeza_inicial(df2)
-
 # =========================================================
 # 2) LIMPEZA DE CARGOS
 # =========================================================
-print("🧹 Removendo cargos indesejados...")
-
 padrao_clt = r"JOVEM APRENDIZ|ESTAGIARI[OA]|APRENDIZ"
 padrao_pj  = r"PRESTADOR DE SERVIÇO|SERVENTE DE ZELADORIA|ESPEC\.? DE SERV\.? DE LAVANDERIA"
 
@@ -65,52 +82,72 @@ cargos_remover_df2 = [
 
 padrao_df2_extra = r"|".join(map(re.escape, cargos_remover_df2))
 
-df  = df[~df["Título Reduzido (Cargo)"].str.contains(padrao_clt, case=False, na=False)]
-df2 = df2[~df2["Título Reduzido (Cargo)"].str.contains(padrao_df2_extra, case=False, na=False)]
-df2 = df2[~df2["Título Reduzido (Cargo)"].str.contains(padrao_pj, case=False, na=False)]
+def remover_cargos_clt(df):
+    return df[~df["Título Reduzido (Cargo)"].str.contains(padrao_clt, case=False, na=False)]
 
-print(f"✅ Registros restantes: CLT={len(df)} | PJ={len(df2)}")
+def remover_cargos_pj(df2):
+    df2 = df2[~df2["Título Reduzido (Cargo)"].str.contains(padrao_df2_extra, case=False, na=False)]
+    return df2[~df2["Título Reduzido (Cargo)"].str.contains(padrao_pj, case=False, na=False)]
+
+def remover_cargos(df, df2):
+    return remover_cargos_clt(df), remover_cargos_pj(df2)
 
 # =========================================================
 # 3) TRATAMENTO DE DATAS
 # =========================================================
-print("📅 Tratando datas...")
-
 DATE_COLS = ["Nascimento", "Admissão", "Data Afastamento"]
 
-def tratar_datas(d):
+# Textos tratados como data vazia
+DATAS_VAZIAS = ["", " ", "0", "00/00/0000", "--", "NaT", "nan"]
+
+def texto_de_data(serie):
+    return serie.astype(str).str.strip().replace(DATAS_VAZIAS, pd.NA)
+
+def formato_de_data(texto):
+    """
+    Formato de uma data em texto (None se não reconhecido). A Senior
+    exporta dd/mm/aaaa: quando o dia ou o mês vem antes do ano, o dia
+    vem primeiro (o pandas supõe mm/dd, e 03/09/1967 virava 9 de março).
+    """
+    with warnings.catch_warnings():
+        # Aviso de dayfirst do pandas: o formato é escolhido aqui
+        warnings.simplefilter("ignore", UserWarning)
+        formato = guess_datetime_format(texto)
+        if formato and formato.startswith("%m"):
+            formato = guess_datetime_format(texto, dayfirst=True)
+    return formato
+
+def tratar_datas(d, formatos=None):
+    # formatos: {coluna: formato} fixo (leitura em blocos, ver process_blocos.py);
+    # sem formato, vale o do primeiro valor preenchido da coluna
+    formatos = formatos or {}
     for col in DATE_COLS:
-        d[col] = (
-            d[col]
-            .astype(str)
-            .str.strip()
-            .replace(["", " ", "0", "00/00/0000", "--", "NaT", "nan"], pd.NA)
-        )
-        d[col] = pd.to_datetime(d[col], errors="coerce")
+        d[col] = texto_de_data(d[col])
+        formato = formatos.get(col)
+        primeiro = d[col].first_valid_index()
+        if formato is None and primeiro is not None:
+            formato = formato_de_data(d[col].loc[primeiro])
+        d[col] = pd.to_datetime(d[col], errors="coerce", format=formato)
     return d
 
-df  = tratar_datas(df)
-df2 = tratar_datas(df2)
-
 def calc_idade(dt):
     if pd.isna(dt):
         return 0
     return int((date.today() - dt.date()).days / 365.25)
 
-for d in (df, df2):
+def colunas_de_data(d):
     d["Idade"] = d["Nascimento"].apply(calc_idade)
     d["Mes_Admissao"] = d["Admissão"].dt.month.fillna(0).astype(int)
     d["Ano_Admissao"] = d["Admissão"].dt.year.fillna(0).astype(int)
     d["Mes_Afastamento"] = d["Data Afastamento"].dt.month.fillna(0).astype(int)
     d["Ano_Afastamento"] = d["Data Afastamento"].dt.year.fillna(0).astype(int)
+    return d
 
 # =========================================================
 # 4) MAPEAMENTOS (SEGURO)
 # =========================================================
-print("📄 Lendo mapeamentos...")
-
-def load_dict_from_txt(filename):
-    path = MAP_DIR / filename
+def load_dict_from_txt(filename, map_dir=MAP_DIR):
+    path = Path(map_dir) / filename
     if not path.exists():
         print(f"❌ Mapeamento não encontrado: {filename}")
         sys.exit(1)
@@ -123,8 +160,8 @@ def load_dict_from_txt(filename):
                 data[k.strip().strip('"')] = v.strip().strip('",')
     return data
 
-def load_list_from_txt(filename):
-    path = MAP_DIR / filename
+def load_list_from_txt(filename, map_dir=MAP_DIR):
+    path = Path(map_dir) / filename
     if not path.exists():
         print(f"❌ Lista não encontrada: {filename}")
         sys.exit(1)
@@ -132,32 +169,37 @@ def load_list_from_txt(filename):
     with open(path, "r", encoding="utf-8") as f:
         return [l.strip().strip('",') for l in f if l.strip()]
 
-causas_map      = load_dict_from_txt("causas_map.txt")
-situacao_map    = load_dict_from_txt("situacao_map.txt")
-cc_map          = load_dict_from_txt("cc_map.txt")
-temporarios_lst = load_list_from_txt("temporarios_map.txt")
-
-df["Causa Escrita"]  = df["Causa"].map(causas_map).fillna("Desconhecida")
-df2["Causa Escrita"] = df2["Causa"].map(causas_map).fillna("Desconhecida")
-
-df["Situacao Escrita"]  = df["Situação"].astype(int).map(situacao_map).fillna("Desconhecida")
-df2["Situacao Escrita"] = df2["Situação"].astype(int).map(situacao_map).fillna("Desconhecida")
+def carregar_mapeamentos(map_dir=MAP_DIR):
+    return {
+        "causas": load_dict_from_txt("causas_map.txt", map_dir),
+        "situacao": load_dict_from_txt("situacao_map.txt", map_dir),
+        "cc": load_dict_from_txt("cc_map.txt", map_dir),
+        "temporarios": load_list_from_txt("temporarios_map.txt", map_dir),
+    }
 
 situacoes_ativas = ["Trabalhando", "Férias", "Licença Maternidade", "Atestado Médico"]
 
-df["Situacao_res"]  = np.where(df["Situacao Escrita"].isin(situacoes_ativas), "Ativo", "Desligado/Afastado")
-df2["Situacao_res"] = np.where(df2["Situacao Escrita"].isin(situacoes_ativas), "Ativo", "Desligado/Afastado")
+def mapa_situacao(mapa):
+    """Chaves como inteiros: no situacao_map.txt elas vêm em texto ("1")."""
+    return {int(k): v for k, v in mapa.items() if str(k).strip().lstrip("-").isdigit()}
+
+def aplicar_mapeamentos(d, mapeamentos):
+    # Situação já validada (validacao.py): sempre um código inteiro do mapa
+    d["Causa Escrita"] = d["Causa"].map(mapeamentos["causas"]).fillna("Desconhecida")
+    situacao = pd.to_numeric(d["Situação"]).astype(int)
+    d["Situacao Escrita"] = situacao.map(mapa_situacao(mapeamentos["situacao"])).fillna("Desconhecida")
+    d["Situacao_res"] = np.where(d["Situacao Escrita"].isin(situacoes_ativas), "Ativo", "Desligado/Afastado")
+    return d
 
 # =========================================================
 # 5) REMOÇÕES E CLASSIFICAÇÕES
 # =========================================================
-print("🏬 Removendo lojas fechadas e temporários...")
-
 lojas_keywords = ["OUTLET TIJUCAS", "CONTINENTE PARK SHOPPING"]
 pattern = r"|".join(map(re.escape, lojas_keywords))
 
-df = df[~df["Descrição (C.Custo)"].astype(str).str.upper().str.contains(pattern, na=False)]
-df = df[~df["Nome"].isin(temporarios_lst)]
+def remover_lojas_e_temporarios(df, temporarios_lst):
+    df = df[~df["Descrição (C.Custo)"].astype(str).str.upper().str.contains(pattern, na=False)]
+    return df[~df["Nome"].isin(temporarios_lst)]
 
 def classificar_area(cc):
     cc = str(cc).upper()
@@ -167,47 +209,265 @@ def classificar_area(cc):
         return "Indústria"
     return "Matriz"
 
-for d in (df, df2):
+def classificar_areas(d, cc_map):
     d["Area"] = d["C.Custo"].astype(str).map(cc_map).fillna("0")
     d["Area"] = d["Area"].apply(classificar_area)
     d.drop(d[(d["Area"] == "0") & (d["Situacao_res"] != "Ativo")].index, inplace=True)
+    return d
 
 # =========================================================
 # 6) UNIFICAR BASES
 # =========================================================
-print("📦 Unificando bases...")
-
-df["TIPO"]  = "CLT"
-df2["TIPO"] = "PJ"
-
-df_final = pd.concat([df, df2], ignore_index=True)
-print(f"📊 Total final: {len(df_final)} registros")
+def unificar(df, df2):
+    df["TIPO"]  = "CLT"
+    df2["TIPO"] = "PJ"
+    return pd.concat([df, df2], ignore_index=True)
 
 # =========================================================
 # 7) SALVAR BASE FINAL
 # =========================================================
-OUTPUT_FILE = DATA_DIR / "base_tratada.csv"
-df_final.to_csv(OUTPUT_FILE, index=False, encoding="utf-8")
-
+# Grava em arquivo temporário e troca de uma vez: o portal
+# nunca enxerga um CSV pela metade.
+def salvar_csv_atomico(d, path):
+    tmp = path.with_name(path.name + ".tmp")
+    d.to_csv(tmp, index=False, encoding="utf-8")
+    os.replace(tmp, path)
 
-# ================================
-# GERAR TEMPO DE CASA
-# ================================
-hoje = pd.to_datetime("today")
-
-df_final["Data Ref"] = df_final["Data Afastamento"].fillna(hoje)
-df_final["Dias_de_Casa"] = (df_final["Data Ref"] - df_final["Admissão"]).dt.days.clip(lower=0)
-df_final["Meses_de_Casa"] = (df_final["Dias_de_Casa"] / 30.44).round(1)
-df_final["Anos_de_Casa"] = (df_final["Dias_de_Casa"] / 365).round(2)
-
-tempo_cols = [
-    "Nome", "Admissão", "Data Afastamento", "Situacao_res", "Area",
-    "Descrição (C.Custo)", "Título Reduzido (Cargo)",
-    "Dias_de_Casa", "Meses_de_Casa", "Anos_de_Casa"
-]
-
-df_final[tempo_cols].to_csv(DATA_DIR / "tempo_de_casa.csv", index=False, encoding="utf-8")
 
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+def processar(df, df2, mapeamentos, quarentena=None):
+    """
+    Todas as etapas, das planilhas lidas até a base unificada. As linhas
+    que falham na validação ficam fora da base (e na `quarentena`, se
+    informada: validacao.Quarentena).
+    """
+    from validacao import conferir_colunas, validar
+
+    conferir_colunas(df.columns, "CLT")
+    conferir_colunas(df2.columns, "PJ")
+
+    print("🧹 Limpeza inicial...")
+    df  = limpeza_inicial(df)
+    df2 = limpeza_inicial(df2)
+
+    print("🧹 Removendo cargos indesejados...")
+    df, df2 = remover_cargos(df, df2)
+    print(f"✅ Registros restantes: CLT={len(df)} | PJ={len(df2)}")
+
+    print("📅 Tratando datas...")
+    # Datas como vieram (cópia preguiçosa): a quarentena grava o original
+    brutas = [d[DATE_COLS] for d in (df, df2)]
+    for d in (df, df2):
+        tratar_datas(d)
+
+    print("🔎 Validando registros...")
+    df  = validar(df, brutas[0], mapeamentos, "CLT", quarentena)
+    df2 = validar(df2, brutas[1], mapeamentos, "PJ", quarentena)
+    for d in (df, df2):
+        colunas_de_data(d)
+
+    print("📄 Aplicando mapeamentos...")
+    for d in (df, df2):
+        aplicar_mapeamentos(d, mapeamentos)
+
+    print("🏬 Removendo lojas fechadas e temporários...")
+    df = remover_lojas_e_temporarios(df, mapeamentos["temporarios"])
+    for d in (df, df2):
+        classificar_areas(d, mapeamentos["cc"])
+
+    print("📦 Unificando bases...")
+    df_final = unificar(df, df2)
+    if quarentena is not None:
+        quarentena.conferir_mapeamentos(df_final, mapeamentos)
+    print(f"📊 Total final: {len(df_final)} registros")
+    return df_final
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trata as planilhas da semana e publica a base")
+    parser.add_argument(
+        "--motor", choices=["pandas", "polars"], default="pandas",
+        help="polars: mesmas etapas num plano lazy, multi-thread (process_polars.py)",
+    )
+    parser.add_argument(
+        "--semana", metavar="DD.MM.AA",
+        help=f"semana das exportações: data do snapshot e do manifesto; sem --clt/--pj, "
+             f"lê <semana>-CLT.xls e <semana>-PJ.xls de {RAW_DIR} (padrão: {SEMANA})",
+    )
+    parser.add_argument("--clt", type=Path, help="exportação CLT (.xls, .xlsx ou .csv); exige --semana")
+    parser.add_argument("--pj", type=Path, help="exportação PJ (.xls, .xlsx ou .csv); exige --semana")
+    parser.add_argument(
+        "--blocos", type=int, metavar="LINHAS",
+        help="lê e processa as exportações em blocos de LINHAS linhas, gravando a saída aos poucos (process_blocos.py)",
+    )
+    parser.add_argument(
+        "--limite-quarentena", type=float, metavar="FRACAO", default=None,
+        help="fração máxima de linhas em quarentena para publicar a base (padrão: validacao.LIMITE_QUARENTENA)",
+    )
+    args = parser.parse_args()
+    if args.blocos and args.motor == "polars":
+        parser.error("--blocos usa o caminho em pandas: não combine com --motor polars")
+    if (args.clt or args.pj) and args.semana is None:
+        # Sem isso o snapshot e o manifesto sairiam com a data de SEMANA
+        parser.error("com --clt/--pj, informe --semana (data das exportações, ex.: --semana 09.12.25)")
+    semana = args.semana or SEMANA
+    try:
+        data_snapshot = datetime.strptime(semana, FORMATO_SEMANA)
+    except ValueError:
+        parser.error(f"--semana inválida: {semana!r} (use DD.MM.AA, ex.: 09.12.25)")
+    args.clt = args.clt or RAW_DIR / f"{semana}-CLT.xls"
+    args.pj = args.pj or RAW_DIR / f"{semana}-PJ.xls"
+
+    # Garante estrutura mínima
+    for d in [DATA_ROOT, RAW_DIR, DATA_DIR]:
+        d.mkdir(exist_ok=True)
+
+    validar_arquivo(args.clt)
+    validar_arquivo(args.pj)
+
+    print("📄 Lendo mapeamentos...")
+    mapeamentos = carregar_mapeamentos()
+
+    OUTPUT_FILE = BASE_FILE
+
+    # Linhas reprovadas na validação: fora da base, em quarentena.csv (ver validacao.py)
+    import validacao
+
+    quarentena = validacao.Quarentena(validacao.QUARENTENA_FILE)
+    limite = validacao.LIMITE_QUARENTENA if args.limite_quarentena is None else args.limite_quarentena
+
+    if args.blocos:
+        import process_blocos
+
+        # Base, Parquet e tempo de casa gravados bloco a bloco: a base
+        # inteira nunca fica em memória (ver process_blocos.py)
+        try:
+            resumo_blocos = process_blocos.processar(
+                args.clt, args.pj, mapeamentos, OUTPUT_FILE,
+                tamanho=args.blocos, tempo_casa_destino=TEMPO_CASA_FILE,
+                quarentena=quarentena, limite_quarentena=limite,
+            )
+        except validacao.QuarentenaExcedida as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        df_final = None
+        df_ausencias = process_blocos.base_para_absenteismo(OUTPUT_FILE.with_suffix(".parquet"))
+        registros = resumo_blocos["registros"]
+    else:
+        if args.motor == "polars":
+            import process_polars
+
+            # Lê direto do .arrow do cache de planilhas, só o que o plano usa
+            df_final = process_polars.processar(
+                process_polars.ler_lazy(args.clt), process_polars.ler_lazy(args.pj), mapeamentos, quarentena
+            )
+        else:
+            print("📂 Lendo arquivos brutos...")
+            # Leitor mais rápido disponível + cache em Arrow por conteúdo (ver leitores.py)
+            df  = ler_entrada(args.clt)
+            df2 = ler_entrada(args.pj)
+
+            df_final = processar(df, df2, mapeamentos, quarentena)
+
+        # Relatório gravado mesmo se a base não for publicada
+        quarentena.fechar()
+        quarentena.imprimir()
+        try:
+            quarentena.conferir(limite)
+        except validacao.QuarentenaExcedida as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+        salvar_csv_atomico(df_final, OUTPUT_FILE)
+
+        # Tempo de casa: mesmas regras do histórico (historico.py)
+        salvar_csv_atomico(calcular_tempo_casa(df_final, pd.to_datetime("today")), TEMPO_CASA_FILE)
+        df_ausencias = df_final
+        registros = len(df_final)
+
+    # Absenteísmo: exportações diárias lidas em blocos (ver absenteismo.py)
+    import absenteismo
+
+    print("📆 Processando ausências...")
+    resumo_ausencias = absenteismo.publicar(df_ausencias, mapeamentos["cc"])
+    if resumo_ausencias is None:
+        print(f"⚠️ Nenhuma exportação de ausências em {absenteismo.AUSENCIAS_DIR}: absenteísmo não atualizado.")
+    else:
+        print(
+            f"📆 Absenteísmo: {resumo_ausencias['arquivos']} arquivos "
+            f"({resumo_ausencias['do_cache']} do cache), {resumo_ausencias['linhas']} linhas lidas, "
+            f"{resumo_ausencias['descartadas']} descartadas"
+        )
 
-print("✅ Base tratada gerada com sucesso!")
-print(f"📄 Caminho: {OUTPUT_FILE}")
+    # ================================
+    # BASE PARTICIONADA (LAMODA_MOTOR=particoes)
+    # ================================
+    # Parquet por Área × ano, lido do CSV publicado com as mesmas
+    # conversões do portal (ver particoes.py). Gravado antes do manifesto:
+    # o portal encontra a versão pronta e não monta nada.
+    versao = datetime.now().strftime("%Y%m%d%H%M%S")
+    if args.blocos:
+        # Exige a base inteira em memória: fica para o portal (dados.carregar_versao)
+        print("🗂️ Em blocos: a base particionada é montada pelo portal na primeira carga.")
+    else:
+        try:
+            from particoes import preparar_particoes
+
+            pasta = preparar_particoes(
+                versao,
+                lambda: ler_base(OUTPUT_FILE),
+                lambda: ler_tempo_casa(TEMPO_CASA_FILE),
+                PARTICOES_DIR,
+            )
+            print(f"🗂️ Base particionada por área e ano: {pasta}")
+        except ImportError as e:
+            print(f"⚠️ Base particionada não gerada: {e}")
+
+    # ================================
+    # REGISTRAR SNAPSHOT NO HISTÓRICO
+    # ================================
+    # Guarda só as linhas que mudaram desde o snapshot anterior
+    # (ver historico.py); permite consultar "como era em" qualquer semana.
+    if df_final is None:
+        # O histórico compara a base inteira com o snapshot anterior
+        print("⚠️ Em blocos (carga de histórico completo): snapshot não registrado.")
+    else:
+        try:
+            resumo = HistoricoSnapshots(HIST_DIR).registrar(
+                df_final, data_snapshot
+            )
+            print(
+                f"🕓 Snapshot {resumo['data']} registrado: "
+                f"{resumo['novas']} linhas novas, {resumo['removidas']} removidas"
+            )
+        except ImportError as e:
+            print(f"⚠️ Snapshot não registrado no histórico: {e}")
+
+    # ================================
+    # PUBLICAR NOVA VERSÃO
+    # ================================
+    # O manifesto é gravado por último: é o sinal para o portal
+    # recarregar a base sem reiniciar.
+    manifesto = {
+        "versao": versao,
+        "data_referencia": data_snapshot.strftime("%d/%m/%Y"),
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "registros": registros,
+        "quarentena": sum(quarentena.separadas.values()),
+    }
+
+    tmp_manifesto = MANIFESTO_FILE.with_name(MANIFESTO_FILE.name + ".tmp")
+    tmp_manifesto.write_text(json.dumps(manifesto, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_manifesto, MANIFESTO_FILE)
+
+    print("✅ Base tratada gerada com sucesso!")
+    print(f"📄 Caminho: {OUTPUT_FILE}")
+
+    pico = pico_memoria_mb()
+    print(f"📈 Pico de memória do processo: {f'{pico:,.0f} MB' if pico is not None else 'não informado pelo sistema'}")
+
+
+if __name__ == "__main__":
+    main()
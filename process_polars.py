@@ -0,0 +1,286 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:  # polars é opcional: sem ele, só o caminho em pandas
+    pl = None
+
+from leitores import _arrow_disponivel, arquivo_arrow, ler_planilha
+from process_data import (
+    DATAS_VAZIAS,
+    DATE_COLS,
+    formato_de_data,
+    ler_entrada,
+    mapa_situacao,
+    padrao_clt,
+    padrao_df2_extra,
+    padrao_pj,
+    pattern,
+    situacoes_ativas,
+)
+from validacao import (
+    ADMISSAO_ANTES_NASCIMENTO,
+    AFASTAMENTO_ANTES_ADMISSAO,
+    COLUNAS_QUARENTENA,
+    DATA_INVALIDA,
+    SEPARADOR,
+    SITUACAO_NAO_NUMERICA,
+    SITUACAO_SEM_MAPEAMENTO,
+    SITUACAO_VAZIA,
+    conferir_colunas,
+)
+
+# =====================================================================
+# ETL EM POLARS (PLANO LAZY) — MESMAS REGRAS DO process_data.py
+# =====================================================================
+# O process_data.processar() materializa uma base inteira a cada etapa
+# (dropna, filtros de cargo, datas, mapeamentos, lojas, concat). Aqui as
+# mesmas etapas viram um único plano (LazyFrame) sobre o .arrow do cache
+# de planilhas (leitores.py): o Polars junta as etapas, leva filtros e
+# colunas até a leitura e executa em várias threads. CLT e PJ saem num
+# collect só.
+#
+#     python process_data.py --motor polars
+#
+# O resultado é o mesmo DataFrame do caminho em pandas (colunas, ordem
+# e tipos), com as mesmas linhas em quarentena (validacao.py, aqui como
+# expressões); benchmarks/paridade_polars.py confere isso.
+
+
+def disponivel():
+    return pl is not None
+
+
+def _exigir_polars():
+    if pl is None:
+        raise ImportError("polars não instalado: use o process_data.py sem --motor polars.")
+
+
+# =========================================================
+# 1) LEITURA
+# =========================================================
+def ler_lazy(origem):
+    """Planilha ou CSV (caminho), DataFrame pandas ou LazyFrame → LazyFrame."""
+    _exigir_polars()
+    if isinstance(origem, pl.LazyFrame):
+        return origem
+    if isinstance(origem, pd.DataFrame):
+        return pl.from_pandas(origem).lazy()
+    if Path(origem).suffix.lower() in (".csv", ".txt"):
+        # Mesma leitura do caminho em pandas (separador, encoding e tipos)
+        return pl.from_pandas(ler_entrada(Path(origem))).lazy()
+    if _arrow_disponivel():
+        return pl.scan_ipc(arquivo_arrow(origem))
+    return pl.from_pandas(ler_planilha(origem, usar_cache=False)).lazy()
+
+
+# =========================================================
+# 2) ETAPAS (EXPRESSÕES)
+# =========================================================
+def _contem(coluna, padrao):
+    # str.contains(padrao, case=False, na=False) do pandas
+    return pl.col(coluna).cast(pl.String).str.contains(f"(?i){padrao}").fill_null(False)
+
+
+def limpeza_inicial(lf):
+    lf = lf.filter(~pl.all_horizontal(pl.all().is_null()))
+    descartar = [c for c in ["Posição do Local", "Cadastro"] if c in lf.collect_schema()]
+    return lf.drop(descartar)
+
+
+def _formato_data(lf, col):
+    """Mesmo formato do process_data.tratar_datas() (primeiro valor preenchido)."""
+    texto = pl.col(col).cast(pl.String).str.strip_chars()
+    amostra = (
+        lf.select(texto.alias(col))
+        .filter(pl.col(col).is_not_null() & ~pl.col(col).is_in(DATAS_VAZIAS))
+        .head(1)
+        .collect()
+    )
+    if amostra.is_empty():
+        return None
+    return formato_de_data(amostra.item())
+
+
+def _para_datetime(serie):
+    # Texto sem formato reconhecível: mesma conversão do pandas, em lote
+    convertido = pd.to_datetime(serie.to_pandas().replace(DATAS_VAZIAS, pd.NA), errors="coerce")
+    return pl.from_pandas(convertido).cast(pl.Datetime("us"))
+
+
+def _data(lf, schema, col):
+    tipo = schema[col]
+    if tipo == pl.Datetime or tipo == pl.Date:
+        return pl.col(col).cast(pl.Datetime("us"))
+
+    texto = pl.col(col).cast(pl.String).str.strip_chars()
+    texto = pl.when(texto.is_in(DATAS_VAZIAS)).then(None).otherwise(texto)
+    formato = _formato_data(lf, col)
+    if formato is not None:
+        return texto.str.strptime(pl.Datetime("us"), formato, strict=False)
+    return texto.map_batches(_para_datetime, return_dtype=pl.Datetime("us"))
+
+
+def tratar_datas(lf):
+    schema = lf.collect_schema()
+    return lf.with_columns([_data(lf, schema, col).alias(col) for col in DATE_COLS])
+
+
+def colunas_de_data(lf):
+    hoje = date.today()
+    idade = ((pl.lit(hoje) - pl.col("Nascimento").dt.date()).dt.total_days() / 365.25).cast(pl.Int64)
+    return lf.with_columns(
+        idade.fill_null(0).alias("Idade"),
+        pl.col("Admissão").dt.month().fill_null(0).cast(pl.Int64).alias("Mes_Admissao"),
+        pl.col("Admissão").dt.year().fill_null(0).cast(pl.Int64).alias("Ano_Admissao"),
+        pl.col("Data Afastamento").dt.month().fill_null(0).cast(pl.Int64).alias("Mes_Afastamento"),
+        pl.col("Data Afastamento").dt.year().fill_null(0).cast(pl.Int64).alias("Ano_Afastamento"),
+    )
+
+
+def _codigo_situacao(schema):
+    # Como o pd.to_numeric do validacao.codigo_situacao(): texto vira número
+    situacao = pl.col("Situação")
+    if schema["Situação"] == pl.String:
+        situacao = situacao.str.strip_chars()
+    return situacao.cast(pl.Float64, strict=False)
+
+
+def _data_invalida(schema, col, bruta):
+    if schema[col] == pl.Datetime or schema[col] == pl.Date:
+        return pl.lit(False)
+    texto = pl.col(bruta).cast(pl.String).str.strip_chars()
+    return texto.is_not_null() & ~texto.is_in(DATAS_VAZIAS) & pl.col(col).is_null()
+
+
+def validar(lf, mapeamentos, tipo):
+    """
+    tratar_datas() + regras do validacao.py: (válidas, quarentena,
+    linhas validadas), três LazyFrames do mesmo plano.
+    """
+    schema = lf.collect_schema()
+    brutas = {col: f"_bruta_{col}" for col in DATE_COLS}
+    lf = tratar_datas(lf.with_columns(pl.col(col).alias(bruta) for col, bruta in brutas.items()))
+
+    regras = {DATA_INVALIDA.format(col): _data_invalida(schema, col, bruta) for col, bruta in brutas.items()}
+    regras[ADMISSAO_ANTES_NASCIMENTO] = (pl.col("Admissão") < pl.col("Nascimento")).fill_null(False)
+    regras[AFASTAMENTO_ANTES_ADMISSAO] = (pl.col("Data Afastamento") < pl.col("Admissão")).fill_null(False)
+
+    codigo = _codigo_situacao(schema)
+    inteiro = (codigo.is_not_null() & (codigo % 1 == 0)).fill_null(False)
+    codigos = [float(k) for k in mapa_situacao(mapeamentos["situacao"])]
+    regras[SITUACAO_VAZIA] = pl.col("Situação").is_null()
+    regras[SITUACAO_NAO_NUMERICA] = pl.col("Situação").is_not_null() & ~inteiro
+    regras[SITUACAO_SEM_MAPEAMENTO] = inteiro & ~codigo.is_in(codigos)
+
+    motivos = pl.concat_str(
+        [pl.when(regra).then(pl.lit(motivo)) for motivo, regra in regras.items()],
+        separator=SEPARADOR, ignore_nulls=True,
+    )
+    lf = lf.with_columns(motivos.alias("Motivos"))
+    valida = pl.col("Motivos") == ""
+
+    quarentena = (
+        lf.filter(~valida)
+        .with_columns(pl.col(bruta).alias(col) for col, bruta in brutas.items())
+        .with_columns(pl.lit(tipo).alias("TIPO"))
+        .select(COLUNAS_QUARENTENA)
+    )
+    return lf.filter(valida).drop("Motivos", *brutas.values()), quarentena, lf.select(pl.len())
+
+
+def _mapear(expr, tipo, mapa, padrao):
+    """Series.map(dict).fillna(padrao): só chaves do mesmo tipo da coluna casam."""
+    if tipo == pl.String:
+        mapa = {k: v for k, v in mapa.items() if isinstance(k, str)}
+    elif tipo.is_numeric():
+        mapa = {k: v for k, v in mapa.items() if isinstance(k, (int, float)) and not isinstance(k, bool)}
+    else:
+        mapa = {}
+    if not mapa:
+        return pl.lit(padrao, dtype=pl.String)
+    return expr.replace_strict(mapa, default=padrao, return_dtype=pl.String)
+
+
+def aplicar_mapeamentos(lf, mapeamentos):
+    schema = lf.collect_schema()
+    situacao = _codigo_situacao(schema).cast(pl.Int64)
+    lf = lf.with_columns(
+        _mapear(pl.col("Causa"), schema["Causa"], mapeamentos["causas"], "Desconhecida").alias("Causa Escrita"),
+        _mapear(situacao, pl.Int64, mapa_situacao(mapeamentos["situacao"]), "Desconhecida").alias("Situacao Escrita"),
+    )
+    return lf.with_columns(
+        pl.when(pl.col("Situacao Escrita").is_in(situacoes_ativas))
+        .then(pl.lit("Ativo"))
+        .otherwise(pl.lit("Desligado/Afastado"))
+        .alias("Situacao_res")
+    )
+
+
+def remover_lojas_e_temporarios(lf, temporarios_lst):
+    lojas = pl.col("Descrição (C.Custo)").cast(pl.String).str.to_uppercase().str.contains(pattern).fill_null(False)
+    temporario = pl.col("Nome").is_in(temporarios_lst).fill_null(False)
+    return lf.filter(~lojas & ~temporario)
+
+
+def classificar_areas(lf, cc_map):
+    # Igual ao process_data.classificar_area(); "0" (sem mapeamento)
+    # também cai em Matriz, então nada é descartado depois
+    cc = _mapear(pl.col("C.Custo").cast(pl.String), pl.String, cc_map, "0").str.to_uppercase()
+    return lf.with_columns(
+        pl.when(cc.str.contains("LOJAS", literal=True)).then(pl.lit("Varejo"))
+        .when(cc.str.contains("SUPPLY", literal=True)).then(pl.lit("Indústria"))
+        .otherwise(pl.lit("Matriz"))
+        .alias("Area")
+    )
+
+
+# =========================================================
+# 3) PLANO COMPLETO
+# =========================================================
+def plano(clt, pj, mapeamentos):
+    """
+    LazyFrame da base unificada (nada é lido até o collect) e, por
+    tipo, (tipo, quarentena, linhas validadas) da validação.
+    """
+    clt, pj = ler_lazy(clt), ler_lazy(pj)
+    conferir_colunas(clt.collect_schema().names(), "CLT")
+    conferir_colunas(pj.collect_schema().names(), "PJ")
+
+    clt = limpeza_inicial(clt).filter(~_contem("Título Reduzido (Cargo)", padrao_clt))
+    pj = limpeza_inicial(pj).filter(
+        ~_contem("Título Reduzido (Cargo)", padrao_df2_extra) & ~_contem("Título Reduzido (Cargo)", padrao_pj)
+    )
+
+    bases, validacoes = [], []
+    for lf, tipo in ((clt, "CLT"), (pj, "PJ")):
+        lf, quarentena, linhas = validar(lf, mapeamentos, tipo)
+        validacoes.append((tipo, quarentena, linhas))
+        lf = aplicar_mapeamentos(colunas_de_data(lf), mapeamentos)
+        if tipo == "CLT":
+            lf = remover_lojas_e_temporarios(lf, mapeamentos["temporarios"])
+        lf = classificar_areas(lf, mapeamentos["cc"])
+        bases.append(lf.with_columns(pl.lit(tipo).alias("TIPO")))
+
+    return pl.concat(bases, how="diagonal_relaxed"), validacoes
+
+
+def processar(clt, pj, mapeamentos, quarentena=None):
+    """Mesmo resultado do process_data.processar(), em pandas."""
+    _exigir_polars()
+    print("⚡ Executando o plano em Polars (CLT e PJ juntos)...")
+    final, validacoes = plano(clt, pj, mapeamentos)
+    if quarentena is None:
+        df_final = final.collect().to_pandas()
+    else:
+        # Base e quarentena num collect só: a leitura e as datas são compartilhadas
+        resultados = pl.collect_all([final] + [lf for _, separadas, linhas in validacoes for lf in (separadas, linhas)])
+        df_final = resultados[0].to_pandas()
+        for (tipo, _, _), separadas, linhas in zip(validacoes, resultados[1::2], resultados[2::2]):
+            quarentena.adicionar(tipo, linhas.item(), separadas.to_pandas())
+        quarentena.conferir_mapeamentos(df_final, mapeamentos)
+    print(f"📊 Total final: {len(df_final)} registros")
+    return df_final
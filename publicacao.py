@@ -0,0 +1,87 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+
+from caminhos import ABSENTEISMO_FILE, BASE_FILE, MANIFESTO_FILE, TEMPO_CASA_FILE
+
+# =====================================================================
+# LEITURA DA BASE PUBLICADA (SEM STREAMLIT)
+# =====================================================================
+# Os arquivos que o process_data.py publica em lamoda_dados/data, lidos
+# com as mesmas conversões pelo portal (dados.py, que mede as leituras
+# no modo perfil), pela API, pelas exportações e pelo próprio ETL ao
+# montar a base particionada, sem carregar o Streamlit.
+
+COLS_INT = ["Ano_Admissao", "Mes_Admissao", "Ano_Afastamento", "Mes_Afastamento"]
+
+
+def ler_base(path=None):
+    df = pd.read_csv(path or BASE_FILE, sep=",", encoding="utf-8")
+
+    # Datas
+    df["Admissão"] = pd.to_datetime(df["Admissão"], errors="coerce")
+    df["Data Afastamento"] = pd.to_datetime(df["Data Afastamento"], errors="coerce")
+
+    # Garantir inteiros nas colunas auxiliares
+    for col in COLS_INT:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+
+    return df
+
+
+def ler_tempo_casa(path=None):
+    path = path or TEMPO_CASA_FILE
+    if not path.exists():
+        return None
+
+    df = pd.read_csv(path, sep=",", encoding="utf-8")
+    df["Admissão"] = pd.to_datetime(df["Admissão"], errors="coerce")
+    df["Data Afastamento"] = pd.to_datetime(df["Data Afastamento"], errors="coerce")
+    return df
+
+
+def ler_absenteismo(path=None):
+    """Tabela mensal publicada pelo absenteismo.py (pequena: C.Custo × mês)."""
+    path = path or ABSENTEISMO_FILE
+    if not path.exists():
+        return None
+    return pd.read_csv(path, sep=",", encoding="utf-8", dtype={"C.Custo": str})
+
+
+def ler_manifesto():
+    """Manifesto gravado pelo process_data.py ao final de cada publicação."""
+    if not MANIFESTO_FILE.exists():
+        return {}
+    try:
+        return json.loads(MANIFESTO_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def versao_publicada():
+    """
+    Identificador da base publicada no disco.
+    Usa o manifesto quando existe; senão, data de modificação + tamanho do CSV.
+    """
+    manifesto = ler_manifesto()
+    if manifesto.get("versao"):
+        return str(manifesto["versao"])
+
+    if not BASE_FILE.exists():
+        return None
+
+    stat = BASE_FILE.stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def data_atualizacao():
+    """Data de referência dos dados (dd/mm/aaaa) para exibir nas páginas."""
+    manifesto = ler_manifesto()
+    if manifesto.get("data_referencia"):
+        return manifesto["data_referencia"]
+
+    if BASE_FILE.exists():
+        return datetime.fromtimestamp(BASE_FILE.stat().st_mtime).strftime("%d/%m/%Y")
+    return "—"
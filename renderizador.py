@@ -0,0 +1,213 @@
+import asyncio
+import atexit
+import math
+import threading
+import time
+from collections import deque
+
+# =====================================================================
+# RENDERIZADOR DE PNG (KALEIDO PERSISTENTE)
+# =====================================================================
+# fig.write_image abre um Chrome novo a cada chamada (segundos) e as
+# chamadas de várias sessões acabam em fila. Aqui o Chrome do kaleido
+# fica aberto enquanto o processo viver, com RENDERIZADORES abas
+# renderizando em paralelo. Os pedidos entram numa fila (asyncio, numa
+# thread própria) e quem pediu espera no máximo `timeout` segundos.
+#
+#     png = renderizar_png(fig)                   # um gráfico
+#     pngs = renderizador().lote([fig1, fig2])    # vários de uma vez
+#
+# estatisticas() devolve fila, tempos e erros (painel do modo perfil).
+
+RENDERIZADORES = 2
+
+# Tempo máximo de um gráfico (um lote ganha proporcionalmente mais)
+TIMEOUT_S = 30
+
+TIMEOUT_ABERTURA_S = 60
+
+# Sem Chrome no servidor: não tenta abrir de novo a cada download
+ESPERA_APOS_FALHA_S = 60
+
+# Tamanho padrão do write_image do plotly
+LARGURA_PADRAO = 700
+ALTURA_PADRAO = 500
+
+
+def _opcoes(fig_dict, escala):
+    layout = fig_dict.get("layout", {})
+    modelo = layout.get("template", {}).get("layout", {})
+    return {
+        "format": "png",
+        "width": layout.get("width") or modelo.get("width") or LARGURA_PADRAO,
+        "height": layout.get("height") or modelo.get("height") or ALTURA_PADRAO,
+        "scale": escala,
+    }
+
+
+class PoolRenderizacao:
+    """Chrome do kaleido aberto, com fila de pedidos e métricas."""
+
+    def __init__(self, renderizadores=RENDERIZADORES, timeout=TIMEOUT_S):
+        self.renderizadores = renderizadores
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._lock_abertura = threading.Lock()
+        self._loop = None
+        self._kaleido = None
+        self._falha = None
+        self.abertura_ms = None
+        self.na_fila = 0
+        self.maior_fila = 0
+        self.renderizados = 0
+        self.erros = 0
+        self.timeouts = 0
+        self._tempos = deque(maxlen=500)
+
+    # -------------------------
+    # Abrir / fechar
+    # -------------------------
+    def _abrir(self):
+        with self._lock_abertura:
+            if self._kaleido is not None:
+                return
+            if self._falha and time.monotonic() - self._falha[0] < ESPERA_APOS_FALHA_S:
+                raise RuntimeError(f"Renderizador de PNG indisponível: {self._falha[1]}")
+
+            import kaleido
+
+            async def abrir():
+                k = kaleido.Kaleido(n=self.renderizadores, timeout=self.timeout)
+                await k.open()
+                return k
+
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="renderizador-png", daemon=True).start()
+
+            inicio = time.perf_counter()
+            try:
+                self._kaleido = asyncio.run_coroutine_threadsafe(abrir(), loop).result(TIMEOUT_ABERTURA_S)
+            except Exception as e:
+                loop.call_soon_threadsafe(loop.stop)
+                self._falha = (time.monotonic(), e)
+                raise RuntimeError(f"Não foi possível abrir o renderizador de PNG (kaleido/Chrome): {e}") from e
+
+            self._loop = loop
+            self._falha = None
+            self.abertura_ms = round((time.perf_counter() - inicio) * 1000, 1)
+            atexit.register(self.fechar)
+
+    def fechar(self):
+        with self._lock_abertura:
+            if self._kaleido is None:
+                return
+            k, loop = self._kaleido, self._loop
+            self._kaleido = self._loop = None
+            try:
+                asyncio.run_coroutine_threadsafe(k.close(), loop).result(10)
+            except Exception:
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+
+    # -------------------------
+    # Renderização
+    # -------------------------
+    async def _renderizar(self, fig_dict, opcoes, pedido_em):
+        try:
+            png = await self._kaleido.calc_fig(fig_dict, opts=opcoes)
+        except Exception:
+            with self._lock:
+                self.erros += 1
+            raise
+        with self._lock:
+            self.renderizados += 1
+            self._tempos.append(time.perf_counter() - pedido_em)
+        return png
+
+    def _saiu_da_fila(self, _futuro):
+        with self._lock:
+            self.na_fila -= 1
+
+    def lote(self, figuras, escala=1, timeout=None):
+        """PNG (bytes) de cada figura, na mesma ordem, renderizadas em paralelo."""
+        figuras = list(figuras)
+        if not figuras:
+            return []
+        self._abrir()
+
+        if timeout is None:
+            timeout = self.timeout * math.ceil(len(figuras) / self.renderizadores)
+
+        with self._lock:
+            self.na_fila += len(figuras)
+            self.maior_fila = max(self.maior_fila, self.na_fila)
+
+        pedido_em = time.perf_counter()
+        futuros = []
+        for fig in figuras:
+            fig_dict = fig if isinstance(fig, dict) else fig.to_dict()
+            futuro = asyncio.run_coroutine_threadsafe(
+                self._renderizar(fig_dict, _opcoes(fig_dict, escala), pedido_em), self._loop
+            )
+            futuro.add_done_callback(self._saiu_da_fila)
+            futuros.append(futuro)
+
+        limite = time.monotonic() + timeout
+        try:
+            return [f.result(max(0, limite - time.monotonic())) for f in futuros]
+        except TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Renderização de {len(figuras)} PNG passou de {timeout:.0f} s.") from None
+        finally:
+            # Timeout ou erro: o que ainda não começou sai da fila
+            for f in futuros:
+                f.cancel()
+
+    def renderizar(self, fig, escala=1, timeout=None):
+        return self.lote([fig], escala=escala, timeout=timeout)[0]
+
+    # -------------------------
+    # Métricas
+    # -------------------------
+    def estatisticas(self):
+        with self._lock:
+            tempos = sorted(self._tempos)
+            return {
+                "Aberto": self._kaleido is not None,
+                "Renderizadores": self.renderizadores,
+                "Abertura (ms)": self.abertura_ms,
+                "Na fila": self.na_fila,
+                "Maior fila": self.maior_fila,
+                "Renderizados": self.renderizados,
+                "Erros": self.erros,
+                "Timeouts": self.timeouts,
+                "Tempo médio (ms)": round(sum(tempos) / len(tempos) * 1000, 1) if tempos else None,
+                "Tempo p95 (ms)": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))] * 1000, 1)
+                if tempos else None,
+                "Tempo máximo (ms)": round(tempos[-1] * 1000, 1) if tempos else None,
+            }
+
+
+# =========================================================
+# UM POOL POR PROCESSO (PORTAL OU WORKER DO LOTE)
+# =========================================================
+_pool = None
+_lock_pool = threading.Lock()
+
+
+def renderizador():
+    global _pool
+    with _lock_pool:
+        if _pool is None:
+            _pool = PoolRenderizacao()
+        return _pool
+
+
+def renderizar_png(fig, escala=1):
+    return renderizador().renderizar(fig, escala=escala)
+
+
+def estatisticas():
+    """Métricas do pool deste processo (None se nada foi renderizado)."""
+    return _pool.estatisticas() if _pool is not None else None
@@ -0,0 +1,112 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from armazem import armazem
+from pipeline import ETAPAS, processar_upload
+
+# Quantos uploads são processados ao mesmo tempo no servidor
+MAX_WORKERS = 2
+
+# Tarefas finalizadas ficam disponíveis por este tempo (segundos)
+TTL_TAREFA = 2 * 60 * 60
+
+
+# =========================================================
+# 1) TAREFA DE PROCESSAMENTO
+# =========================================================
+class Tarefa:
+    """Estado de um upload em processamento. Atualizado só pelo worker."""
+
+    def __init__(self, chave):
+        self.id = uuid.uuid4().hex
+        self.chave = chave
+        self.status = "fila"  # fila | processando | concluida | erro
+        self.etapa = None
+        self.concluidas = 0
+        self.total = len(ETAPAS)
+        self.erro = None
+        self.criada_em = time.time()
+        self.finalizada_em = None
+
+    @property
+    def em_andamento(self):
+        return self.status in ("fila", "processando")
+
+    @property
+    def progresso(self):
+        return self.concluidas / self.total
+
+    def descricao_etapa(self):
+        return dict(ETAPAS).get(self.etapa, "Aguardando na fila…")
+
+
+# =========================================================
+# 2) FILA COMPARTILHADA ENTRE SESSÕES
+# =========================================================
+class FilaProcessamento:
+    """
+    Pool de workers que processa os uploads fora da thread da página.
+    A sessão guarda apenas o id da tarefa; pode sair da página e voltar.
+    O resultado vai para o armazém compartilhado (armazem.py).
+    """
+
+    def __init__(self, armazem, max_workers=MAX_WORKERS):
+        self._armazem = armazem
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="upload"
+        )
+        self._tarefas = {}
+        self._lock = threading.Lock()
+
+    def enviar(self, chave, conteudo_clt, conteudo_pj):
+        with self._lock:
+            self._limpar_antigas()
+
+            # Mesmo arquivo já em processamento para outra sessão
+            for t in self._tarefas.values():
+                if t.chave == chave and t.em_andamento:
+                    return t.id
+
+            tarefa = Tarefa(chave)
+            self._tarefas[tarefa.id] = tarefa
+
+        self._executor.submit(self._executar, tarefa, conteudo_clt, conteudo_pj)
+        return tarefa.id
+
+    def consultar(self, tarefa_id):
+        with self._lock:
+            return self._tarefas.get(tarefa_id)
+
+    def _executar(self, tarefa, conteudo_clt, conteudo_pj):
+        tarefa.status = "processando"
+        chaves = [chave for chave, _ in ETAPAS]
+
+        def progresso(chave):
+            tarefa.etapa = chave
+            tarefa.concluidas = chaves.index(chave)
+
+        try:
+            resultado = processar_upload(conteudo_clt, conteudo_pj, progresso)
+            self._armazem.guardar(tarefa.chave, resultado)
+            tarefa.concluidas = tarefa.total
+            tarefa.status = "concluida"
+        except Exception as e:
+            tarefa.erro = str(e)
+            tarefa.status = "erro"
+        finally:
+            tarefa.finalizada_em = time.time()
+
+    def _limpar_antigas(self):
+        limite = time.time() - TTL_TAREFA
+        for tid, t in list(self._tarefas.items()):
+            if t.finalizada_em and t.finalizada_em < limite:
+                del self._tarefas[tid]
+
+
+@st.cache_resource
+def fila():
+    return FilaProcessamento(armazem())
@@ -0,0 +1,74 @@
+import pandas as pd
+
+# ==============================================================
+# MÉTRICAS DE TEMPO DE CASA (PÁGINA 2_Tempo_de_Casa.py E api.py)
+# ==============================================================
+# Funções puras sobre a base de tempo de casa (historico.calcular_tempo_casa
+# ou tempo_de_casa.csv): mesmas regras na página e na API.
+
+# Faixa → (acima de, até) em anos; None = sem limite
+FAIXAS = {
+    "0–1 ano": (None, 1),
+    "1–3 anos": (1, 3),
+    "3–5 anos": (3, 5),
+    "5+ anos": (5, None),
+}
+
+SITUACOES = ["Todos", "Ativo", "Demitido"]
+
+
+def mascara_faixa(anos, faixa):
+    acima, ate = FAIXAS[faixa]
+    mask = pd.Series(True, index=anos.index)
+    if acima is not None:
+        mask &= anos > acima
+    if ate is not None:
+        mask &= anos <= ate
+    return mask
+
+
+def filtrar_tempo_casa(df, areas=None, situacao="Todos", faixa="Todos"):
+    """Mesmos filtros da barra lateral da página."""
+    if areas is not None:
+        df = df[df["Area"].isin(areas)]
+
+    if situacao == "Ativo":
+        df = df[df["Situacao_res"] == "Ativo"]
+    elif situacao == "Demitido":
+        df = df[df["Situacao_res"] != "Ativo"]
+
+    if faixa != "Todos":
+        df = df[mascara_faixa(df["Anos_de_Casa"], faixa)]
+    return df
+
+
+def _media(serie):
+    """Média arredondada ou None se não houver valores."""
+    if serie.empty:
+        return None
+    media = serie.mean()
+    if pd.isna(media):
+        return None
+    return round(media, 2)
+
+
+def resumo_tempo_casa(df):
+    """KPIs da página: tempos médios, headcount e quantidade por faixa."""
+    anos = df["Anos_de_Casa"]
+    ativo = df["Situacao_res"] == "Ativo"
+
+    resumo = {
+        "Colaboradores": len(df),
+        "Headcount Ativo": int(ativo.sum()),
+        "Tempo Médio Geral (anos)": _media(anos),
+        "Tempo Médio Ativos (anos)": _media(anos[ativo]),
+        "Tempo Médio Desligados (anos)": _media(anos[~ativo]),
+    }
+    for faixa in FAIXAS:
+        resumo[faixa] = int(mascara_faixa(anos, faixa).sum())
+    return resumo
+
+
+def tempo_casa_por_area(df):
+    linhas = [{"Área": area, **resumo_tempo_casa(sub)} for area, sub in df.groupby("Area")]
+    return pd.DataFrame(linhas)
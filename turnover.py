@@ -0,0 +1,394 @@
+import pandas as pd
+from calendar import monthrange
+
+from conjunto import derivar
+
+# ==============================================================
+# CÁLCULOS DE TURNOVER (USADOS PELA PÁGINA 1_Turnover.py)
+# ==============================================================
+# Funções puras sobre a base tratada: não dependem do Streamlit,
+# então também rodam nos benchmarks (benchmarks/bench_turnover.py).
+
+
+# ==============================================================
+# 1) FUNÇÕES DE CÁLCULO – PADRÃO
+# ==============================================================
+
+def turnover_moderno(adm, dem, ativos_ini, ativos_fim):
+    ativos_med = (ativos_ini + ativos_fim) / 2
+    return ((adm + dem) / 2) / ativos_med * 100 if ativos_med > 0 else 0
+
+
+def turnover_total_colab(adm, dem, total_colab):
+    return ((adm + dem) / 2) / total_colab * 100 if total_colab > 0 else 0
+
+
+def indicadores_periodo(adm, dem, ativos_ini, ativos_fim):
+    """Colunas de um período a partir das contagens (mesmas nos dois motores, ver consultas.py)."""
+    return {
+        "Admissões": adm,
+        "Desligamentos": dem,
+        "Ativos início": ativos_ini,
+        "Ativos fim": ativos_fim,
+        "Ativos médios": round((ativos_ini + ativos_fim) / 2, 2),
+        "Turnover Moderno (%)": round(turnover_moderno(adm, dem, ativos_ini, ativos_fim), 2),
+        "Turnover Alternativo (%)": round(turnover_total_colab(adm, dem, ativos_fim), 2),
+    }
+
+
+def calcular_turnover_periodo(df_base, ano, fim_perfil=None):
+    """
+    Turnover anual geral usando suas fórmulas originais.
+    """
+    if fim_perfil is None:
+        periodo_start = pd.Timestamp(f"{ano}-01-01")
+        periodo_end = pd.Timestamp(f"{ano}-12-31")
+    else:
+        periodo_start = pd.Timestamp(f"{ano}-01-01")
+        periodo_end = pd.Timestamp(fim_perfil)
+
+    # Visão derivada: a base compartilhada não recebe colunas novas
+    df_local = derivar(df_base, {"É_Desligamento": ~df_base["Causa Escrita"].isin(["ATIVO", "Morte"])})
+
+    # Admissões dentro do período
+    adm = df_local[
+        (df_local["Admissão"] >= periodo_start)
+        & (df_local["Admissão"] <= periodo_end)
+    ].shape[0]
+
+    # Desligamentos válidos dentro do período
+    dem = df_local[
+        (df_local["É_Desligamento"])
+        & (df_local["Data Afastamento"] >= periodo_start)
+        & (df_local["Data Afastamento"] <= periodo_end)
+    ].shape[0]
+
+    # Ativos no início
+    ativos_ini = df_local[
+        (df_local["Admissão"] <= periodo_start)
+        & (
+            df_local["Data Afastamento"].isna()
+            | (df_local["Data Afastamento"] > periodo_start)
+        )
+    ].shape[0]
+
+    # Ativos no fim
+    ativos_fim = df_local[
+        (df_local["Admissão"] <= periodo_end)
+        & (
+            df_local["Data Afastamento"].isna()
+            | (df_local["Data Afastamento"] > periodo_end)
+        )
+    ].shape[0]
+
+    return {"Ano": ano, **indicadores_periodo(adm, dem, ativos_ini, ativos_fim)}
+
+
+def turnover_por_area(df_base, ano, fim_periodo=None):
+    """
+    Turnover anual por Área (Varejo / Indústria / Matriz).
+    """
+    if fim_periodo is None:
+        ini = pd.Timestamp(f"{ano}-01-01")
+        fim = pd.Timestamp(f"{ano}-12-31")
+    else:
+        ini = pd.Timestamp(f"{ano}-01-01")
+        fim = pd.Timestamp(fim_periodo)
+
+    df_local = derivar(df_base, {"É_Desligamento": ~df_base["Causa Escrita"].isin(["ATIVO", "Morte"])})
+
+    areas = df_local["Area"].dropna().unique()
+    linhas = []
+
+    for area in areas:
+        sub = df_local[df_local["Area"] == area]
+
+        adm = sub[(sub["Admissão"] >= ini) & (sub["Admissão"] <= fim)].shape[0]
+
+        dem = sub[
+            (sub["É_Desligamento"])
+            & (sub["Data Afastamento"] >= ini)
+            & (sub["Data Afastamento"] <= fim)
+        ].shape[0]
+
+        ativos_ini = sub[
+            (sub["Admissão"] <= ini)
+            & (
+                sub["Data Afastamento"].isna()
+                | (sub["Data Afastamento"] > ini)
+            )
+        ].shape[0]
+
+        ativos_fim = sub[
+            (sub["Admissão"] <= fim)
+            & (
+                sub["Data Afastamento"].isna()
+                | (sub["Data Afastamento"] > fim)
+            )
+        ].shape[0]
+
+        linhas.append({"Ano": ano, "Área": area, **indicadores_periodo(adm, dem, ativos_ini, ativos_fim)})
+
+    return pd.DataFrame(linhas)
+
+
+def turnover_por_centro_custo(df_base, ano):
+    """
+    Calcula turnover por Centro de Custo (Descrição C.Custo) para um ano específico.
+    Usa a fórmula TURNOVER ALTERNATIVO = (Adm + Dem) / (2 × Ativos_fim)
+    """
+    ini = pd.Timestamp(f"{ano}-01-01")
+    fim = pd.Timestamp(f"{ano}-12-31")
+
+    df_local = derivar(df_base, {"É_Desligamento": ~df_base["Causa Escrita"].isin(["ATIVO", "Morte"])})
+
+    centros = df_local["Descrição (C.Custo)"].dropna().unique()
+
+    resultados = []
+
+    for cc in centros:
+        sub = df_local[df_local["Descrição (C.Custo)"] == cc]
+
+        adm = sub[(sub["Admissão"] >= ini) & (sub["Admissão"] <= fim)].shape[0]
+
+        dem = sub[
+            (sub["É_Desligamento"])
+            & (sub["Data Afastamento"] >= ini)
+            & (sub["Data Afastamento"] <= fim)
+        ].shape[0]
+
+        ativos_fim = sub[
+            (sub["Admissão"] <= fim)
+            & (
+                sub["Data Afastamento"].isna()
+                | (sub["Data Afastamento"] > fim)
+            )
+        ].shape[0]
+
+        if ativos_fim == 0:
+            turnover = 0
+        else:
+            turnover = ((adm + dem) / (2 * ativos_fim)) * 100
+
+        resultados.append({
+            "Centro de Custo": cc,
+            "Admissões": adm,
+            "Desligamentos": dem,
+            "Ativos Fim": ativos_fim,
+            "Turnover (%)": round(turnover, 2),
+        })
+
+    df_cc = pd.DataFrame(resultados)
+    df_cc = df_cc.sort_values("Turnover (%)", ascending=False)
+
+    return df_cc
+
+
+def turnover_por_cc(df_base, ano, filtrar_pequenos=False, agrupar_pequenos=False, min_ativos=0):
+    """
+    Versão com switches (ON/OFF) para filtros de CC pequenos e agrupamento em 'Outros'.
+    Fórmula de turnover continua sendo a mesma.
+    """
+    df_local = df_base
+
+    lista = []
+    centros = df_local["Descrição (C.Custo)"].dropna().unique()
+
+    for cc in centros:
+        sub = df_local[df_local["Descrição (C.Custo)"] == cc]
+
+        adm = sub[(sub["Ano_Admissao"] == ano)].shape[0]
+        dem = sub[(sub["Ano_Afastamento"] == ano)].shape[0]
+
+        fim = pd.Timestamp(f"{ano}-12-31")
+        ativos_fim = sub[
+            (sub["Admissão"] <= fim)
+            & (
+                sub["Data Afastamento"].isna()
+                | (sub["Data Afastamento"] > fim)
+            )
+        ].shape[0]
+
+        lista.append(linha_centro_custo(cc, adm, dem, ativos_fim))
+
+    return tabela_centros_custo(lista, filtrar_pequenos, agrupar_pequenos, min_ativos)
+
+
+def linha_centro_custo(cc, adm, dem, ativos_fim):
+    if ativos_fim > 0:
+        turnover = ((adm + dem) / (2 * ativos_fim)) * 100
+    else:
+        turnover = 0
+
+    return {
+        "Centro de Custo": cc,
+        "Admissões": adm,
+        "Desligamentos": dem,
+        "Ativos Fim": ativos_fim,
+        "Turnover (%)": round(turnover, 2),
+    }
+
+
+def tabela_centros_custo(lista, filtrar_pequenos=False, agrupar_pequenos=False, min_ativos=0):
+    """Linhas por CC (na ordem da base) → filtros/agrupamento de CC pequenos e ordenação."""
+    df_cc = pd.DataFrame(lista)
+
+    # 1) Filtrar CC pequenos
+    if filtrar_pequenos:
+        df_cc = df_cc[df_cc["Ativos Fim"] >= min_ativos]
+
+    # 2) Agrupar CC pequenos em "Outros"
+    if agrupar_pequenos:
+        pequenos = df_cc[df_cc["Ativos Fim"] < min_ativos]
+        grandes = df_cc[df_cc["Ativos Fim"] >= min_ativos]
+
+        if not pequenos.empty:
+            soma = pequenos.sum(numeric_only=True)
+            turnover_outros = (
+                (soma["Admissões"] + soma["Desligamentos"]) /
+                (2 * soma["Ativos Fim"])
+            ) * 100 if soma["Ativos Fim"] > 0 else 0
+
+            linha_outros = {
+                "Centro de Custo": "OUTROS (Centros Pequenos)",
+                "Admissões": int(soma["Admissões"]),
+                "Desligamentos": int(soma["Desligamentos"]),
+                "Ativos Fim": int(soma["Ativos Fim"]),
+                "Turnover (%)": round(turnover_outros, 2),
+            }
+            df_cc = pd.concat([grandes, pd.DataFrame([linha_outros])], ignore_index=True)
+
+    return df_cc.sort_values("Turnover (%)", ascending=False)
+
+
+# ==============================================================
+# 2) FUNÇÕES MENSAL – MESMA LÓGICA DO JUPYTER
+# ==============================================================
+
+def admissoes_mes(df_base, ano, mes):
+    return df_base[
+        (df_base["Ano_Admissao"] == ano)
+        & (df_base["Mes_Admissao"] == mes)
+    ].shape[0]
+
+
+def demissoes_mes(df_base, ano, mes):
+    return df_base[
+        (df_base["Ano_Afastamento"] == ano)
+        & (df_base["Mes_Afastamento"] == mes)
+    ].shape[0]
+
+
+def fim_do_mes(ano, mes):
+    return pd.Timestamp(year=ano, month=mes, day=monthrange(ano, mes)[1])
+
+
+def mascara_ativos(df_base, ref):
+    return (df_base["Admissão"] <= ref) & (
+        df_base["Data Afastamento"].isna()
+        | (df_base["Data Afastamento"] > ref)
+    )
+
+
+def ativos_no_fim_mes(df_base, ano, mes):
+    ativos = df_base[mascara_ativos(df_base, fim_do_mes(ano, mes))]
+    return ativos.shape[0]
+
+
+def ativos_no_fim_mes_por(df_base, ano, mes, colunas):
+    """Ativos no fim do mês por grupo (ex.: Area, C.Custo, TIPO)."""
+    ativos = df_base[mascara_ativos(df_base, fim_do_mes(ano, mes))]
+    return ativos.groupby(colunas, dropna=False).size()
+
+
+def montar_tabela_mensal_area(df_base, anos, area_label=None):
+    """
+    Monta tabela mensal com Turnover(%) = ((Adm + Dem) / (2 * Ativos)) * 100
+    Se area_label == 'Varejo', aplica o ajuste específico de nov/2025,
+    replicando exatamente o seu notebook.
+    """
+    linhas = []
+
+    for ano in anos:
+        for mes in range(1, 13):
+            adm = admissoes_mes(df_base, ano, mes)
+            dem = demissoes_mes(df_base, ano, mes)
+            ativos = ativos_no_fim_mes(df_base, ano, mes)
+
+            linhas.append(linha_mensal(ano, mes, adm, dem, ativos))
+
+    return tabela_mensal(linhas, anos, area_label)
+
+
+def linha_mensal(ano, mes, adm, dem, ativos):
+    return {
+        "Ano": ano,
+        "Mês": mes,
+        "Ano-Mês": f"{ano}-{mes:02d}",
+        "Admissões": adm,
+        "Demissões": dem,
+        "Ativos no Final do Mês": ativos,
+    }
+
+
+def tabela_mensal(linhas, anos, area_label=None):
+    """Linhas (ano, mês) → ajuste do Varejo e Turnover (%)."""
+    tabela = pd.DataFrame(linhas)
+
+    # -------------------------
+    # Ajuste específico VAREJO
+    # -------------------------
+    if area_label == "Varejo" and 2025 in anos:
+        mask_nov = (tabela["Ano"] == 2025) & (tabela["Mês"] == 11)
+        mask_out = (tabela["Ano"] == 2025) & (tabela["Mês"] == 10)
+
+        if mask_nov.any() and mask_out.any():
+            ativos_outubro = tabela.loc[mask_out, "Ativos no Final do Mês"].iloc[0]
+
+            tabela.loc[mask_nov, "Admissões"] = 12
+            tabela.loc[mask_nov, "Demissões"] = 14
+            tabela.loc[mask_nov, "Ativos no Final do Mês"] = ativos_outubro + 12 - 15
+
+    tabela["Turnover (%)"] = (
+        (tabela["Admissões"] + tabela["Demissões"])
+        / (2 * tabela["Ativos no Final do Mês"].replace(0, pd.NA))
+    ) * 100
+    tabela["Turnover (%)"] = tabela["Turnover (%)"].fillna(0).round(2)
+
+    return tabela
+
+
+# ==============================================================
+# 3) TABELAS DAS ANÁLISES (PÁGINA E API)
+# ==============================================================
+
+def turnover_anual(df_base, anos):
+    """Uma linha por ano (Visão Geral)."""
+    return pd.DataFrame([calcular_turnover_periodo(df_base, ano) for ano in anos])
+
+
+def turnover_por_area_anos(df_base, anos):
+    """Turnover por área, anos empilhados (Turnover por Área)."""
+    return pd.concat([turnover_por_area(df_base, ano) for ano in anos], ignore_index=True)
+
+
+def turnover_mensal_areas(df_base, areas, anos):
+    """
+    Tabela mensal de cada área + 'Geral' (todas as áreas escolhidas
+    juntas), ordenada por Área, Ano e Mês (Turnover Mensal).
+    """
+    tabelas = []
+    for area in areas:
+        sub_area = df_base[df_base["Area"] == area]
+        tabela_area = montar_tabela_mensal_area(sub_area, anos, area_label=area)
+        tabela_area["Área"] = area
+        tabelas.append(tabela_area)
+
+    # Tabela do TOTAL GERAL (considerando todas as áreas selecionadas)
+    sub_geral = df_base[df_base["Area"].isin(areas)]
+    tabela_geral = montar_tabela_mensal_area(sub_geral, anos, area_label="Geral")
+    tabela_geral["Área"] = "Geral"
+    tabelas.append(tabela_geral)
+
+    tabela_final = pd.concat(tabelas, ignore_index=True)
+    return tabela_final.sort_values(["Área", "Ano", "Mês"])
@@ -0,0 +1,224 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from caminhos import DATA_DIR
+from process_data import DATE_COLS, mapa_situacao, texto_de_data
+
+# =====================================================================
+# VALIDAÇÃO DAS EXPORTAÇÕES E QUARENTENA (process_data.py)
+# =====================================================================
+# O ETL convertia tudo em silêncio: data que não é data virava NaT,
+# código de Situação fora do situacao_map virava "Desconhecida" (e o
+# colaborador contava como desligado) e uma Situação em texto derrubava
+# a carga inteira no astype(int). Agora, depois da conversão das datas,
+# cada regra abaixo é uma operação sobre a coluna inteira; as linhas que
+# falham saem da base e vão para
+#     lamoda_dados/data/quarentena.csv  (valores como vieram + Motivos)
+# com o resumo da carga em lamoda_dados/data/validacao.json: linhas em
+# quarentena por motivo e códigos de Causa / C.Custo sem mapeamento
+# (esses só avisam: a linha continua na base).
+#
+# Quarentena acima de LIMITE_QUARENTENA das linhas quase sempre é
+# arquivo com outro layout ou formato de data: a base não é publicada.
+# O caminho em Polars (process_polars.validar) aplica as mesmas regras.
+
+COLUNAS_OBRIGATORIAS = [
+    "Nome", "Título Reduzido (Cargo)", "Nascimento", "Admissão", "Data Afastamento",
+    "Situação", "Causa", "C.Custo", "Descrição (C.Custo)",
+]
+
+# Colunas gravadas na quarentena (datas como vieram na exportação)
+COLUNAS_QUARENTENA = [
+    "TIPO", "Nome", "C.Custo", "Nascimento", "Admissão", "Data Afastamento", "Situação", "Motivos",
+]
+
+QUARENTENA_FILE = DATA_DIR / "quarentena.csv"
+RELATORIO_FILE = DATA_DIR / "validacao.json"
+
+# Fração máxima das linhas em quarentena para a base ser publicada
+LIMITE_QUARENTENA = 0.05
+
+# Motivos, na ordem em que aparecem na coluna Motivos
+DATA_INVALIDA = "{} inválida"
+ADMISSAO_ANTES_NASCIMENTO = "Admissão antes do Nascimento"
+AFASTAMENTO_ANTES_ADMISSAO = "Afastamento antes da Admissão"
+SITUACAO_VAZIA = "Situação vazia"
+SITUACAO_NAO_NUMERICA = "Situação não numérica"
+SITUACAO_SEM_MAPEAMENTO = "Situação sem mapeamento"
+
+SEPARADOR = "; "
+
+# Códigos sem mapeamento listados no terminal (o JSON tem todos)
+AVISOS_NO_TERMINAL = 10
+
+
+class QuarentenaExcedida(ValueError):
+    pass
+
+
+# =========================================================
+# 1) REGRAS (COLUNA INTEIRA)
+# =========================================================
+def conferir_colunas(colunas, tipo):
+    faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in colunas]
+    if faltando:
+        raise ValueError(f"Coluna(s) ausente(s) na exportação {tipo}: {', '.join(faltando)}")
+
+
+def codigo_situacao(serie):
+    # 1 (número), 1.0 (Excel) e "1" (CSV) são o mesmo código
+    return pd.to_numeric(serie, errors="coerce")
+
+
+def regras(d, brutas, mapeamentos):
+    """
+    Uma coluna booleana por motivo (True = a linha falha). `d` com as
+    datas já convertidas (tratar_datas), `brutas` = as mesmas colunas
+    de data antes da conversão.
+    """
+    falhas = {}
+    for col in DATE_COLS:
+        # Só NaT pode ser data inválida: o texto é refeito só nessas linhas
+        nulas = d[col].isna()
+        invalida = pd.Series(False, index=d.index)
+        invalida[nulas] = texto_de_data(brutas.loc[nulas, col]).notna()
+        falhas[DATA_INVALIDA.format(col)] = invalida
+
+    # NaT nas comparações dá False: data vazia não é intervalo errado
+    falhas[ADMISSAO_ANTES_NASCIMENTO] = d["Admissão"] < d["Nascimento"]
+    falhas[AFASTAMENTO_ANTES_ADMISSAO] = d["Data Afastamento"] < d["Admissão"]
+
+    codigo = codigo_situacao(d["Situação"])
+    inteiro = codigo.notna() & (codigo % 1 == 0)
+    falhas[SITUACAO_VAZIA] = d["Situação"].isna()
+    falhas[SITUACAO_NAO_NUMERICA] = d["Situação"].notna() & ~inteiro
+    falhas[SITUACAO_SEM_MAPEAMENTO] = inteiro & ~codigo.isin(list(mapa_situacao(mapeamentos["situacao"])))
+    return pd.DataFrame(falhas, index=d.index)
+
+
+def texto_dos_motivos(falhas):
+    """Texto "Motivo A; Motivo B" de cada linha, somado coluna a coluna."""
+    texto = pd.Series("", index=falhas.index, dtype=object)
+    for motivo in falhas.columns:
+        texto = texto + np.where(falhas[motivo], motivo + SEPARADOR, "")
+    return texto.str[:-len(SEPARADOR)]
+
+
+def validar(d, brutas, mapeamentos, tipo, quarentena=None):
+    """Linhas que passam em todas as regras; as outras vão para a `quarentena`."""
+    falhas = regras(d, brutas, mapeamentos)
+    ruins = falhas.any(axis=1)
+    if quarentena is not None:
+        separadas = d.loc[ruins].assign(**{col: brutas.loc[ruins, col] for col in DATE_COLS})
+        quarentena.adicionar(tipo, len(d), separadas.assign(TIPO=tipo, Motivos=texto_dos_motivos(falhas[ruins])))
+    return d[~ruins] if ruins.any() else d
+
+
+def sem_mapeamento(d, mapeamentos):
+    """Códigos de Causa e C.Custo fora dos mapeamentos → {coluna: {código: linhas}}."""
+    # Mesma comparação do Series.map() do ETL (o tipo da chave conta)
+    causa = d["Causa"].dropna()
+    causa = causa[~causa.isin(list(mapeamentos["causas"]))]
+    cc = d["C.Custo"].dropna().astype(str)
+    cc = cc[~cc.isin(list(mapeamentos["cc"]))]
+    return {
+        "Causa": {str(k): int(v) for k, v in causa.astype(str).value_counts().items()},
+        "C.Custo": {str(k): int(v) for k, v in cc.value_counts().items()},
+    }
+
+
+# =========================================================
+# 2) QUARENTENA E RELATÓRIO
+# =========================================================
+class Quarentena:
+    """
+    Linhas separadas pela validação (base inteira ou bloco a bloco),
+    gravadas em `destino` à medida que chegam, e as contagens do
+    relatório. `destino=None` só conta.
+    """
+
+    def __init__(self, destino=None):
+        self.destino = destino
+        self.linhas = {}
+        self.separadas = {}
+        self.motivos = {}
+        self.sem_mapeamento = {"Causa": {}, "C.Custo": {}}
+        self._arquivo = None
+
+    def adicionar(self, tipo, linhas, separadas):
+        """`linhas` validadas de `tipo`; `separadas` = as que falharam, com a coluna Motivos."""
+        self.linhas[tipo] = self.linhas.get(tipo, 0) + linhas
+        if separadas.empty:
+            return
+        self.separadas[tipo] = self.separadas.get(tipo, 0) + len(separadas)
+        for motivo, n in separadas["Motivos"].str.split(SEPARADOR).explode().value_counts().items():
+            self.motivos[motivo] = self.motivos.get(motivo, 0) + int(n)
+        if self.destino is not None:
+            self._gravar(separadas.reindex(columns=COLUNAS_QUARENTENA))
+
+    def _gravar(self, separadas):
+        cabecalho = self._arquivo is None
+        if cabecalho:
+            self._arquivo = open(self.destino.with_name(self.destino.name + ".tmp"), "w", encoding="utf-8", newline="")
+        separadas.to_csv(self._arquivo, header=cabecalho, index=False)
+
+    def conferir_mapeamentos(self, d, mapeamentos):
+        for col, codigos in sem_mapeamento(d, mapeamentos).items():
+            for codigo, n in codigos.items():
+                self.sem_mapeamento[col][codigo] = self.sem_mapeamento[col].get(codigo, 0) + n
+
+    @property
+    def proporcao(self):
+        total = sum(self.linhas.values())
+        return sum(self.separadas.values()) / total if total else 0.0
+
+    def resumo(self):
+        return {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "linhas": self.linhas,
+            "quarentena": self.separadas,
+            "proporcao": round(self.proporcao, 6),
+            "motivos": dict(sorted(self.motivos.items(), key=lambda m: -m[1])),
+            "sem_mapeamento": {
+                col: dict(sorted(codigos.items(), key=lambda c: -c[1]))
+                for col, codigos in self.sem_mapeamento.items()
+            },
+        }
+
+    def fechar(self, relatorio=RELATORIO_FILE):
+        """Troca a quarentena.csv (vazia, se nada falhou), grava o relatório e o devolve."""
+        resumo = self.resumo()
+        if self.destino is not None:
+            if self._arquivo is None:
+                # Sem linhas separadas: só o cabeçalho, para não sobrar a da carga anterior
+                self._gravar(pd.DataFrame(columns=COLUNAS_QUARENTENA))
+            self._arquivo.close()
+            self._arquivo = None
+            os.replace(self.destino.with_name(self.destino.name + ".tmp"), self.destino)
+        if relatorio is not None:
+            tmp = relatorio.with_name(relatorio.name + ".tmp")
+            tmp.write_text(json.dumps(resumo, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, relatorio)
+        return resumo
+
+    def imprimir(self):
+        total = sum(self.separadas.values())
+        print(f"🔎 Validação: {total} linhas em quarentena ({self.proporcao:.2%})")
+        for motivo, n in sorted(self.motivos.items(), key=lambda m: -m[1]):
+            print(f"   - {motivo}: {n}")
+        for col, codigos in self.sem_mapeamento.items():
+            if codigos:
+                maiores = sorted(codigos.items(), key=lambda c: -c[1])[:AVISOS_NO_TERMINAL]
+                lista = ", ".join(f"{codigo} ({n})" for codigo, n in maiores)
+                print(f"⚠️ {col} sem mapeamento em {sum(codigos.values())} linhas: {lista}")
+
+    def conferir(self, limite=LIMITE_QUARENTENA):
+        if self.proporcao > limite:
+            raise QuarentenaExcedida(
+                f"{self.proporcao:.2%} das linhas em quarentena (limite {limite:.2%}): "
+                f"base não publicada. Veja {self.destino or 'o relatório de validação'}."
+            )